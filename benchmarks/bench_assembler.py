@@ -0,0 +1,65 @@
+'''
+    Assembler Benchmark
+    Measures assembler throughput on a generated 100k-line program.
+    Usage: python benchmarks/bench_assembler.py [lines]
+'''
+import os
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.assembler import Assembler
+
+def generated_program(lines):
+    """Mix of every instruction format with labels and comments, about `lines` source lines"""
+    block = [
+        "block{i}:",
+        "add $t0, $t1, $t2      # r-format",
+        "sll $t3, $t0, 2",
+        "addi $t1, $t1, -{m}",
+        "lw $s0, {o}($sp)",
+        "sw $s0, -{o}($gp)",
+        "slt $t4, $t0, $t1",
+        "beq $t4, $zero, block{i}",
+        "bne $t0, $t1, block{n}",
+        "jal block{p}",
+        "jr $ra",
+    ]
+    blocks = max(1, lines // len(block))
+    program = []
+    for i in range(blocks):
+        values = {'i': i, 'n': (i + 1) % blocks, 'p': (i * 7) % blocks, 'm': i % 1000, 'o': (i % 64) * 4}
+        program.extend(line.format(**values) for line in block)
+    return program
+
+def measure(program, assembler=None, repeat=3):
+    """Best time of `repeat` runs, a fresh assembler with no cache is used unless one is given"""
+    best = None
+    for _ in range(repeat):
+        current = assembler or Assembler(cache_size=0)
+        start = time.perf_counter()
+        current.assemble(program)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    program = generated_program(lines)
+
+    full = measure(program)
+    print(f"{'full assembly':<22}{len(program):>10} lines{full:>10.3f} s{len(program) / full:>14,.0f} lines/s")
+
+    # One edited line on a warm assembler
+    assembler = Assembler(cache_size=0)
+    assembler.assemble(program)
+    edited = list(program)
+    edited[len(edited) // 2 // 11 * 11 + 1] = "add $t0, $t1, $t3"
+    incremental = measure(edited, assembler, repeat=1)
+    print(f"{'one-line edit':<22}{len(program):>10} lines{incremental:>10.3f} s"
+          f"{assembler.last_encoded:>8} encoded")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+'''
+    Engine Benchmark
+    Compares the predecoded interpreter with the basic-block translator on loop-heavy programs.
+    Usage: python benchmarks/bench_engines.py
+'''
+import os
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+
+def demo_loop(iterations):
+    """test/bin/demo.asm wrapped in an outer loop counted down in $t9"""
+    with open(os.path.join(root_dir, 'test', 'bin', 'demo.asm')) as f:
+        demo = f.read()
+    return f"addi $t9, $zero, {iterations}\nouter:\n{demo}\naddi $t9, $t9, -1\nbne $t9, $zero, outer\n"
+
+def counting_loop(iterations):
+    """Tight arithmetic and memory loop"""
+    return f"""
+    addi $t0, $zero, {iterations}
+    loop:
+    addi $s0, $s0, 3
+    add $s1, $s1, $s0
+    sw $s1, 4($zero)
+    lw $s2, 4($zero)
+    slt $s3, $s2, $s0
+    addi $t0, $t0, -1
+    bne $t0, $zero, loop
+    """
+
+WORKLOADS = {
+    'demo.asm loop': demo_loop(20000),
+    'counting loop': counting_loop(30000),
+}
+
+def measure(program, engine):
+    simulator = Simulator(engine=engine)
+    simulator.load(program)
+    start = time.perf_counter()
+    result = simulator.run(fast=True, max_instructions=10000000)
+    elapsed = time.perf_counter() - start
+    state = (simulator.registers.pc, list(simulator.registers.registers), dict(simulator.memory.read_data_memory()))
+    return result['instructions_executed'] / elapsed, result['instructions_executed'], state
+
+def main():
+    print(f"{'workload':<16}{'instructions':>14}{'interpreter/s':>16}{'blocks/s':>14}{'speedup':>10}")
+    for name, program in WORKLOADS.items():
+        interpreted, count, expected = measure(program, 'interpreter')
+        translated, _, state = measure(program, 'blocks')
+        if state != expected:
+            raise AssertionError(f"Block engine result differs from interpreter on {name}")
+        print(f"{name:<16}{count:>14}{interpreted:>16,.0f}{translated:>14,.0f}{translated / interpreted:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
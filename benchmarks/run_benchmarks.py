@@ -0,0 +1,238 @@
+'''
+    Benchmark Suite
+    Measures assembler and simulator hot paths on generated workloads and writes the results as JSON.
+    Usage: python benchmarks/run_benchmarks.py [--quick] [--output results.json] [--compare baseline.json]
+'''
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.assembler import Assembler
+from sim.simulator import Simulator
+
+def straight_line(instructions):
+    """Long branch-free code, one pass over every instruction"""
+    body = [
+        "addi $t0, $t0, 3",
+        "add $t1, $t1, $t0",
+        "sub $t2, $t1, $t0",
+        "sll $t3, $t2, 2",
+        "srl $t4, $t3, 1",
+        "and $t5, $t4, $t1",
+        "or $t6, $t5, $t0",
+        "slt $t7, $t6, $t1",
+    ]
+    return "\n".join(body[i % len(body)] for i in range(instructions))
+
+def tight_loop(iterations):
+    """Three-instruction counting loop"""
+    return f"""
+    addi $t0, $zero, {iterations}
+    loop:
+    addi $s0, $s0, 1
+    addi $t0, $t0, -1
+    bne $t0, $zero, loop
+    """
+
+def memory_loop(iterations):
+    """Stores and loads sweeping a 4 KiB array above $gp"""
+    return f"""
+    addi $t0, $zero, {iterations}
+    reset:
+    addi $t1, $gp, 0
+    addi $t2, $zero, 1024
+    loop:
+    sw $t0, 0($t1)
+    lw $s0, 0($t1)
+    add $s1, $s1, $s0
+    sb $s0, 1($t1)
+    lhu $s2, 0($t1)
+    addi $t1, $t1, 4
+    addi $t2, $t2, -1
+    addi $t0, $t0, -1
+    beq $t0, $zero, end
+    bne $t2, $zero, loop
+    j reset
+    end:
+    """
+
+def call_chain(depth, repeats):
+    """Recursive jal/jr chain `depth` calls deep, saving $ra on the stack, repeated `repeats` times"""
+    return f"""
+    addi $s7, $zero, {repeats}
+    outer:
+    addi $a0, $zero, {depth}
+    jal f
+    addi $s7, $s7, -1
+    bne $s7, $zero, outer
+    j end
+    f:
+    addi $sp, $sp, -4
+    sw $ra, 0($sp)
+    addi $a0, $a0, -1
+    beq $a0, $zero, return
+    jal f
+    return:
+    lw $ra, 0($sp)
+    addi $sp, $sp, 4
+    jr $ra
+    end:
+    """
+
+def workloads(quick):
+    scale = 10 if quick else 1
+    return {
+        'straight_line': straight_line(20000 // scale),
+        'tight_loop': tight_loop(100000 // scale),
+        'memory_loop': memory_loop(50000 // scale),
+        'call_chain': call_chain(500, 100 // scale),
+    }
+
+def best_of(function, repeat):
+    """Best wall time of `repeat` calls and the last return value"""
+    best, value = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, value
+
+def bench_assemble(program, repeat):
+    lines = program.count('\n') + 1
+    elapsed, _ = best_of(lambda: Assembler(cache_size=0).assemble(program), repeat)
+    return {'lines': lines, 'seconds': elapsed, 'lines_per_second': lines / elapsed}
+
+def bench_step(program, limit):
+    """Instructions per second of step(), capped at `limit` steps"""
+    simulator = Simulator()
+    simulator.load(program)
+    count = 0
+    start = time.perf_counter()
+    while count < limit and simulator.step()['status'] == 'running':
+        count += 1
+    elapsed = time.perf_counter() - start
+    return {'instructions': count, 'seconds': elapsed, 'instructions_per_second': count / elapsed}
+
+def bench_run(program, fast, engine='interpreter', repeat=1, profile=False):
+    """Instructions per second of run(), detailed or fast, optionally with the profiler enabled"""
+    def run():
+        simulator = Simulator(engine=engine)
+        simulator.load(program)
+        if profile:
+            simulator.enable_profiler()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = simulator.run(fast=fast, max_instructions=100000000)
+            return time.perf_counter() - start, result['instructions_executed']
+    elapsed, count = min(run() for _ in range(repeat))
+    return {'instructions': count, 'seconds': elapsed, 'instructions_per_second': count / elapsed}
+
+def bench_history_memory(program, limit):
+    """Peak traced allocation while stepping with unlimited history, scaled to one million steps"""
+    simulator = Simulator()
+    simulator.load(program)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    count = 0
+    while count < limit and simulator.step()['status'] == 'running':
+        count += 1
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return {'steps': count, 'peak_bytes': peak, 'bytes_per_million_steps': peak * 1000000 // max(count, 1)}
+
+def bench_get_state(program, calls):
+    """Cost of get_state() after running the program, without any GUI"""
+    simulator = Simulator()
+    simulator.load(program)
+    simulator.run(fast=True, max_instructions=100000000)
+    elapsed, _ = best_of(lambda: [simulator.get_state() for _ in range(calls)], 3)
+    return {'calls': calls, 'seconds_per_call': elapsed / calls}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(quick=False):
+    step_limit = 20000 if quick else 200000
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'workloads': {}
+    }
+    for name, program in workloads(quick).items():
+        print(f"Running {name}...", file=sys.stderr)
+        results['workloads'][name] = {
+            'assemble': bench_assemble(program, 3),
+            'step': bench_step(program, step_limit),
+            'run': bench_run(program, fast=False),
+            'run_fast': bench_run(program, fast=True, repeat=3),
+            'run_blocks': bench_run(program, fast=True, engine='blocks', repeat=3),
+            'run_profiled': bench_run(program, fast=True, repeat=3, profile=True),
+            'history_memory': bench_history_memory(program, step_limit),
+            'get_state': bench_get_state(program, 1000),
+        }
+    return results
+
+# Metrics compared by --compare, higher is better unless listed in LOWER_IS_BETTER
+METRICS = (
+    ('assemble', 'lines_per_second'),
+    ('step', 'instructions_per_second'),
+    ('run', 'instructions_per_second'),
+    ('run_fast', 'instructions_per_second'),
+    ('run_blocks', 'instructions_per_second'),
+    ('run_profiled', 'instructions_per_second'),
+    ('history_memory', 'bytes_per_million_steps'),
+    ('get_state', 'seconds_per_call'),
+)
+LOWER_IS_BETTER = {'bytes_per_million_steps', 'seconds_per_call'}
+
+def compare(results, baseline):
+    """Print every metric as a ratio to the baseline, values above 1.00 are improvements"""
+    print(f"{'workload':<16}{'metric':<34}{'baseline':>14}{'current':>14}{'ratio':>8}")
+    for name, current in results['workloads'].items():
+        previous = baseline['workloads'].get(name)
+        if previous is None:
+            continue
+        for group, metric in METRICS:
+            old, new = previous[group][metric], current[group][metric]
+            ratio = (old / new if metric in LOWER_IS_BETTER else new / old) if old and new else float('nan')
+            print(f"{name:<16}{group + '.' + metric:<34}{old:>14.6g}{new:>14.6g}{ratio:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the ASMsim benchmark suite.')
+    parser.add_argument('--quick', action='store_true', help='smaller workloads for a fast smoke run')
+    parser.add_argument('--output', help='JSON results file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='baseline JSON results file to compare against')
+    args = parser.parse_args()
+
+    results = run_suite(args.quick)
+    output = args.output or os.path.join(root_dir, 'benchmarks', 'results', f"{results['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,13 @@
-from .simulator import Simulator
+from .simulator import Simulator, SimulatorSnapshot
 from .registers import Registers
 from .memory import Memory
-from .assembler import Assembler
\ No newline at end of file
+from .assembler import Assembler, AssemblyCache
+from .trace import ExecutionTrace
+from .translator import BlockTranslator
+from .runner import BackgroundRunner
+from .batch import BatchSimulator
+from .profiler import Profiler
+from .pipeline import PipelineModel
+from .cache import CacheModel
+from .predictor import PredictorModel
+from .state import StateView
@@ -1,15 +1,113 @@
+import hashlib
+import re
+from collections import OrderedDict
+
 '''
     Assembler Component
     Assembles the MIPS32 Assembly code to Machine code
 '''
 
+# Mnemonic -> (operand format, opcode, funct)
+# Formats: R 'rd, rs, rt' | SHIFT 'rd, rt, shamt' | IMMEDIATE 'rt, rs, imm' | MEMORY 'rt, offset(rs)'
+#          BRANCH 'rs, rt, label' | JUMP 'label' | JUMP_REGISTER 'rs'
+INSTRUCTION_TABLE = {
+    'add': ('R', 0, 0x20), 'sub': ('R', 0, 0x22), 'and': ('R', 0, 0x24),
+    'or': ('R', 0, 0x25), 'slt': ('R', 0, 0x2a),
+    'sll': ('SHIFT', 0, 0x00), 'srl': ('SHIFT', 0, 0x02),
+    'jr': ('JUMP_REGISTER', 0, 0x08),
+    'addi': ('IMMEDIATE', 8, 0),
+    'lw': ('MEMORY', 35, 0), 'sw': ('MEMORY', 43, 0),
+    'lb': ('MEMORY', 32, 0), 'lbu': ('MEMORY', 36, 0), 'lh': ('MEMORY', 33, 0),
+    'lhu': ('MEMORY', 37, 0), 'sb': ('MEMORY', 40, 0), 'sh': ('MEMORY', 41, 0),
+    'beq': ('BRANCH', 4, 0), 'bne': ('BRANCH', 5, 0),
+    'j': ('JUMP', 2, 0), 'jal': ('JUMP', 3, 0)
+}
+
+# Operand kinds expected by each format
+FORMAT_OPERANDS = {
+    'R': ('register', 'register', 'register'),
+    'SHIFT': ('register', 'register', 'immediate'),
+    'IMMEDIATE': ('register', 'register', 'immediate'),
+    'MEMORY': ('register', 'memory'),
+    'BRANCH': ('register', 'register', 'name'),
+    'JUMP': ('name',),
+    'JUMP_REGISTER': ('register',)
+}
+
+# Single tokenizer for source lines, the last alternative catches invalid characters
+TOKEN_PATTERN = re.compile(r'''
+    (?P<register>\$\w+)
+  | (?P<number>-?(?:0x[0-9a-fA-F]+|\d+)(?!\w))
+  | (?P<name>\w+)
+  | (?P<punctuation>[,():])
+  | (?P<space>\s+)
+  | (?P<comment>\#.*)
+  | (?P<invalid>.)
+''', re.VERBOSE)
+
+class AssemblyCache:
+    '''
+    Assembly Cache\n
+    LRU cache of assembled programs keyed by a hash of the normalised source
+    (comments, surrounding whitespace and blank lines removed), so unchanged
+    programs are not reassembled. A size of 0 disables caching.
+    '''
+    def __init__(self, size=64):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(lines):
+        '''Hash the normalised source lines'''
+        normalised = (line.split('#')[0].strip() for line in lines)
+        return hashlib.sha1('\n'.join(line for line in normalised if line).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        '''Return the cached entry for key or None, counting hits and misses'''
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        '''Store an entry, evicting the least recently used ones above size'''
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        '''Drop all entries and reset the counters'''
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        '''Return hit/miss counters and occupancy'''
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries), 'size': self.size}
+
 class Assembler:
     '''Assembler class'''
-    def __init__(self):
+    LINE_CACHE_LIMIT = 100000
+    def __init__(self, cache_size=64):
         self.current_address = 0
         self.labels = {}
         self.instructions = []
         self.translations = []
+        self.line_numbers = []  # Source line number of each instruction, None until get_line_numbers() after a cache hit
+        self._source = None  # Source lines of the last cache hit
+        self.cache = AssemblyCache(cache_size)
+        # Incremental reassembly state
+        self._line_cache = {}  # Source line -> (label, instruction)
+        self._parsed = {}  # Instruction text -> parse_tokens() result
+        self._translations = {}  # (machine word, instruction text) -> translate() result, shared by repeated lines
+        self._previous = None  # Result of the last successful encoding pass
+        self.last_encoded = 0  # Instructions encoded by the last assemble() call
         
         self.register_map = {
             '$zero': 0, '$at': 1, '$v0': 2, '$v1': 3,
@@ -22,19 +120,9 @@ class Assembler:
             '$gp': 28, '$sp': 29, '$fp': 30, '$ra': 31
         }
         
-        self.opcode_map = {
-            'add': 0, 'sub': 0, 'and': 0, 'or': 0, 'slt': 0,
-            'sll': 0, 'srl': 0, 'jr': 0,
-            'addi': 8, 'lw': 35, 'sw': 43,
-            'beq': 4, 'bne': 5,
-            'j': 2, 'jal': 3
-        }
-        
-        self.funct_map = {
-            'add': 0x20, 'sub': 0x22, 'and': 0x24,
-            'or': 0x25, 'slt': 0x2a, 'sll': 0x00,
-            'srl': 0x02, 'jr': 0x08
-        }
+        self.opcode_map = {name: opcode for name, (_, opcode, _) in INSTRUCTION_TABLE.items()}
+        self.funct_map = {name: funct for name, (fmt, _, funct) in INSTRUCTION_TABLE.items()
+                          if fmt in ('R', 'SHIFT', 'JUMP_REGISTER')}
 
     def is_valid_label(self, label):
         """Check if label contains only valid characters"""
@@ -42,39 +130,161 @@ class Assembler:
     
     def is_valid_instruction(self, instruction):
         """Check if instruction contains only valid characters"""
-        valid_chars = set('abcdefghijklmnopqrstuvwxyz$,()0123456789 _-')
-        return all(c.lower() in valid_chars for c in instruction)
+        try:
+            self.tokenize(instruction)
+        except SyntaxError:
+            return False
+        return True
+
+    def tokenize(self, line, line_num=None):
+        """Split a source line into (label, instruction text, instruction tokens) in one regex pass\n
+        Tokens are (kind, text) pairs, comments and whitespace are dropped\n
+        Raises:\n
+            SyntaxError: On an invalid label or invalid characters
+        """
+        where = f" at line {line_num}" if line_num is not None else ""
+        label = None
+        tokens = []
+        start = end = None
+        for match in TOKEN_PATTERN.finditer(line):
+            kind = match.lastgroup
+            if kind == 'space':
+                continue
+            if kind == 'comment':
+                break
+            text = match.group()
+            if kind == 'invalid':
+                code = line.split('#')[0]
+                if label is None and ':' in code[match.start():]:
+                    raise SyntaxError(f"Invalid label '{code[:code.find(':')].strip()}'{where}")
+                raise SyntaxError(f"Invalid instruction '{code[start if start is not None else match.start():].strip()}'{where}")
+            if text == ':' and label is None and len(tokens) <= 1:
+                # Label definition
+                if tokens and tokens[0][0] not in ('name', 'number'):
+                    raise SyntaxError(f"Invalid label '{tokens[0][1]}'{where}")
+                label = tokens[0][1] if tokens else ''
+                tokens = []
+                start = end = None
+                continue
+            if start is None:
+                start = match.start()
+            end = match.end()
+            tokens.append((kind, text))
+        instruction = line[start:end] if tokens else ''
+        return label, instruction, tokens
+
+    def parse_tokens(self, instruction, tokens):
+        """Validate the tokens of an instruction against INSTRUCTION_TABLE\n
+        Returns:\n
+            tuple: (format, opcode, funct, operands), registers resolved to numbers,
+            immediates to ints, label operands kept as names and memory operands as (offset, base)\n
+        Raises:\n
+            ValueError: On an unknown mnemonic or invalid operands
+        """
+        try:
+            kind, mnemonic = tokens[0]
+            mnemonic = mnemonic.lower()
+            if kind != 'name' or mnemonic not in INSTRUCTION_TABLE:
+                raise ValueError(f"Unknown instruction: {mnemonic}")
+            instruction_format, opcode, funct = INSTRUCTION_TABLE[mnemonic]
+            expected = FORMAT_OPERANDS[instruction_format]
+
+            # Operands are separated by commas or whitespace, `offset(base)` is one operand
+            operands = []
+            position = 1
+            while position < len(tokens):
+                kind, text = tokens[position]
+                position += 1
+                if text == ',':
+                    continue
+                if len(operands) >= len(expected):
+                    raise ValueError(f"Too many operands, expected {len(expected)}")
+                wanted = expected[len(operands)]
+                if wanted == 'memory':
+                    offset = 0
+                    if kind == 'number':
+                        offset = self.parse_immediate(text)
+                        kind, text = tokens[position] if position < len(tokens) else (None, '')
+                        position += 1
+                    base = tokens[position:position + 2]
+                    if text != '(' or len(base) != 2 or base[0][0] != 'register' or base[1][1] != ')':
+                        raise ValueError("Expected offset(register) operand")
+                    operands.append((offset, self.parse_register(base[0][1])))
+                    position += 2
+                elif wanted == 'register':
+                    if kind != 'register':
+                        raise ValueError(f"Invalid register: {text}")
+                    operands.append(self.parse_register(text))
+                elif wanted == 'immediate':
+                    if kind == 'number':
+                        operands.append(self.parse_immediate(text))
+                    elif kind == 'name':
+                        operands.append(text)  # Label address, resolved when encoding
+                    else:
+                        raise ValueError(f"Invalid immediate value: {text}")
+                else:
+                    if kind not in ('name', 'number'):
+                        raise ValueError(f"Invalid label: {text}")
+                    operands.append(text)
+            if len(operands) != len(expected):
+                raise ValueError(f"Expected {len(expected)} operands, got {len(operands)}")
+            return instruction_format, opcode, funct, tuple(operands)
+        except Exception as e:
+            raise ValueError(f"Error assembling instruction '{instruction}': {str(e)}")
+
+    def parse_instruction(self, instruction):
+        """Return the parse_tokens() result of an instruction, cached per instruction text"""
+        parsed = self._parsed.get(instruction)
+        if parsed is None:
+            label, text, tokens = self.tokenize(instruction)
+            if label is not None or not tokens:
+                raise ValueError(f"Error assembling instruction '{instruction}': Expected a single instruction")
+            parsed = self.parse_tokens(instruction, tokens)
+            self._parsed[instruction] = parsed
+        return parsed
     
+    def parse_line(self, line, line_num):
+        """Split a source line into (label, instruction), tokenising and validating it in one pass\n
+        Results are cached per line text"""
+        cached = self._line_cache.get(line)
+        if cached is not None:
+            return cached
+
+        label, instruction, tokens = self.tokenize(line, line_num)
+        if tokens and instruction not in self._parsed:
+            self._parsed[instruction] = self.parse_tokens(instruction, tokens)
+
+        if len(self._line_cache) >= self.LINE_CACHE_LIMIT:
+            self._line_cache.clear()
+            self._parsed.clear()
+            self._translations.clear()
+        self._line_cache[line] = (label, instruction)
+        return label, instruction
+
+    def get_line_numbers(self):
+        """Return the source line number of each instruction of the last assembled program\n
+        After a cache hit they are computed on first use"""
+        if self.line_numbers is None:
+            self.line_numbers = [line_num for line_num, line in enumerate(self._source, 1)
+                                 if self.parse_line(line, line_num)[1]]
+            self._source = None
+        return self.line_numbers
+
     def first_pass(self, code):
         """First pass: collect all labels and their addresses with validation"""
         self.current_address = 0
         self.labels = {}
         self.instructions = []
+        self.line_numbers = []
+        self._source = None
         
         for line_num, line in enumerate(code, 1):
-            # Split comments
-            line = line.split('#')[0].strip()
-            if not line:
-                continue
-            
-            # Process labels
-            if ':' in line:
-                label = line[:line.find(':')].strip()
-                if not self.is_valid_label(label):
-                    raise SyntaxError(f"Invalid label '{label}' at line {line_num}")
+            label, instruction = self.parse_line(line, line_num)
+            if label is not None:
                 self.labels[label] = self.current_address * 4
-                
-                # Process instruction after label
-                instruction = line[line.find(':')+1:].strip()
-                if instruction:
-                    if not self.is_valid_instruction(instruction):
-                        raise SyntaxError(f"Invalid instruction '{instruction}' at line {line_num}")
-                    self.instructions.append(instruction)
-                    self.current_address += 1
-            else:
-                if not self.is_valid_instruction(line):
-                    raise SyntaxError(f"Invalid instruction '{line}' at line {line_num}")
-                self.instructions.append(line)
+            if instruction:
+                self.instructions.append(instruction)
+                self.line_numbers.append(line_num)
                 self.current_address += 1
         
         return self.instructions
@@ -97,7 +307,7 @@ class Assembler:
         """Parse immediate value"""
         try:
             # Handle hex values
-            if imm.startswith('0x'):
+            if imm.lstrip('-').startswith('0x'):
                 return int(imm, 16)
             # Handle decimal values
             return int(imm)
@@ -109,100 +319,185 @@ class Assembler:
 
     def assemble_instruction(self, instruction):
         """Assemble a single instruction"""
-        parts = instruction.replace(',', ' ').split()
-        if not parts:
-            return None
-            
-        opcode = parts[0].lower()
+        instruction_format, opcode, funct, operands = self.parse_instruction(instruction)
         
         try:
-            # R-format instructions
-            if opcode in ['add', 'sub', 'and', 'or', 'slt']:
-                rd = self.parse_register(parts[1])
-                rs = self.parse_register(parts[2])
-                rt = self.parse_register(parts[3])
-                return (self.opcode_map[opcode] << 26) | (rs << 21) | (rt << 16) | \
-                       (rd << 11) | self.funct_map[opcode]
-                       
-            # Shift instructions
-            elif opcode in ['sll', 'srl']:
-                rd = self.parse_register(parts[1])
-                rt = self.parse_register(parts[2])
-                shamt = self.parse_immediate(parts[3])
-                return (self.opcode_map[opcode] << 26) | (rt << 16) | \
-                       (rd << 11) | (shamt << 6) | self.funct_map[opcode]
-                       
-            # I-format instructions
-            elif opcode in ['addi']:
-                rt = self.parse_register(parts[1])
-                rs = self.parse_register(parts[2])
-                imm = self.parse_immediate(parts[3])
-                return (self.opcode_map[opcode] << 26) | (rs << 21) | \
-                       (rt << 16) | (imm & 0xFFFF)
-                       
-            # Memory instructions
-            elif opcode in ['lw', 'sw']:
-                rt = self.parse_register(parts[1])
-                offset_base = parts[2].replace(')', '').split('(')
-                offset = int(offset_base[0])
-                rs = self.parse_register(offset_base[1])
-                return (self.opcode_map[opcode] << 26) | (rs << 21) | \
-                       (rt << 16) | (offset & 0xFFFF)
-                       
-            # Branch instructions
-            elif opcode in ['beq', 'bne']:
-                rs = self.parse_register(parts[1])
-                rt = self.parse_register(parts[2])
-                label = parts[3]
-                if label in self.labels:
-                    # Calculate word offset (divide by 4)
-                    offset = (self.labels[label] - (self.current_address * 4 + 4)) // 4
-                    return (self.opcode_map[opcode] << 26) | (rs << 21) | \
-                           (rt << 16) | (offset & 0xFFFF)
-                else:
-                    raise ValueError(f"Undefined label: {label}")
-                    
-            # Jump instructions
-            elif opcode in ['j', 'jal']:
-                if parts[1] in self.labels:
-                    target = self.labels[parts[1]]
-                    return (self.opcode_map[opcode] << 26) | target
-                else:
-                    raise ValueError(f"Undefined label: {parts[1]}")
-                    
-            # Jump register
-            elif opcode == 'jr':
-                rs = self.parse_register(parts[1])
-                return (self.opcode_map[opcode] << 26) | (rs << 21) | \
-                       self.funct_map[opcode]
-                       
-            else:
-                raise ValueError(f"Unknown instruction: {opcode}")
-                
+            if instruction_format == 'R':
+                rd, rs, rt = operands
+                return (rs << 21) | (rt << 16) | (rd << 11) | funct
+            
+            if instruction_format == 'SHIFT':
+                rd, rt, shamt = operands
+                return (rt << 16) | (rd << 11) | ((self.resolve_immediate(shamt) & 0x1F) << 6) | funct
+            
+            if instruction_format == 'IMMEDIATE':
+                rt, rs, imm = operands
+                return (opcode << 26) | (rs << 21) | (rt << 16) | (self.resolve_immediate(imm) & 0xFFFF)
+            
+            if instruction_format == 'MEMORY':
+                rt, (offset, rs) = operands
+                return (opcode << 26) | (rs << 21) | (rt << 16) | (offset & 0xFFFF)
+            
+            if instruction_format == 'BRANCH':
+                rs, rt, label = operands
+                # Calculate word offset (divide by 4)
+                offset = (self.resolve_label(label) - (self.current_address * 4 + 4)) // 4
+                return (opcode << 26) | (rs << 21) | (rt << 16) | (offset & 0xFFFF)
+            
+            if instruction_format == 'JUMP':
+                # Address field holds the word address of the target
+                target = self.resolve_label(operands[0]) >> 2
+                return (opcode << 26) | (target & 0x3FFFFFF)
+            
+            # JUMP_REGISTER
+            return (operands[0] << 21) | funct
         except Exception as e:
             raise ValueError(f"Error assembling instruction '{instruction}': {str(e)}")
 
+    def resolve_label(self, label):
+        if label in self.labels:
+            return self.labels[label]
+        raise ValueError(f"Undefined label: {label}")
+
+    def resolve_immediate(self, imm):
+        """Return an immediate operand, label operands resolve to their address"""
+        if isinstance(imm, str):
+            if imm in self.labels:
+                return self.labels[imm]
+            raise ValueError(f"Invalid immediate value: {imm}")
+        return imm
+
     def assemble(self, code):
-        """Assemble the complete program"""
+        """Assemble the complete program, reusing the cached result of an identical source\n
+        Otherwise only the lines that changed since the previous call are encoded again"""
         if isinstance(code, str):
             code = code.split('\n')
 
-        self.translations.clear()
+        key = None
+        if self.cache.size:
+            key = self.cache.key(code)
+            entry = self.cache.get(key)
+            if entry is not None:
+                machine_code, labels, instructions, translations = entry
+                self.labels = dict(labels)
+                self.instructions = list(instructions)
+                self.translations = list(translations)
+                # Comments and blank lines are not part of the key, so line numbers can differ
+                self.line_numbers = None
+                self._source = code
+                self.current_address = len(machine_code)
+                self.last_encoded = 0
+                return list(machine_code)
+
         self.first_pass(code)
-        
-        machine_code = []
-        self.current_address = 0
-        
-        for instruction in self.instructions:
-            if instruction.strip():
-                mc = self.assemble_instruction(instruction)
-                if mc is not None:
-                    machine_code.append(mc)
-                    self.translations.append(self.translate(mc, instruction))
-                    self.current_address += 1
-                    
+        machine_code = self.encode()
+
+        if key is not None:
+            self.cache.put(key, (tuple(machine_code), dict(self.labels),
+                                 tuple(self.instructions), tuple(self.translations)))
         return machine_code
     
+    def label_reference(self, instruction):
+        """Return (label, relative) for the label an instruction refers to, or None\n
+        Branch offsets are relative to the instruction, other label uses are absolute addresses"""
+        instruction_format, _, _, operands = self.parse_instruction(instruction)
+        if instruction_format == 'BRANCH':
+            return operands[2], True
+        if instruction_format == 'JUMP':
+            return operands[0], False
+        if instruction_format in ('IMMEDIATE', 'SHIFT') and isinstance(operands[2], str):
+            return operands[2], False
+        return None
+
+    def encode(self):
+        """Second pass: encode self.instructions\n
+        Only instructions that differ from the previous pass are encoded, plus the
+        label users whose encoded offset or address moved. The common prefix and
+        suffix of the instruction list are reused from the previous result."""
+        new = self.instructions
+        previous = self._previous
+        if previous is None:
+            prefix = suffix = 0
+            old_count = 0
+            machine_code = [None] * len(new)
+            translations = [None] * len(new)
+            references = [None] * len(new)
+            dependents = {}
+        else:
+            old = previous['instructions']
+            old_count = len(old)
+            limit = min(old_count, len(new))
+            prefix = 0
+            while prefix < limit and old[prefix] == new[prefix]:
+                prefix += 1
+            suffix = 0
+            while suffix < limit - prefix and old[old_count - 1 - suffix] == new[len(new) - 1 - suffix]:
+                suffix += 1
+            middle = len(new) - prefix - suffix
+            machine_code = previous['machine_code'][:prefix] + [None] * middle + previous['machine_code'][old_count - suffix:]
+            translations = previous['translations'][:prefix] + [None] * middle + previous['translations'][old_count - suffix:]
+            references = previous['references'][:prefix] + [None] * middle + previous['references'][old_count - suffix:]
+
+        delta = len(new) - old_count
+        suffix_start = len(new) - suffix
+        dirty = set(range(prefix, suffix_start))
+
+        if previous is not None:
+            # Move the label -> users index to the new instruction numbering
+            dependents = {}
+            for label, users in previous['dependents'].items():
+                moved = {i if i < prefix else i + delta for i in users if i < prefix or i >= old_count - suffix}
+                if moved:
+                    dependents[label] = moved
+            old_labels = previous['labels']
+            for label in old_labels.keys() | self.labels.keys():
+                old_address = old_labels.get(label)
+                new_address = self.labels.get(label)
+                if old_address == new_address and delta == 0:
+                    continue
+                for i in dependents.get(label, ()):
+                    if i in dirty:
+                        continue
+                    relative = references[i][1]
+                    if new_address is None or old_address is None:
+                        dirty.add(i)
+                    elif relative:
+                        # Branch offsets only change if label and branch moved differently
+                        shift = delta * 4 if i >= suffix_start else 0
+                        if new_address - old_address != shift:
+                            dirty.add(i)
+                    elif new_address != old_address:
+                        dirty.add(i)
+
+        for i in sorted(dirty):
+            instruction = new[i]
+            old_reference = references[i]
+            if old_reference is not None and i in dependents.get(old_reference[0], ()):
+                dependents[old_reference[0]].discard(i)
+            self.current_address = i
+            mc = self.assemble_instruction(instruction)
+            machine_code[i] = mc
+            translation = self._translations.get((mc, instruction))
+            if translation is None:
+                translation = self._translations[(mc, instruction)] = self.translate(mc, instruction)
+            translations[i] = translation
+            references[i] = self.label_reference(instruction)
+            if references[i] is not None:
+                dependents.setdefault(references[i][0], set()).add(i)
+
+        self.current_address = len(new)
+        self.translations = translations
+        self.last_encoded = len(dirty)
+        self._previous = {
+            'instructions': list(new),
+            'machine_code': machine_code,
+            'translations': translations,
+            'references': references,
+            'dependents': dependents,
+            'labels': dict(self.labels)
+        }
+        return list(machine_code)
+
     def translate(self, instruction, original_text):
         """Translate single instruction to machine code formats"""
         # Extract fields
@@ -240,6 +535,28 @@ class Assembler:
         }
         return translation
     
+    def get_symbols(self):
+        """Return the labels, instructions, translations and source line numbers of the last assembled program\n
+        They are replaced, never changed, by the next assembly, so they can be handed to another
+        Assembler with set_symbols(), e.g. when the program was assembled on another thread\n
+        Returns:\n
+            dict: labels, instructions, translations and line_numbers
+        """
+        return {
+            'labels': self.labels,
+            'instructions': self.instructions,
+            'translations': self.translations,
+            'line_numbers': self.get_line_numbers()
+        }
+
+    def set_symbols(self, symbols):
+        """Adopt the get_symbols() result of another Assembler for the machine code it produced"""
+        self.labels = symbols['labels']
+        self.instructions = symbols['instructions']
+        self.translations = symbols['translations']
+        self.line_numbers = symbols['line_numbers']
+        self._source = None
+
     def get_translations(self, format_type='all'):
         """Return stored translations in specified format"""
         for line in self.translations:
@@ -0,0 +1,267 @@
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, only needed by BatchSimulator
+    np = None
+
+from .memory import Memory
+from .simulator import Simulator, STORE_INSTRUCTIONS
+
+'''
+    Batch Simulator Component
+    Runs one program over many initial states in lockstep with NumPy
+'''
+
+# Lane status codes
+RUNNING = 0
+COMPLETED = 1
+HALTED = 2
+ERROR = 3
+LIMIT = 4
+STATUS_NAMES = {RUNNING: 'running', COMPLETED: 'completed', HALTED: 'halted', ERROR: 'error', LIMIT: 'limit'}
+
+# Default data memory of every lane as (base address, size in bytes)
+SEGMENTS = (
+    (0x00000000, 4096),
+    (Memory.GLOBAL_POINTER, 4096),
+    (Memory.DATA_SEGMENT_BASE, 4096),
+    (Memory.STACK_POINTER + 4 - 4096, 4096)
+)
+
+class BatchSimulator:
+    '''
+    Batch Simulator\n
+    Holds N lanes, each with its own register file, PC and data memory:\n
+    - registers: (N, 32) uint32 array, memory: (N, words) uint32 array covering `segments`\n
+    - The program is assembled and decoded by a Simulator, so lanes use the same decoder and
+      operand layout as the interpreter\n
+    - Every iteration executes the instruction at the lowest PC among the running lanes, on
+      all lanes at that PC, as masked vectorised operations. Divergent lanes wait and
+      reconverge when their PCs meet again\n
+    - Lanes stop independently as completed, halted, error (memory fault) or limit\n
+    Results match running each lane on its own Simulator, as long as memory accesses stay
+    inside the segments. Accesses outside them stop the lane with an error.\n
+    Requires NumPy.
+    '''
+    def __init__(self, lanes, segments=SEGMENTS):
+        if np is None:
+            raise ImportError("BatchSimulator requires NumPy, install it with `pip install numpy`")
+        if lanes <= 0:
+            raise ValueError(f"Invalid lane count: {lanes}")
+        self.lanes = lanes
+        self.segments = []  # (base, size, first column)
+        columns = 0
+        for base, size in sorted(segments):
+            if base % 4 or size % 4 or size <= 0:
+                raise ValueError(f"Segment {base:#x}+{size} is not word-aligned")
+            if self.segments and base < self.segments[-1][0] + self.segments[-1][1]:
+                raise ValueError(f"Segment {base:#x} overlaps the previous segment")
+            self.segments.append((base, size, columns))
+            columns += size // 4
+        self.simulator = Simulator(history_depth=0)
+        self.decoded_instructions = []
+        self.program_length = 0
+        self.registers = np.zeros((lanes, 32), dtype=np.uint32)
+        self.memory = np.zeros((lanes, columns), dtype=np.uint32)
+        self.pc = np.zeros(lanes, dtype=np.int64)
+        self.steps = np.zeros(lanes, dtype=np.int64)
+        self.status = np.zeros(lanes, dtype=np.uint8)
+        self.messages = {}  # Lane -> error message
+
+    def load(self, program):
+        '''Assemble a program and reset every lane to the initial Simulator state\n
+        Returns:\n
+            list: Machine code
+        '''
+        simulator = self.simulator
+        simulator.load(program)
+        self.decoded_instructions = simulator.decoded_instructions
+        self.program_length = simulator.program_length
+        self.registers[:] = np.array(simulator.registers.registers, dtype=np.uint32)
+        self.memory[:] = 0
+        self.pc[:] = 0
+        self.steps[:] = 0
+        self.status[:] = RUNNING
+        self.messages = {}
+        return [simulator.memory.get_instruction(i * 4) for i in range(self.program_length)]
+
+    def set_register(self, register, values):
+        '''Set a register on every lane\n
+        Parameters:\n
+            register (int): Register number (1-31)\n
+            values (int | sequence): One value for all lanes or one per lane, negative values are stored as 2's complement
+        '''
+        if not 0 < register < 32:
+            raise ValueError(f"Invalid register number: {register}")
+        self.registers[:, register] = np.asarray(values, dtype=np.int64) & 0xFFFFFFFF
+
+    def write_word(self, address, values):
+        '''Set a data word on every lane, one value for all lanes or one per lane'''
+        self.memory[:, self._column(address)] = np.asarray(values, dtype=np.int64) & 0xFFFFFFFF
+
+    def read_word(self, address):
+        '''Return the data word at `address` of every lane as an array'''
+        return self.memory[:, self._column(address)].copy()
+
+    def _column(self, address):
+        if address % 4:
+            raise ValueError(f"Memory Access Error: Unaligned adress {address}")
+        for base, size, first in self.segments:
+            if base <= address < base + size:
+                return first + (address - base) // 4
+        raise ValueError(f"Memory Access Error: Address {address:#x} is outside the batch memory segments")
+
+    def _columns(self, addresses):
+        '''Map word addresses (int64 array) to memory columns, -1 outside the segments'''
+        columns = np.full(addresses.shape, -1, dtype=np.int64)
+        for base, size, first in self.segments:
+            inside = (addresses >= base) & (addresses < base + size)
+            columns[inside] = first + ((addresses[inside] - base) >> 2)
+        return columns
+
+    def _access(self, lanes, base, offset, alignment):
+        '''Compute the addresses of a load or store, stopping faulting lanes\n
+        Returns:\n
+            tuple: (lanes without a fault, their byte addresses, their memory columns)
+        '''
+        addresses = (self.registers[lanes, base].astype(np.int64) + offset) & 0xFFFFFFFF
+        columns = self._columns(addresses & ~3)
+        bad = (columns < 0) | ((addresses & (alignment - 1)) != 0)
+        if bad.any():
+            self.status[lanes[bad]] = ERROR
+            for lane, address in zip(lanes[bad].tolist(), addresses[bad].tolist()):
+                if address % alignment:
+                    self.messages[lane] = f"Memory Access Error: Unaligned adress {address}"
+                else:
+                    self.messages[lane] = f"Memory Access Error: Address {address:#x} is outside the batch memory segments"
+            good = ~bad
+            return lanes[good], addresses[good], columns[good]
+        return lanes, addresses, columns
+
+    def _execute(self, decoded, lanes):
+        '''Execute one decoded instruction on `lanes`, returns the lanes that did not fault\n
+        Operands follow DecodedInstruction: (rd, rs, rt), (rt, rs, imm), (rs, rt, target) or (target, link)
+        '''
+        name, a, b, c = decoded.name, decoded.a, decoded.b, decoded.c
+        r = self.registers
+        pc = self.pc
+        if decoded.handler == self.simulator._op_nop:
+            pc[lanes] += 4
+        elif name == 'add':
+            r[lanes, a] = r[lanes, b] + r[lanes, c]
+            pc[lanes] += 4
+        elif name == 'sub':
+            r[lanes, a] = r[lanes, b] - r[lanes, c]
+            pc[lanes] += 4
+        elif name == 'and':
+            r[lanes, a] = r[lanes, b] & r[lanes, c]
+            pc[lanes] += 4
+        elif name == 'or':
+            r[lanes, a] = r[lanes, b] | r[lanes, c]
+            pc[lanes] += 4
+        elif name == 'slt':
+            r[lanes, a] = r[lanes, b].view(np.int32) < r[lanes, c].view(np.int32)
+            pc[lanes] += 4
+        elif name == 'sll':
+            r[lanes, a] = r[lanes, b] << np.uint32(c)
+            pc[lanes] += 4
+        elif name == 'srl':
+            r[lanes, a] = r[lanes, b] >> np.uint32(c)
+            pc[lanes] += 4
+        elif name == 'addi':
+            r[lanes, a] = r[lanes, b] + np.uint32(c & 0xFFFFFFFF)
+            pc[lanes] += 4
+        elif name in ('lw', 'lh', 'lhu', 'lb', 'lbu'):
+            alignment = {'lw': 4, 'lh': 2, 'lhu': 2}.get(name, 1)
+            lanes, addresses, columns = self._access(lanes, b, c, alignment)
+            words = self.memory[lanes, columns].astype(np.int64)
+            if name != 'lw':
+                shift = (addresses & 3) * 8
+                if alignment == 2:
+                    words = (words >> shift) & 0xFFFF
+                    if name == 'lh':
+                        words = ((words ^ 0x8000) - 0x8000) & 0xFFFFFFFF
+                else:
+                    words = (words >> shift) & 0xFF
+                    if name == 'lb':
+                        words = ((words ^ 0x80) - 0x80) & 0xFFFFFFFF
+            if a:
+                r[lanes, a] = words
+            pc[lanes] += 4
+        elif name in STORE_INSTRUCTIONS:
+            alignment = {'sw': 4, 'sh': 2, 'sb': 1}[name]
+            lanes, addresses, columns = self._access(lanes, b, c, alignment)
+            values = r[lanes, a].astype(np.int64)
+            if name != 'sw':
+                shift = (addresses & 3) * 8
+                mask = (0xFFFF if alignment == 2 else 0xFF) << shift
+                old = self.memory[lanes, columns].astype(np.int64)
+                values = (old & ~mask) | ((values << shift) & mask)
+            self.memory[lanes, columns] = values
+            pc[lanes] += 4
+        elif name in ('beq', 'bne'):
+            taken = r[lanes, a] == r[lanes, b]
+            if name == 'bne':
+                taken = ~taken
+            pc[lanes] = np.where(taken, c, pc[lanes] + 4)
+        elif name == 'j':
+            pc[lanes] = a
+        elif name == 'jal':
+            r[lanes, 31] = b
+            pc[lanes] = a
+        elif name == 'jr':
+            pc[lanes] = r[lanes, a]
+        else:
+            raise ValueError(f"Cannot execute instruction: {name}")
+        return lanes
+
+    def run(self, max_instructions=1000000):
+        '''Run all lanes until each one stops\n
+        Parameters:\n
+            max_instructions (int): Instruction limit per lane\n
+        Returns:\n
+            list: Per-lane results, see result()
+        '''
+        table = self.decoded_instructions
+        end = self.program_length * 4
+        status = self.status
+        pc = self.pc
+        while True:
+            running = status == RUNNING
+            status[running & (pc >= end)] = COMPLETED
+            status[running & (self.steps >= max_instructions) & (pc < end)] = LIMIT
+            running = status == RUNNING
+            if not running.any():
+                break
+            # Lowest PC first, so lanes that leave a loop early wait for the others
+            current = int(pc[running].min())
+            lanes = np.nonzero(running & (pc == current))[0]
+            decoded = table[current >> 2]
+            if decoded.handler is None:
+                status[lanes] = HALTED
+                continue
+            lanes = self._execute(decoded, lanes)
+            self.steps[lanes] += 1
+            pc[lanes] &= 0xFFFFFFFF
+        return [self.result(lane) for lane in range(self.lanes)]
+
+    def result(self, lane):
+        '''Final state of one lane\n
+        Returns:\n
+            dict: status, message, instructions_executed, pc, signed registers by name and non-zero data words
+        '''
+        registers = self.simulator.registers
+        memory = {}
+        row = self.memory[lane]
+        for base, size, first in self.segments:
+            for column in np.nonzero(row[first:first + size // 4])[0].tolist():
+                memory[base + column * 4] = int(row[first + column])
+        values = self.registers[lane].astype(np.int64)
+        values = np.where(values & 0x80000000, values - 0x100000000, values).tolist()
+        return {
+            'status': STATUS_NAMES[int(self.status[lane])],
+            'message': self.messages.get(lane, ''),
+            'instructions_executed': int(self.steps[lane]),
+            'pc': int(self.pc[lane]),
+            'registers': {registers.get_register_name(i): value for i, value in enumerate(values)},
+            'memory': memory
+        }
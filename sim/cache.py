@@ -0,0 +1,168 @@
+import random
+from array import array
+from .profiler import STORE_NAMES, source_lines
+
+'''
+    Cache Component
+    Set-associative data cache model of the SIM component with hit/miss statistics
+'''
+
+POLICIES = ('LRU', 'FIFO', 'random')
+
+def _power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+class CacheModel:
+    '''
+    Cache Model\n
+    Data cache in front of Memory, enabled with Simulator.enable_cache():\n
+    - size bytes in lines of line_size bytes, grouped into sets of `associativity` lines
+      (1 is direct-mapped, size // line_size fully associative)\n
+    - The victim in a full set is the least recently used line (LRU), the oldest one (FIFO)
+      or a random one drawn from a generator seeded with `seed`\n
+    - Write-back caches allocate on store misses and write dirty victims back to memory, write-through
+      caches send every store to memory and do not allocate on store misses\n
+    - Hits, misses and evictions are counted overall and per load/store instruction\n
+    Only the accesses are modelled, data is always read from and written to Memory, so results are unchanged.
+    '''
+    def __init__(self, simulator, size=4096, line_size=16, associativity=1, policy='LRU', write_back=True, seed=0):
+        if not _power_of_two(line_size) or not _power_of_two(associativity):
+            raise ValueError(f"Line size and associativity must be powers of two: {line_size}, {associativity}")
+        if size % (line_size * associativity) or not _power_of_two(size // (line_size * associativity)):
+            raise ValueError(f"Cache size {size} is not a power-of-two number of {associativity} x {line_size} byte sets")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.simulator = simulator
+        self.size = size
+        self.line_size = line_size
+        self.associativity = associativity
+        self.policy = policy
+        self.write_back = write_back
+        self.seed = seed
+        self.set_count = size // (line_size * associativity)
+        self.line_shift = line_size.bit_length() - 1
+        self.reset()
+
+    def reset(self):
+        '''Invalidate every line and clear all counters\n
+        Returns:\n
+            None
+        '''
+        size = self.simulator.program_length
+        self.sets = [[] for _ in range(self.set_count)]  # Line numbers of each set, victim first
+        self.dirty = set()  # Line numbers written since they were filled (write-back only)
+        self.random = random.Random(self.seed)
+        self.hits = array('Q', bytes(8 * size))  # Per instruction
+        self.misses = array('Q', bytes(8 * size))
+        self.evictions = array('Q', bytes(8 * size))
+        self.writebacks = 0  # Dirty lines written back to memory
+        self.memory_reads = 0  # Lines filled from memory
+        self.memory_writes = 0  # Stores written through to memory
+
+    def access(self, address, write, index):
+        '''Look up one data access\n
+        Parameters:\n
+            address (int): Byte address\n
+            write (bool): The access is a store\n
+            index (int): Instruction index (PC // 4) charged with the access\n
+        Returns:\n
+            bool: True on a hit
+        '''
+        line = address >> self.line_shift
+        ways = self.sets[line & (self.set_count - 1)]
+        if line in ways:
+            self.hits[index] += 1
+            if self.policy == 'LRU':
+                ways.remove(line)
+                ways.append(line)
+            if write:
+                if self.write_back:
+                    self.dirty.add(line)
+                else:
+                    self.memory_writes += 1
+            return True
+
+        self.misses[index] += 1
+        if write and not self.write_back:
+            self.memory_writes += 1
+            return False
+        self.memory_reads += 1
+        if len(ways) >= self.associativity:
+            victim = ways.pop(self.random.randrange(len(ways)) if self.policy == 'random' else 0)
+            self.evictions[index] += 1
+            if victim in self.dirty:
+                self.dirty.discard(victim)
+                self.writebacks += 1
+        ways.append(line)
+        if write:
+            self.dirty.add(line)
+        return False
+
+    def record(self, pc, decoded, advanced, address=None):
+        '''Look up the data access of one executed instruction, see Simulator.hooks\n
+        Parameters:\n
+            pc (int): Address of the instruction\n
+            decoded (DecodedInstruction): The executed instruction\n
+            advanced (bool): The handler result\n
+            address (int | None): Data address of a load or store, None for other instructions
+        '''
+        if address is not None:
+            self.access(address, decoded.name in STORE_NAMES, pc >> 2)
+
+    def statistics(self):
+        '''Return the overall counters\n
+        Returns:\n
+            dict: accesses, hits, misses, hit_rate, evictions, writebacks, memory_reads and memory_writes
+        '''
+        hits, misses = sum(self.hits), sum(self.misses)
+        return {
+            'accesses': hits + misses,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'evictions': sum(self.evictions),
+            'writebacks': self.writebacks,
+            'memory_reads': self.memory_reads,
+            'memory_writes': self.memory_writes
+        }
+
+    def instruction_statistics(self):
+        '''Return the counters of every load and store that accessed the cache\n
+        Returns:\n
+            list: dicts with pc, instruction (mnemonic), hits, misses, evictions, line and source, in PC order
+        '''
+        table = self.simulator.decoded_instructions
+        sources = source_lines(self.simulator)
+        rows = []
+        for index in range(len(self.hits)):
+            if not self.hits[index] and not self.misses[index]:
+                continue
+            line, source = sources[index] or (None, None)
+            rows.append({
+                'pc': index * 4,
+                'instruction': table[index].name,
+                'hits': self.hits[index],
+                'misses': self.misses[index],
+                'evictions': self.evictions[index],
+                'line': line,
+                'source': source
+            })
+        return rows
+
+    def report(self):
+        '''Return a text report of the configuration, overall counters and the counters of each access\n
+        Returns:\n
+            str: Report
+        '''
+        statistics = self.statistics()
+        lines = [f"Cache: {self.size} B, {self.line_size} B lines, {self.associativity}-way, {self.set_count} sets, "
+                 f"{self.policy}, {'write-back' if self.write_back else 'write-through'}",
+                 f"Accesses: {statistics['accesses']}  Hits: {statistics['hits']}  Misses: {statistics['misses']}  "
+                 f"Hit rate: {100.0 * statistics['hit_rate']:.1f}%",
+                 f"Evictions: {statistics['evictions']}  Write-backs: {statistics['writebacks']}  "
+                 f"Memory reads: {statistics['memory_reads']}  Memory writes: {statistics['memory_writes']}",
+                 "", f"  {'PC':<12}{'Hits':>10}{'Misses':>10}{'Evictions':>10}  Source"]
+        for row in self.instruction_statistics():
+            source = row['source'] if row['source'] is not None else row['instruction']
+            lines.append(f"  0x{row['pc']:08x}{row['hits']:>10}{row['misses']:>10}{row['evictions']:>10}  {source}")
+        return '\n'.join(lines)
@@ -0,0 +1,154 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .simulator import Simulator
+
+'''
+    Command Line Component
+    Headless batch runner for the SIM component, `python -m sim --help` for usage
+'''
+
+SLICE_SIZE = 10000  # Instructions executed between wall-clock checks
+
+def expand_paths(patterns):
+    '''Expand files and glob patterns (`**` is recursive), keeping order and dropping duplicates\n
+    Returns:\n
+        list: File paths, patterns without matches are kept so they are reported as errors
+    '''
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches or [pattern]:
+            if path not in seen and not os.path.isdir(path):
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+def run_file(path, max_instructions=1000000, timeout=None, engine='interpreter'):
+    '''Assemble and run one file\n
+    Parameters:\n
+        path (str): Assembly file\n
+        max_instructions (int): Instruction limit\n
+        timeout (float | None): Wall-clock limit of the run in seconds, checked every SLICE_SIZE instructions\n
+        engine (str): Simulator execution engine\n
+    Returns:\n
+        dict: JSON-serialisable result with file, status, message, counters, timing, pc,
+        registers and non-zero data memory words. Status is 'completed', 'halted',
+        'limit' (instruction limit), 'timeout' or 'error'
+    '''
+    result = {'file': path, 'status': 'error', 'message': '', 'instructions_executed': 0,
+              'assemble_time': 0.0, 'elapsed_time': 0.0}
+    # No time travel in batch jobs, so neither history nor checkpoints are kept
+    simulator = Simulator(history_depth=0, checkpoint_interval=0, engine=engine)
+    start = time.perf_counter()
+    try:
+        with open(path, 'r') as f:
+            simulator.load(f.read())
+    except Exception as e:
+        result['message'] = f"{type(e).__name__}: {e}"
+        return result
+    result['assemble_time'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    deadline = start + timeout if timeout else None
+    status = 'running'
+    try:
+        while status == 'running':
+            remaining = max_instructions - result['instructions_executed']
+            if remaining <= 0:
+                status = 'limit'
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                status = 'timeout'
+                break
+            status, count = simulator.execute(min(SLICE_SIZE, remaining))
+            result['instructions_executed'] += count
+    except Exception as e:
+        status = 'error'
+        result['message'] = f"{type(e).__name__}: {e}"
+        result['instructions_executed'] = simulator.steps_executed
+    elapsed = time.perf_counter() - start
+
+    messages = {
+        'completed': 'Program execution completed',
+        'halted': 'Program halted',
+        'limit': 'Program terminated - reached maximum instruction limit',
+        'timeout': 'Program terminated - reached wall-clock limit'
+    }
+    result.update({
+        'status': status,
+        'message': result['message'] or messages[status],
+        'elapsed_time': elapsed,
+        'instructions_per_second': result['instructions_executed'] / elapsed if elapsed > 0 else 0.0,
+        'pc': simulator.registers.pc,
+        'registers': simulator.get_register_state(label=True),
+        'memory': {f"0x{address:08x}": word for address, word in simulator.memory.read_data_memory().items()}
+    })
+    return result
+
+def _run_job(job):
+    '''Process pool entry point, never raises so one bad file cannot stop the batch'''
+    try:
+        return run_file(*job)
+    except BaseException as e:
+        return {'file': job[0], 'status': 'error', 'message': f"{type(e).__name__}: {e}"}
+
+def run_batch(paths, max_instructions=1000000, timeout=None, engine='interpreter', jobs=None):
+    '''Run files across a process pool\n
+    Yields:\n
+        dict: run_file() result of each file, in completion order
+    '''
+    job_list = [(path, max_instructions, timeout, engine) for path in paths]
+    if jobs == 1 or len(job_list) <= 1:
+        for job in job_list:
+            yield _run_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_run_job, job) for job in job_list]
+        for future in as_completed(futures):
+            yield future.result()
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m sim',
+        description='Assemble and run MIPS assembly files without the GUI, printing one JSON result per line.'
+    )
+    parser.add_argument('files', nargs='+', help='assembly files or glob patterns, e.g. "tests/**/*.asm"')
+    parser.add_argument('-n', '--max-instructions', type=int, default=1000000,
+                        help='instruction limit per file (default: 1000000)')
+    parser.add_argument('-t', '--timeout', type=float, default=None,
+                        help='wall-clock limit per file in seconds')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: CPU count, 1 runs in this process)')
+    parser.add_argument('-e', '--engine', choices=['interpreter', 'blocks'], default='interpreter',
+                        help='execution engine (default: interpreter)')
+    parser.add_argument('-o', '--output', default='-', help='NDJSON output file (default: stdout)')
+    return parser
+
+def main(argv=None, stdout=None):
+    '''Command line entry point\n
+    Returns:\n
+        int: 0 if every program completed or halted, 1 otherwise
+    '''
+    args = build_parser().parse_args(argv)
+    paths = expand_paths(args.files)
+    exit_code = 0
+    out = stdout or sys.stdout
+    if args.output != '-':
+        out = open(args.output, 'w')
+    try:
+        for result in run_batch(paths, args.max_instructions, args.timeout, args.engine, args.jobs):
+            if result['status'] not in ('completed', 'halted'):
+                exit_code = 1
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+    finally:
+        if out is not (stdout or sys.stdout):
+            out.close()
+    return exit_code
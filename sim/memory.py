@@ -1,53 +1,292 @@
+import mmap
+import os
+from collections.abc import Mapping
+
 '''
     Memory Component
     Provides Immediate and Data Memory to SIM component
 '''
 
+class DataMemoryView(Mapping):
+    '''
+    Live read-only view of data memory as {byte address: word}\n
+    Only non-zero words are listed, in address order. Creating the view copies nothing,
+    iteration walks the allocated pages when it happens.
+    '''
+    def __init__(self, memory):
+        self._memory = memory
+
+    def __getitem__(self, address):
+        try:
+            word = self._memory.read_word(address)
+        except (TypeError, ValueError):
+            raise KeyError(address)
+        if not word:
+            raise KeyError(address)
+        return word
+
+    def __iter__(self):
+        for address, _ in self.items():
+            yield address
+
+    def items(self):
+        words = self._memory.words
+        for page_number in sorted(words):
+            page = words[page_number]
+            if not any(self._memory.pages[page_number]):
+                continue
+            base = page_number << self._memory.PAGE_SHIFT
+            for offset, word in enumerate(page):
+                if word:
+                    yield base + offset * 4, word
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
 class Memory:
+    '''
+    Memory\n
+    - Instruction memory: word list starting at PC 0, grown to the size of the loaded program\n
+    - Data memory: sparse 32-bit address space made of 4 KiB pages allocated on first write\n
+    Each page is a bytearray with a memoryview cast to 32-bit words, so a word takes 4 bytes
+    and bulk reads/writes are slice copies. Byte and halfword accesses are little-endian,
+    matching the word views on little-endian hosts.\n
+    Standard MIPS segment bases are provided for the data segment, global pointer and stack.
+    The text segment is deliberately not moved to its standard base 0x00400000: programs are
+    loaded at PC 0, which the predecoded table, history and profiler use as instruction index * 4.
+    Only the text segment size (0x0FC00000 bytes) limits the program.\n
+    Changed words are collected in `dirty` for views. Bulk operations mark all memory dirty,
+    the scalar accessors leave it to their caller (the simulator) to keep them cheap.
+    '''
+    PAGE_SIZE = 4096
+    PAGE_WORDS = PAGE_SIZE // 4
+    PAGE_SHIFT = 12
+
+    # Standard MIPS memory layout
+    TEXT_SEGMENT_SIZE = 0x0FC00000      # Size of the standard 0x00400000 - 0x0FFFFFFF text segment, loaded at PC 0
+    DATA_SEGMENT_BASE = 0x10010000
+    GLOBAL_POINTER = 0x10008000
+    STACK_POINTER = 0x7FFFEFFC
+
     def __init__(self):
-        self.INSTRUCTION_MEMORY_SIZE = 512
-        self.DATA_MEMORY_SIZE = 512
+        self.INSTRUCTION_MEMORY_SIZE = self.TEXT_SEGMENT_SIZE
+        self.DATA_MEMORY_SIZE = 0x100000000
         self.reset()
-    
+
     def reset(self):
-        self.instruction_memory = [0] * (self.INSTRUCTION_MEMORY_SIZE // 4)
-        self.data_memory = [0] * (self.DATA_MEMORY_SIZE // 4)
-        
+        self.instruction_memory = []
+        self.pages = {}  # Page number -> PAGE_SIZE bytes, a bytearray unless read-only
+        self.words = {}  # Page number -> memoryview of the page as PAGE_WORDS words
+        self.readonly = set()  # Shared pages (mapped images, snapshots), copied on first write
+        self.images = {}  # Base address -> size of each mapped data image
+        self.dirty = None  # Word addresses changed since the last take_dirty(), None if all may have changed
+        # Bumped on every instruction memory write so decoded copies can be invalidated
+        self.instruction_version = getattr(self, 'instruction_version', 0) + 1
+
     def read_instruction_memory(self):
         return self.instruction_memory
-    
+
     def read_data_memory(self):
-        return self.data_memory
-    
+        """Return a live DataMemoryView of the non-zero data words"""
+        return DataMemoryView(self)
+
     def load_instruction(self, address, instruction):
-        if 0 <= address < len(self.instruction_memory):
+        if 0 <= address < self.INSTRUCTION_MEMORY_SIZE // 4:
+            if address >= len(self.instruction_memory):
+                self.instruction_memory.extend([0] * (address + 1 - len(self.instruction_memory)))
             self.instruction_memory[address] = instruction
+            self.instruction_version += 1
         else:
             raise ValueError(f"Invalid instruction memory address: {address}")
-    
+
     def get_instruction(self, pc):
         """Get instruction at word-aligned PC address"""
         index = pc // 4  # Convert PC to array index
         if 0 <= index < len(self.instruction_memory):
             return self.instruction_memory[index]
         return 0
-    
+
+    def mark_dirty(self, address):
+        """Record a changed data word, any address inside the word may be given"""
+        if self.dirty is not None:
+            self.dirty.add(address & ~3)
+
+    def mark_all_dirty(self):
+        """Record that any data word may have changed"""
+        self.dirty = None
+
+    def take_dirty(self):
+        """Return and clear the changed word addresses, None if all data memory may have changed"""
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+
+    def _writable(self, page_number):
+        """Allocate a zeroed page, or copy a read-only one, and return its word view"""
+        if page_number in self.pages:
+            page = bytearray(self.pages[page_number])
+            self.readonly.discard(page_number)
+        else:
+            page = bytearray(self.PAGE_SIZE)
+        self.pages[page_number] = page
+        words = self.words[page_number] = memoryview(page).cast('I')
+        return words
+
+    def _share(self, page_number, page):
+        """Install an immutable page that is copied on first write"""
+        self.pages[page_number] = page
+        self.words[page_number] = memoryview(page).cast('I')
+        self.readonly.add(page_number)
+
     def write_word(self, address, value):
-        """Write a word to data memory at word-aligned address"""
+        """Write a word to data memory at word-aligned address, allocating its page on first touch"""
         if (address % 4) != 0:
             raise ValueError(f"Memory Access Error: Unaligned adress {address}")
-        if 0 <= address < len(self.data_memory) * 4:  # Check byte address
-            word_index = address // 4  # Convert byte address to word index
-            self.data_memory[word_index] = value & 0xFFFFFFFF
+        if 0 <= address < self.DATA_MEMORY_SIZE:
+            page_number = address >> self.PAGE_SHIFT
+            words = self.words.get(page_number)
+            if words is None or page_number in self.readonly:
+                words = self._writable(page_number)
+            words[(address & (self.PAGE_SIZE - 1)) >> 2] = value & 0xFFFFFFFF
         else:
             raise ValueError(f"Memory Access Error: Invalid adress {address}")
-    
+
     def read_word(self, address):
-        """Read a word from data memory at word-aligned address"""
+        """Read a word from data memory at word-aligned address, untouched pages read as zero"""
         if (address % 4) != 0:
             raise ValueError(f"Memory Access Error: Unaligned adress {address}")
-        if 0 <= address < len(self.data_memory) * 4:  # Check byte address
-            word_index = address // 4  # Convert byte address to word index
-            return self.data_memory[word_index]
+        if 0 <= address < self.DATA_MEMORY_SIZE:
+            words = self.words.get(address >> self.PAGE_SHIFT)
+            if words is None:
+                return 0
+            return words[(address & (self.PAGE_SIZE - 1)) >> 2]
         else:
-            raise ValueError(f"Memory Access Error: Invalid adress {address}")
\ No newline at end of file
+            raise ValueError(f"Memory Access Error: Invalid adress {address}")
+
+    def write_half(self, address, value):
+        """Write the low 16 bits of value at halfword-aligned address"""
+        if (address % 2) != 0:
+            raise ValueError(f"Memory Access Error: Unaligned adress {address}")
+        if 0 <= address < self.DATA_MEMORY_SIZE:
+            page_number = address >> self.PAGE_SHIFT
+            if page_number not in self.pages or page_number in self.readonly:
+                self._writable(page_number)
+            page = self.pages[page_number]
+            offset = address & (self.PAGE_SIZE - 1)
+            page[offset] = value & 0xFF
+            page[offset + 1] = (value >> 8) & 0xFF
+        else:
+            raise ValueError(f"Memory Access Error: Invalid adress {address}")
+
+    def read_half(self, address):
+        """Read an unsigned halfword at halfword-aligned address"""
+        if (address % 2) != 0:
+            raise ValueError(f"Memory Access Error: Unaligned adress {address}")
+        if 0 <= address < self.DATA_MEMORY_SIZE:
+            page = self.pages.get(address >> self.PAGE_SHIFT)
+            if page is None:
+                return 0
+            offset = address & (self.PAGE_SIZE - 1)
+            return page[offset] | (page[offset + 1] << 8)
+        else:
+            raise ValueError(f"Memory Access Error: Invalid adress {address}")
+
+    def write_byte(self, address, value):
+        """Write the low 8 bits of value at any address"""
+        if 0 <= address < self.DATA_MEMORY_SIZE:
+            page_number = address >> self.PAGE_SHIFT
+            if page_number not in self.pages or page_number in self.readonly:
+                self._writable(page_number)
+            self.pages[page_number][address & (self.PAGE_SIZE - 1)] = value & 0xFF
+        else:
+            raise ValueError(f"Memory Access Error: Invalid adress {address}")
+
+    def read_byte(self, address):
+        """Read an unsigned byte at any address"""
+        if 0 <= address < self.DATA_MEMORY_SIZE:
+            page = self.pages.get(address >> self.PAGE_SHIFT)
+            if page is None:
+                return 0
+            return page[address & (self.PAGE_SIZE - 1)]
+        else:
+            raise ValueError(f"Memory Access Error: Invalid adress {address}")
+
+    def _check_range(self, address, length):
+        if not (0 <= address and address + length <= self.DATA_MEMORY_SIZE and length >= 0):
+            raise ValueError(f"Memory Access Error: Invalid range {address}+{length}")
+
+    def read_bytes(self, address, length):
+        """Copy `length` bytes starting at address into a new bytearray, one slice per page"""
+        self._check_range(address, length)
+        data = bytearray(length)
+        view = memoryview(data)
+        position = 0
+        while position < length:
+            current = address + position
+            offset = current & (self.PAGE_SIZE - 1)
+            count = min(self.PAGE_SIZE - offset, length - position)
+            page = self.pages.get(current >> self.PAGE_SHIFT)
+            if page is not None:
+                view[position:position + count] = memoryview(page)[offset:offset + count]
+            position += count
+        return data
+
+    def write_bytes(self, address, data):
+        """Copy a bytes-like object into memory starting at address, one slice per page"""
+        data = memoryview(data).cast('B')
+        self._check_range(address, len(data))
+        self.dirty = None
+        position = 0
+        while position < len(data):
+            current = address + position
+            page_number = current >> self.PAGE_SHIFT
+            offset = current & (self.PAGE_SIZE - 1)
+            count = min(self.PAGE_SIZE - offset, len(data) - position)
+            if page_number not in self.pages or page_number in self.readonly:
+                self._writable(page_number)
+            memoryview(self.pages[page_number])[offset:offset + count] = data[position:position + count]
+            position += count
+
+    def snapshot(self):
+        """Return a copy of data memory that can be passed to restore()\n
+        Nothing is copied: every page becomes read-only and is shared with the snapshot,
+        the next write to a page copies it. Unchanged pages are shared by all snapshots"""
+        self.readonly.update(self.pages)
+        return dict(self.pages)
+
+    def restore(self, snapshot):
+        """Restore data memory from a snapshot() copy, pages are shared until written"""
+        self.pages = {}
+        self.words = {}
+        self.readonly = set()
+        self.dirty = None
+        for page_number, page in snapshot.items():
+            self._share(page_number, page)
+
+    def map_image(self, path, address):
+        """Map a binary file into data memory starting at a page-aligned address\n
+        Whole pages are read-only views of a read-only mmap, so the operating system
+        pages them in lazily and nothing is copied until a page is written. A trailing
+        partial page is copied. Pages covered by the image replace existing contents.\n
+        Returns:\n
+            int: Size of the image in bytes\n
+        Raises:\n
+            ValueError: If the address is not page-aligned or the image does not fit
+        """
+        if address % self.PAGE_SIZE != 0:
+            raise ValueError(f"Memory Access Error: Image address {address} is not page-aligned")
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self._check_range(address, size)
+            if size == 0:
+                return 0
+            image = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+        full = size - size % self.PAGE_SIZE
+        for offset in range(0, full, self.PAGE_SIZE):
+            self._share((address + offset) >> self.PAGE_SHIFT, image[offset:offset + self.PAGE_SIZE])
+        if full < size:
+            self.write_bytes(address + full, image[full:])
+        self.images[address] = size
+        self.dirty = None
+        return size
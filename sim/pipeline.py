@@ -0,0 +1,154 @@
+from array import array
+from .profiler import LOAD_NAMES, source_lines
+
+'''
+    Pipeline Component
+    Cycle timing of the SIM component on the classic five-stage MIPS pipeline
+'''
+
+# Operand fields of a DecodedInstruction read by each instruction and the stage needing them.
+# None is the branch resolution stage, configurable as ID or EX.
+READS = {
+    'add': (('b', 'EX'), ('c', 'EX')), 'sub': (('b', 'EX'), ('c', 'EX')),
+    'and': (('b', 'EX'), ('c', 'EX')), 'or': (('b', 'EX'), ('c', 'EX')),
+    'slt': (('b', 'EX'), ('c', 'EX')),
+    'sll': (('b', 'EX'),), 'srl': (('b', 'EX'),), 'addi': (('b', 'EX'),),
+    'lw': (('b', 'EX'),), 'lh': (('b', 'EX'),), 'lhu': (('b', 'EX'),),
+    'lb': (('b', 'EX'),), 'lbu': (('b', 'EX'),),
+    # Stores need the address in EX and the data only in MEM
+    'sw': (('b', 'EX'), ('a', 'MEM')), 'sh': (('b', 'EX'), ('a', 'MEM')), 'sb': (('b', 'EX'), ('a', 'MEM')),
+    'beq': (('a', None), ('b', None)), 'bne': (('a', None), ('b', None)),
+    'jr': (('a', 'ID'),)
+}
+
+# Cycles after ID at which each stage runs
+STAGE_OFFSETS = {'ID': 0, 'EX': 1, 'MEM': 2}
+
+STALL_KINDS = ('load_use', 'data', 'control')
+
+class PipelineModel:
+    '''
+    Pipeline Model\n
+    Timing model of the IF/ID/EX/MEM/WB pipeline, enabled with Simulator.enable_pipeline():\n
+    - Executed instructions are fed in order after the simulator ran them, architectural results are unchanged\n
+    - With forwarding, ALU results are forwarded from EX and loaded values from MEM, so only
+      load-use and branch-in-ID hazards stall. Without it a reader waits for the writer's WB
+      (registers are written in the first half of the cycle and read in the second)\n
+    - Branches are predicted not taken and resolved in branch_stage, 'ID' or 'EX'. A taken branch
+      flushes the 1 or 2 instructions fetched behind it, j, jal and jr are resolved in ID and flush 1\n
+    - Stalls are charged to the waiting instruction, flushes to the branch or jump\n
+    Every executed instruction is timed, including steps later undone by step_back() or replayed by seek().
+    '''
+    def __init__(self, simulator, forwarding=True, branch_stage='EX'):
+        if branch_stage not in ('ID', 'EX'):
+            raise ValueError(f"Unknown branch stage: {branch_stage}")
+        self.simulator = simulator
+        self.forwarding = forwarding
+        self.branch_stage = branch_stage
+        self.reset()
+
+    def reset(self):
+        '''Clear the pipeline state and all counters\n
+        Returns:\n
+            None
+        '''
+        size = self.simulator.program_length
+        self.instructions = 0
+        self.cycles = 0  # WB cycle of the last instruction, the first one is fetched in cycle 1
+        self.counts = array('Q', bytes(8 * size))  # Executions of each instruction
+        self.stalls = {kind: array('Q', bytes(8 * size)) for kind in STALL_KINDS}  # Stall cycles of each instruction
+        self.next_id = 2  # ID cycle of the next instruction without hazards
+        self.ready = [0] * 32  # Cycle that produces each register's value for forwarding
+        self.written = [0] * 32  # WB cycle of each register's last writer
+        self.loaded = [False] * 32  # Each register's last writer was a load
+
+    def record(self, pc, decoded, advanced, address=None):
+        '''Time one executed instruction\n
+        Parameters:\n
+            pc (int): Address of the instruction\n
+            decoded (DecodedInstruction): The executed instruction\n
+            advanced (bool): The handler result, False if the instruction redirected the PC\n
+            address (int | None): Data address of a load or store, unused by the timing
+        '''
+        name = decoded.name
+        id_cycle = self.next_id
+        stall, kind = 0, None
+        for field, stage in READS.get(name, ()):
+            register = getattr(decoded, field)
+            if not register:
+                continue
+            if self.forwarding:
+                earliest = self.ready[register] + 1 - STAGE_OFFSETS[stage or self.branch_stage]
+            else:
+                earliest = self.written[register]
+            if earliest - id_cycle > stall:
+                stall = earliest - id_cycle
+                kind = 'load_use' if self.loaded[register] else 'data'
+        id_cycle += stall
+
+        index = pc >> 2
+        self.counts[index] += 1
+        if stall:
+            self.stalls[kind][index] += stall
+        if decoded.dest:
+            load = name in LOAD_NAMES
+            self.ready[decoded.dest] = id_cycle + (2 if load else 1)
+            self.written[decoded.dest] = id_cycle + 3
+            self.loaded[decoded.dest] = load
+
+        self.cycles = id_cycle + 3
+        self.next_id = id_cycle + 1
+        if not advanced:
+            flush = 2 if name in ('beq', 'bne') and self.branch_stage == 'EX' else 1
+            self.stalls['control'][index] += flush
+            self.next_id += flush
+        self.instructions += 1
+
+    def cpi(self):
+        '''Return the cycles per instruction, 0.0 before the first instruction'''
+        return self.cycles / self.instructions if self.instructions else 0.0
+
+    def statistics(self):
+        '''Return the overall timing\n
+        Returns:\n
+            dict: cycles, instructions, cpi and stalls (cycles per kind: load_use, data, control)
+        '''
+        return {
+            'cycles': self.cycles,
+            'instructions': self.instructions,
+            'cpi': self.cpi(),
+            'stalls': {kind: sum(self.stalls[kind]) for kind in STALL_KINDS}
+        }
+
+    def instruction_stalls(self):
+        '''Return the stall breakdown of every executed instruction\n
+        Returns:\n
+            list: dicts with pc, instruction (mnemonic), count, load_use, data, control, line and source, in PC order
+        '''
+        table = self.simulator.decoded_instructions
+        sources = source_lines(self.simulator)
+        rows = []
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            line, source = sources[index] or (None, None)
+            row = {'pc': index * 4, 'instruction': table[index].name, 'count': count}
+            row.update((kind, self.stalls[kind][index]) for kind in STALL_KINDS)
+            row.update(line=line, source=source)
+            rows.append(row)
+        return rows
+
+    def report(self):
+        '''Return a text report of the cycles, CPI and the stalls of each instruction\n
+        Returns:\n
+            str: Report
+        '''
+        statistics = self.statistics()
+        stalls = statistics['stalls']
+        lines = [f"Cycles: {statistics['cycles']}  Instructions: {statistics['instructions']}  CPI: {statistics['cpi']:.3f}",
+                 f"Stall cycles: load-use {stalls['load_use']}  data {stalls['data']}  control {stalls['control']}",
+                 "", f"  {'PC':<12}{'Count':>10}{'Load-use':>10}{'Data':>10}{'Control':>10}  Source"]
+        for row in self.instruction_stalls():
+            source = row['source'] if row['source'] is not None else row['instruction']
+            lines.append(f"  0x{row['pc']:08x}{row['count']:>10}{row['load_use']:>10}{row['data']:>10}{row['control']:>10}  {source}")
+        return '\n'.join(lines)
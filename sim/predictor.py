@@ -0,0 +1,241 @@
+from array import array
+from .profiler import BRANCH_NAMES, source_lines
+
+'''
+    Predictor Component
+    Branch prediction models of the SIM component with accuracy statistics
+'''
+
+JUMP_NAMES = {'j', 'jal', 'jr'}
+
+def _check_size(size):
+    if size <= 0 or size & (size - 1):
+        raise ValueError(f"Table size must be a power of two: {size}")
+
+class StaticPredictor:
+    '''Predicts every branch not taken'''
+    name = 'not_taken'
+
+    def __init__(self, table_size=None):
+        pass
+
+    def predict(self, pc):
+        return False
+
+    def update(self, pc, taken):
+        pass
+
+class OneBitPredictor:
+    '''Predicts the last outcome of the branch, one bit per table entry indexed by PC'''
+    name = '1bit'
+
+    def __init__(self, table_size=1024):
+        _check_size(table_size)
+        self.mask = table_size - 1
+        self.table = array('B', bytes(table_size))
+
+    def predict(self, pc):
+        return bool(self.table[(pc >> 2) & self.mask])
+
+    def update(self, pc, taken):
+        self.table[(pc >> 2) & self.mask] = taken
+
+class TwoBitPredictor:
+    '''2-bit saturating counters indexed by PC, 0-1 predict not taken and 2-3 taken, starting weakly not taken'''
+    name = '2bit'
+
+    def __init__(self, table_size=1024):
+        _check_size(table_size)
+        self.mask = table_size - 1
+        self.table = array('B', [1]) * table_size
+
+    def index(self, pc):
+        return (pc >> 2) & self.mask
+
+    def predict(self, pc):
+        return self.table[self.index(pc)] >= 2
+
+    def update(self, pc, taken):
+        index = self.index(pc)
+        counter = self.table[index]
+        if taken:
+            self.table[index] = min(counter + 1, 3)
+        else:
+            self.table[index] = max(counter - 1, 0)
+
+class GSharePredictor(TwoBitPredictor):
+    '''2-bit saturating counters indexed by PC xor the global history of the last history_bits outcomes'''
+    name = 'gshare'
+
+    def __init__(self, table_size=1024, history_bits=None):
+        super().__init__(table_size)
+        if history_bits is None:
+            history_bits = table_size.bit_length() - 1
+        self.history_mask = (1 << history_bits) - 1
+        self.history = 0
+
+    def index(self, pc):
+        return ((pc >> 2) ^ self.history) & self.mask
+
+    def update(self, pc, taken):
+        super().update(pc, taken)
+        self.history = ((self.history << 1) | taken) & self.history_mask
+
+# Predictor name -> class
+PREDICTORS = {predictor.name: predictor for predictor in (StaticPredictor, OneBitPredictor, TwoBitPredictor, GSharePredictor)}
+
+class BranchTargetBuffer:
+    '''Direct-mapped buffer of the last target of each j, jal and jr, tagged with the full PC'''
+    def __init__(self, entries=64):
+        _check_size(entries)
+        self.mask = entries - 1
+        self.tags = [None] * entries
+        self.targets = [0] * entries
+
+    def predict(self, pc):
+        '''Return the buffered target of the jump at `pc`, None on a miss'''
+        index = (pc >> 2) & self.mask
+        return self.targets[index] if self.tags[index] == pc else None
+
+    def update(self, pc, target):
+        index = (pc >> 2) & self.mask
+        self.tags[index] = pc
+        self.targets[index] = target
+
+class PredictorModel:
+    '''
+    Predictor Model\n
+    Branch prediction model attached to executed instructions, enabled with Simulator.enable_predictor():\n
+    - beq and bne are predicted by a direction predictor: 'not_taken', '1bit', '2bit', 'gshare'
+      or any object with predict(pc) and update(pc, taken)\n
+    - j, jal and jr are predicted by a branch target buffer, a miss or a wrong target is a misprediction\n
+    - Each misprediction is estimated to cost branch_penalty or jump_penalty cycles, the
+      flush of the five-stage pipeline with branches resolved in EX and jumps in ID\n
+    Predictions never affect execution, results are unchanged.
+    '''
+    def __init__(self, simulator, predictor='2bit', table_size=1024, history_bits=None,
+                 btb_entries=64, branch_penalty=2, jump_penalty=1):
+        if isinstance(predictor, str) and predictor not in PREDICTORS:
+            raise ValueError(f"Unknown branch predictor: {predictor}")
+        _check_size(table_size)
+        _check_size(btb_entries)
+        self.simulator = simulator
+        self.kind = predictor
+        self.table_size = table_size
+        self.history_bits = history_bits
+        self.btb_entries = btb_entries
+        self.branch_penalty = branch_penalty
+        self.jump_penalty = jump_penalty
+        self.reset()
+
+    def reset(self):
+        '''Clear all predictor state and counters, a predictor object passed in keeps its state\n
+        Returns:\n
+            None
+        '''
+        if self.kind == 'gshare':
+            self.predictor = GSharePredictor(self.table_size, self.history_bits)
+        elif isinstance(self.kind, str):
+            self.predictor = PREDICTORS[self.kind](self.table_size)
+        else:
+            self.predictor = self.kind
+        self.btb = BranchTargetBuffer(self.btb_entries)
+        self.branches = {}  # Branch PC -> [executed, taken, predicted correctly]
+        self.jumps = {}  # Jump PC -> [executed, predicted correctly]
+
+    def record(self, pc, decoded, advanced, address=None):
+        '''Predict and train on one executed instruction, see Simulator.hooks\n
+        Parameters:\n
+            pc (int): Address of the instruction\n
+            decoded (DecodedInstruction): The executed instruction\n
+            advanced (bool): The handler result, False if the branch was taken\n
+            address (int | None): Data address of a load or store, unused
+        '''
+        name = decoded.name
+        if name in BRANCH_NAMES:
+            taken = not advanced
+            counts = self.branches.get(pc)
+            if counts is None:
+                counts = self.branches[pc] = [0, 0, 0]
+            counts[0] += 1
+            counts[1] += taken
+            counts[2] += self.predictor.predict(pc) == taken
+            self.predictor.update(pc, taken)
+        elif name in JUMP_NAMES:
+            target = self.simulator.registers.pc
+            counts = self.jumps.get(pc)
+            if counts is None:
+                counts = self.jumps[pc] = [0, 0]
+            counts[0] += 1
+            counts[1] += self.btb.predict(pc) == target
+            self.btb.update(pc, target)
+
+    def statistics(self):
+        '''Return the overall prediction counters\n
+        Returns:\n
+            dict: branches, branch_mispredictions, branch_accuracy, jumps, jump_mispredictions,
+            jump_accuracy and penalty_cycles (estimated cycles lost to mispredictions)
+        '''
+        branches = sum(counts[0] for counts in self.branches.values())
+        branch_misses = branches - sum(counts[2] for counts in self.branches.values())
+        jumps = sum(counts[0] for counts in self.jumps.values())
+        jump_misses = jumps - sum(counts[1] for counts in self.jumps.values())
+        return {
+            'branches': branches,
+            'branch_mispredictions': branch_misses,
+            'branch_accuracy': 1.0 - branch_misses / branches if branches else 0.0,
+            'jumps': jumps,
+            'jump_mispredictions': jump_misses,
+            'jump_accuracy': 1.0 - jump_misses / jumps if jumps else 0.0,
+            'penalty_cycles': branch_misses * self.branch_penalty + jump_misses * self.jump_penalty
+        }
+
+    def branch_statistics(self):
+        '''Return the counters of every executed branch and jump\n
+        Returns:\n
+            list: dicts with pc, instruction (mnemonic), executed, taken, mispredictions, accuracy,
+            penalty_cycles, line and source, in PC order. taken is None for jumps
+        '''
+        table = self.simulator.decoded_instructions
+        sources = source_lines(self.simulator)
+        rows = []
+        for pc in sorted(self.branches.keys() | self.jumps.keys()):
+            if pc in self.branches:
+                executed, taken, correct = self.branches[pc]
+                penalty = self.branch_penalty
+            else:
+                (executed, correct), taken = self.jumps[pc], None
+                penalty = self.jump_penalty
+            line, source = sources[pc >> 2] or (None, None)
+            rows.append({
+                'pc': pc,
+                'instruction': table[pc >> 2].name,
+                'executed': executed,
+                'taken': taken,
+                'mispredictions': executed - correct,
+                'accuracy': correct / executed,
+                'penalty_cycles': (executed - correct) * penalty,
+                'line': line,
+                'source': source
+            })
+        return rows
+
+    def report(self):
+        '''Return a text report of the overall and per-branch accuracy\n
+        Returns:\n
+            str: Report
+        '''
+        statistics = self.statistics()
+        lines = [f"Predictor: {getattr(self.predictor, 'name', type(self.predictor).__name__)}, BTB: {self.btb_entries} entries",
+                 f"Branches: {statistics['branches']}  Mispredicted: {statistics['branch_mispredictions']}  "
+                 f"Accuracy: {100.0 * statistics['branch_accuracy']:.1f}%",
+                 f"Jumps: {statistics['jumps']}  Mispredicted: {statistics['jump_mispredictions']}  "
+                 f"Accuracy: {100.0 * statistics['jump_accuracy']:.1f}%",
+                 f"Estimated penalty: {statistics['penalty_cycles']} cycles",
+                 "", f"  {'PC':<12}{'Executed':>10}{'Taken':>10}{'Missed':>10}{'Accuracy':>10}{'Penalty':>10}  Source"]
+        for row in self.branch_statistics():
+            taken = row['taken'] if row['taken'] is not None else '-'
+            source = row['source'] if row['source'] is not None else row['instruction']
+            lines.append(f"  0x{row['pc']:08x}{row['executed']:>10}{taken:>10}{row['mispredictions']:>10}"
+                         f"{100.0 * row['accuracy']:>9.1f}%{row['penalty_cycles']:>10}  {source}")
+        return '\n'.join(lines)
@@ -0,0 +1,224 @@
+'''
+    Profiler Component
+    Per-instruction execution counts of the SIM component, mapped back to source lines
+'''
+
+# Instructions counted as loads, stores and conditional branches
+LOAD_NAMES = {'lw', 'lh', 'lhu', 'lb', 'lbu'}
+STORE_NAMES = {'sw', 'sh', 'sb'}
+BRANCH_NAMES = {'beq', 'bne'}
+
+def static_target(decoded):
+    '''Return the fixed target address of a taken branch or jump, None for jr and other instructions'''
+    if decoded.name in BRANCH_NAMES:
+        return decoded.c
+    if decoded.name in ('j', 'jal'):
+        return decoded.a
+    return None
+
+def counts_redirects(decoded, pc):
+    '''Return True if the redirects of the instruction at `pc` are counted while profiling\n
+    Conditional branches and backward jumps are counted. Forward j and jal and jr always redirect,
+    their counts follow from the flow (see Profiler.hits()), only the targets of jr are counted.
+    '''
+    if decoded.name in BRANCH_NAMES:
+        return True
+    return decoded.name in ('j', 'jal') and decoded.a <= pc
+
+def source_lines(simulator):
+    '''Return the (line number, source text) of every loaded instruction\n
+    Uses the simulator's assembler, entries are None when the loaded machine code was not
+    assembled by it (e.g. load_machine_code() with code from another Assembler)
+    '''
+    assembler = simulator.assembler
+    length = simulator.program_length
+    instructions = simulator.memory.read_instruction_memory()
+    if (len(assembler.translations) != length
+            or any(int(translation['hex'], 16) != instructions[i] for i, translation in enumerate(assembler.translations))):
+        return [None] * length
+    return [(line, translation['original'])
+            for line, translation in zip(assembler.get_line_numbers(), assembler.translations)]
+
+class Profiler:
+    '''
+    Profiler\n
+    Opt-in execution profile of the loaded program, enabled with Simulator.enable_profiler():\n
+    - Counters are lists with one slot per instruction, not per-step records\n
+    - Only control flow is counted while running: where execute() starts and stops, taken branches,
+      backward jumps and jr targets. Straight-line instructions and forward jumps cost nothing extra,
+      their hit counts are derived afterwards from the fall-through flow and the static branch targets\n
+    - Redirects are counted outside the interpreter loop: branches and jumps in the predecoded table
+      are replaced by counting copies and compiled blocks count their own exits\n
+    - Per-opcode, load/store and branch taken/not-taken counts are derived from the hit counts
+      and the predecoded table\n
+    - Hot spots are mapped back to source lines through the assembler translations\n
+    Every executed instruction is counted, including steps later undone by step_back() or replayed by seek().
+    '''
+    def __init__(self, simulator):
+        self.simulator = simulator
+        self.reset()
+
+    def reset(self):
+        '''Clear all counters and size them to the loaded program\n
+        Returns:\n
+            None
+        '''
+        # Counts not yet flushed were collected before the reset
+        self.simulator.flush_counters()
+        # One extra slot for the PC just past the program
+        size = self.simulator.program_length + 1
+        self.entries = [0] * size  # Execution started at the PC or jr jumped to it
+        self.stops = [0] * size  # Execution stopped before the PC
+        self.taken = [0] * size  # The instruction redirected the PC in execute(), see counts_redirects()
+        self.stepped = [0] * size  # The instruction ran on its own, e.g. step()
+        self.stepped_taken = [0] * size  # ... and redirected the PC
+
+    def enter(self, pc):
+        '''Record that execute() starts or continues at `pc`'''
+        if pc < self.simulator.program_length * 4:
+            self.entries[pc >> 2] += 1
+
+    def stop(self, pc):
+        '''Record that execute() stops before the instruction at `pc`'''
+        if pc < self.simulator.program_length * 4:
+            self.stops[pc >> 2] += 1
+
+    def record(self, pc, advanced):
+        '''Record one instruction executed on its own, e.g. by Simulator.step()\n
+        Parameters:\n
+            pc (int): Address of the instruction\n
+            advanced (bool): The handler result, False if the instruction redirected the PC
+        '''
+        self.stepped[pc >> 2] += 1
+        if not advanced:
+            self.stepped_taken[pc >> 2] += 1
+
+    def hits(self):
+        '''Return the execution count of every instruction\n
+        Returns:\n
+            list: Hit count per instruction, indexed by PC // 4
+        '''
+        self.simulator.flush_counters()
+        if self.simulator.translator.taken is self.taken:
+            self.simulator.translator.flush_counters()
+        table = self.simulator.decoded_instructions
+        length = self.simulator.program_length
+        taken, stops = self.taken, self.stops
+        # Branches and jumps only count redirects, their targets are known from the predecoded table
+        entries = list(self.entries)
+        for i, count in enumerate(taken[:length]):
+            if count:
+                target = static_target(table[i])
+                if target is not None and target < length * 4:
+                    entries[target >> 2] += count
+        hits = [0] * length
+        flow = 0  # Executions falling through into the current instruction
+        for i in range(length):
+            count = flow + entries[i] - stops[i]
+            hits[i] = count + self.stepped[i]
+            decoded = table[i]
+            if decoded.name == 'jr':
+                flow = 0
+            elif decoded.name in ('j', 'jal') and not counts_redirects(decoded, i * 4):
+                # Forward jumps redirect every time, their target is still ahead
+                if decoded.a < length * 4:
+                    entries[decoded.a >> 2] += count
+                flow = 0
+            else:
+                flow = count - taken[i]
+        return hits
+
+    def opcode_counts(self):
+        '''Return the execution count of every mnemonic, writes to $zero included\n
+        Returns:\n
+            dict: Mnemonic -> count, most executed first
+        '''
+        counts = {}
+        for decoded, count in zip(self.simulator.decoded_instructions, self.hits()):
+            if count:
+                counts[decoded.name] = counts.get(decoded.name, 0) + count
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    def memory_counts(self):
+        '''Return the number of executed loads and stores\n
+        Returns:\n
+            dict: loads, stores
+        '''
+        loads = stores = 0
+        for decoded, count in zip(self.simulator.decoded_instructions, self.hits()):
+            if decoded.name in LOAD_NAMES:
+                loads += count
+            elif decoded.name in STORE_NAMES:
+                stores += count
+        return {'loads': loads, 'stores': stores}
+
+    def branch_counts(self):
+        '''Return the outcome counts of every executed conditional branch\n
+        Returns:\n
+            dict: PC -> {'taken': n, 'not_taken': n}
+        '''
+        branches = {}
+        for i, (decoded, count) in enumerate(zip(self.simulator.decoded_instructions, self.hits())):
+            if count and decoded.name in BRANCH_NAMES:
+                taken = self.taken[i] + self.stepped_taken[i]
+                branches[i * 4] = {'taken': taken, 'not_taken': count - taken}
+        return branches
+
+    def source_lines(self):
+        '''Return the (line number, source text) of every instruction, see source_lines()'''
+        return source_lines(self.simulator)
+
+    def hot_spots(self, top=10):
+        '''Return the most executed instructions\n
+        Parameters:\n
+            top (int | None): Number of instructions, None returns every executed one\n
+        Returns:\n
+            list: dicts with pc, hits, percent, instruction (mnemonic), line and source, most executed first
+        '''
+        hits = self.hits()
+        total = sum(hits)
+        order = sorted((i for i, count in enumerate(hits) if count), key=lambda i: (-hits[i], i))
+        if top is not None:
+            order = order[:top]
+        sources = self.source_lines()
+        table = self.simulator.decoded_instructions
+        spots = []
+        for i in order:
+            line, source = sources[i] or (None, None)
+            spots.append({
+                'pc': i * 4,
+                'hits': hits[i],
+                'percent': 100.0 * hits[i] / total,
+                'instruction': table[i].name,
+                'line': line,
+                'source': source
+            })
+        return spots
+
+    def report(self, top=10):
+        '''Return a text report of the hot spots, opcode mix, memory accesses and branches\n
+        Returns:\n
+            str: Report
+        '''
+        hits = self.hits()
+        total = sum(hits)
+        lines = [f"Instructions executed: {total}", "", "Hot spots:",
+                 f"  {'PC':<12}{'Line':>6}{'Hits':>12}{'%':>8}  Source"]
+        for spot in self.hot_spots(top):
+            line = spot['line'] if spot['line'] is not None else '-'
+            source = spot['source'] if spot['source'] is not None else spot['instruction']
+            lines.append(f"  0x{spot['pc']:08x}{line:>6}{spot['hits']:>12}{spot['percent']:>7.1f}%  {source}")
+
+        lines += ["", "Opcodes:"]
+        for name, count in self.opcode_counts().items():
+            lines.append(f"  {name:<8}{count:>12}{100.0 * count / total:>7.1f}%")
+
+        memory = self.memory_counts()
+        lines += ["", f"Loads: {memory['loads']}  Stores: {memory['stores']}"]
+
+        branches = self.branch_counts()
+        if branches:
+            lines += ["", "Branches:", f"  {'PC':<12}{'Taken':>12}{'Not taken':>12}"]
+            for pc, outcome in branches.items():
+                lines.append(f"  0x{pc:08x}{outcome['taken']:>12}{outcome['not_taken']:>12}")
+        return '\n'.join(lines)
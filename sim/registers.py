@@ -5,12 +5,15 @@ class Registers:
     - 32 general-purpose registers ($0-$31)\n
     - Program Counter (PC) special register\n
     - Register naming conventions following MIPS architecture\n
+    - Dirty tracking of changed registers for views\n
     '''
     def __init__(self):
         # 32 general-purpose registers (including $zero)
         self.registers = [0] * 32
         # Special registers
         self.pc = 0  # Program Counter
+        # Registers changed since the last take_dirty(), None if all of them may have changed
+        self.dirty = None
         
     def reset(self):
         '''Reset Register File State\n
@@ -21,6 +24,7 @@ class Registers:
         '''
         self.registers = [0] * 32
         self.pc = 0
+        self.dirty = None
         
     def read_register(self, register_number):
         '''Read Value from Register\n
@@ -50,8 +54,31 @@ class Registers:
         if 0 <= register_number < 32:
             if register_number != 0:  # Prevent writing to $zero
                 self.registers[register_number] = value & 0xFFFFFFFF
+                if self.dirty is not None:
+                    self.dirty.add(register_number)
         else:
             raise ValueError(f"Invalid register number: {register_number}")
+
+    def mark_dirty(self, register_number):
+        '''Record a register changed without write_register(), e.g. by the simulator's fast handlers\n
+        Parameters:\n
+            register_number (int): Register number (0-31)
+        '''
+        if self.dirty is not None:
+            self.dirty.add(register_number)
+
+    def mark_all_dirty(self):
+        '''Record that any register may have changed'''
+        self.dirty = None
+
+    def take_dirty(self):
+        '''Return and clear the changed registers\n
+        Returns:\n
+            set | None: Changed register numbers, None if all of them may have changed
+        '''
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
     
     def get_register_name(self, register_number):
         '''Get MIPS Register Name\n
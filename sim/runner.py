@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import namedtuple
+from .registers import Registers
+from .memory import Memory
+
+'''
+    Background Runner Component
+    Executes the loaded program of a SIM component on a worker thread
+'''
+
+# Registers and Memory copies of a running simulator, taken between slices for views
+RunSnapshot = namedtuple('RunSnapshot', ['registers', 'memory'])
+
+class BackgroundRunner:
+    '''
+    Background Runner\n
+    Runs Simulator.execute() on a worker thread in slices of slice_size instructions:\n
+    - Between slices the simulator is idle, so progress and the final state are read there\n
+    - on_progress(progress) is called at most refresh_rate times per second, and when paused\n
+    - on_finished(result) is called once with the same keys as Simulator.run(fast=True)\n
+    - pause(), resume() and stop() take effect at the next slice boundary\n
+    - With copy_state=False progress carries a RunSnapshot instead of a state dict, for views that
+      read Registers and Memory objects. Its pages are shared copy-on-write, so taking it copies nothing\n
+    Callbacks run on the worker thread. The simulator must not be used elsewhere until the run finishes,
+    views read the progress copies instead.
+    '''
+    def __init__(self, simulator, on_progress=None, on_finished=None,
+                 refresh_rate=30, slice_size=10000, max_instructions=None, copy_state=True):
+        self.simulator = simulator
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.refresh_interval = 1.0 / refresh_rate
+        self.slice_size = slice_size
+        self.max_instructions = max_instructions  # None runs until the program ends or stop()
+        self.copy_state = copy_state
+        self.instructions_executed = 0
+        self.result = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def paused(self):
+        return not self._resumed.is_set()
+
+    def start(self):
+        '''Start the worker thread\n
+        Raises:\n
+            RuntimeError: If the runner is already running
+        '''
+        if self.running:
+            raise RuntimeError("Runner is already running")
+        self._stopped.clear()
+        self._resumed.set()
+        self.result = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._resumed.set()
+
+    def wait(self, timeout=None):
+        '''Wait for the worker thread to finish\n
+        Returns:\n
+            bool: True if the run has finished
+        '''
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
+
+    def progress(self, elapsed):
+        '''Return the progress of the run, called between slices\n
+        Returns:\n
+            dict: steps, pc, instructions_per_second, paused and either a state copy in the
+            Simulator.get_state() format or, without copy_state, a RunSnapshot
+        '''
+        progress = {
+            'steps': self.instructions_executed,
+            'pc': self.simulator.registers.pc,
+            'instructions_per_second': self.instructions_executed / elapsed if elapsed > 0 else 0.0,
+            'paused': self.paused
+        }
+        if self.copy_state:
+            state = self.simulator.get_state().to_dict()
+            state['memory'] = {
+                'instructions': state['memory']['instructions'],
+                'data': dict(state['memory']['data'])
+            }
+            progress['state'] = state
+        else:
+            progress['snapshot'] = self.snapshot()
+        return progress
+
+    def snapshot(self):
+        '''Return a RunSnapshot of the simulator, called between slices\n
+        The dirty registers and words are moved to the copies, instruction memory is shared
+        since runs do not write it
+        '''
+        simulator = self.simulator
+        registers = Registers()
+        registers.registers = list(simulator.registers.registers)
+        registers.pc = simulator.registers.pc
+        registers.dirty = simulator.registers.take_dirty()
+        memory = Memory()
+        memory.restore(simulator.memory.snapshot())
+        memory.instruction_memory = simulator.memory.instruction_memory
+        memory.instruction_version = simulator.memory.instruction_version
+        memory.dirty = simulator.memory.take_dirty()
+        return RunSnapshot(registers, memory)
+
+    def _run(self):
+        simulator = self.simulator
+        start = last_refresh = time.perf_counter()
+        paused_time = 0.0
+        self.instructions_executed = 0
+        status, message = 'running', ''
+        try:
+            while not self._stopped.is_set():
+                if not self._resumed.is_set():
+                    pause_start = time.perf_counter()
+                    if self.on_progress:
+                        self.on_progress(self.progress(pause_start - start - paused_time))
+                    self._resumed.wait()
+                    paused_time += time.perf_counter() - pause_start
+                    continue
+
+                limit = self.slice_size
+                if self.max_instructions is not None:
+                    limit = min(limit, self.max_instructions - self.instructions_executed)
+                    if limit <= 0:
+                        status, message = 'error', 'Program terminated - reached maximum instruction limit'
+                        break
+                status, count = simulator.execute(limit)
+                self.instructions_executed += count
+                if status != 'running':
+                    break
+
+                now = time.perf_counter()
+                if self.on_progress and now - last_refresh >= self.refresh_interval:
+                    last_refresh = now
+                    self.on_progress(self.progress(now - start - paused_time))
+            else:
+                status, message = 'stopped', 'Program execution stopped'
+        except Exception as e:
+            status, message = 'error', f"Error: {str(e)}"
+
+        elapsed = time.perf_counter() - start - paused_time
+        if status in ('breakpoint', 'watchpoint'):
+            message = simulator.describe_stop()
+        if not message:
+            message = f"Program execution {status} with {self.instructions_executed} instructions"
+        self.result = {
+            'status': status,
+            'instructions_executed': self.instructions_executed,
+            'elapsed_time': elapsed,
+            'instructions_per_second': self.instructions_executed / elapsed if elapsed > 0 else 0.0,
+            'final_state': self.progress(elapsed)['state'] if self.copy_state else self.simulator.get_state().freeze(),
+            'message': message
+        }
+        if self.on_finished:
+            self.on_finished(self.result)
@@ -1,15 +1,66 @@
 
+import time
+from collections import namedtuple
 from .registers import Registers
 from .memory import Memory
 from .assembler import Assembler
+from .trace import ExecutionTrace
+from .translator import BlockTranslator
+from .profiler import Profiler, counts_redirects
+from .pipeline import PipelineModel
+from .cache import CacheModel
+from .predictor import PredictorModel
+from .state import StateView
 
 '''
     Simulator Component
     Interface for UI to access the SIM component.
 '''
 
+# Predecoded instruction: handler plus its (already sign-extended) operands.
+# `dest` is the register the instruction writes (0 if none), `name` the mnemonic.
+DecodedInstruction = namedtuple('DecodedInstruction', ['handler', 'a', 'b', 'c', 'dest', 'name'])
+
+# Null instruction word, stops execution
+HALT = DecodedInstruction(None, 0, 0, 0, 0, 'halt')
+
+# Machine state returned by Simulator.snapshot(): registers as a tuple, data memory pages
+# shared copy-on-write and the instruction memory list, which is replaced, never changed, by a load.
+# `stopped` is True if taken at a breakpoint stop, a run from the restored state then resumes past it
+SimulatorSnapshot = namedtuple('SimulatorSnapshot', ['pc', 'registers', 'memory', 'instructions', 'program_length',
+                                                     'step', 'stopped'])
+
+# Opcode / funct to mnemonic tables used by the decoder
+R_TYPE_NAMES = {
+    0x20: 'add', 0x22: 'sub', 0x24: 'and', 0x25: 'or',
+    0x2A: 'slt', 0x00: 'sll', 0x02: 'srl', 0x08: 'jr'
+}
+I_TYPE_NAMES = {
+    0x08: 'addi', 0x23: 'lw', 0x2B: 'sw', 0x04: 'beq', 0x05: 'bne',
+    0x20: 'lb', 0x24: 'lbu', 0x21: 'lh', 0x25: 'lhu', 0x28: 'sb', 0x29: 'sh'
+}
+
+# Instructions writing data memory at (rs + imm), operands (rt, rs, imm)
+STORE_INSTRUCTIONS = {'sw', 'sh', 'sb'}
+# Instructions accessing data memory at (rs + imm)
+MEMORY_INSTRUCTIONS = {'lw', 'lh', 'lhu', 'lb', 'lbu'} | STORE_INSTRUCTIONS
+# Bytes written by each store
+STORE_SIZES = {'sw': 4, 'sh': 2, 'sb': 1}
+
+class WatchpointHit(Exception):
+    '''Raised by a watched store after writing inside a watched range, caught by Simulator.execute()'''
+    def __init__(self, address, size, value):
+        super().__init__(f"Watchpoint hit: {size} byte store of 0x{value:x} at 0x{address:08x}")
+        self.address = address
+        self.size = size
+        self.value = value
+
+def _signed(value):
+    """Convert a 32-bit 2's complement word to a signed integer"""
+    return value - 0x100000000 if value & 0x80000000 else value
+
 class Simulator:
-    def __init__(self):
+    def __init__(self, history_depth=None, checkpoint_interval=1000, engine='interpreter', max_checkpoints=64):
         self.registers = Registers()
         self.memory = Memory()
         self.assembler = Assembler()
@@ -17,28 +68,430 @@ class Simulator:
         self.program_loaded = False
         self.program_length = 0
         self.debug_mode = False
-        self.execution_history = []
+        self.history_depth = history_depth
+        self.execution_history = ExecutionTrace(history_depth)
+        self.steps_executed = 0
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}
+        if max_checkpoints < 2:
+            raise ValueError(f"max_checkpoints must be at least 2: {max_checkpoints}")
+        self.max_checkpoints = max_checkpoints
+        self.decoded_instructions = []
+        self._decoded_version = None
+        if engine not in ('interpreter', 'blocks'):
+            raise ValueError(f"Unknown execution engine: {engine}")
+        self.engine = engine
+        self.profiler = None  # Profiler while profiling is enabled
+        self.pipeline = None  # PipelineModel while pipeline timing is enabled
+        self.cache = None  # CacheModel while a data cache is attached
+        self.predictor = None  # PredictorModel while branch prediction is simulated
+        self.hooks = []  # record(pc, decoded, advanced, address) of the attached timing models
+        self.breakpoints = {}  # PC -> condition(simulator) or None
+        self.watchpoints = []  # (start, end) data address ranges checked by every store
+        self.stop_reason = None  # Breakpoint or watchpoint that stopped the last run, see execute()
+        self._originals = {}  # Instruction index -> predecoded entry replaced by a counting branch, a trap or a watched store
+        self._traps = {}  # Instruction index -> entry executed when stepping over a breakpoint
+        self._watched_stores = {}  # Store mnemonic -> watched handler while watchpoints are set
+        self._counters = []  # (instruction index, redirect counter cell) of each counting branch while profiling
+        self._stopped = None  # (pc, step) of the last breakpoint stop, resuming steps over it
+        self._state = StateView(self)
+        self.translator = BlockTranslator(self)
         
     def load(self, program, translation_option='binary'):
         """Load and assemble program from string"""
         # Returns: Translated binary code as default
+        machine_code = self.assembler.assemble(program)
+        self.load_machine_code(machine_code)
+        
+        translations = self.assembler.get_translations(translation_option)
+        result = '\n'.join(translations)
+        return result
+
+    def load_machine_code(self, machine_code):
+        """Reset the machine and load already assembled machine code\n
+        Used when the program was assembled elsewhere, e.g. by a background Assembler\n
+        Parameters:\n
+            machine_code (list): Instruction words starting at PC 0
+        """
         self.registers.reset()
         self.memory.reset()
         self.current_pc = 0
         self.registers.pc = 0
+        self.registers.write_register(28, self.memory.GLOBAL_POINTER)  # $gp
+        self.registers.write_register(29, self.memory.STACK_POINTER)   # $sp
         self.execution_history.clear()
         
-        machine_code = self.assembler.assemble(program)
-        
         for i, instruction in enumerate(machine_code):
             self.memory.load_instruction(i, instruction)
             
         self.program_length = len(machine_code)
         self.program_loaded = True
-        
-        translations = self.assembler.get_translations(translation_option)
-        result = '\n'.join(translations)
-        return result
+        self.decode_program()
+        self.steps_executed = 0
+        self._stopped = None
+        self.checkpoints.clear()
+        self._checkpoint()
+        if self.profiler is not None:
+            self.profiler.reset()
+        if self.pipeline is not None:
+            self.pipeline.reset()
+        if self.cache is not None:
+            self.cache.reset()
+        if self.predictor is not None:
+            self.predictor.reset()
+
+    def enable_profiler(self):
+        """Start profiling executed instructions, see Profiler\n
+        Counters start from zero and are cleared again whenever a program is loaded.
+        The block engine stays enabled, its blocks are recompiled with counters.\n
+        Returns:\n
+            Profiler: The profiler collecting the counts
+        """
+        self.profiler = Profiler(self)
+        self._patch_table()
+        return self.profiler
+
+    def disable_profiler(self):
+        """Stop profiling\n
+        Returns:\n
+            Profiler | None: The detached profiler with the counts collected so far
+        """
+        self.flush_counters()
+        profiler, self.profiler = self.profiler, None
+        self._patch_table()
+        return profiler
+
+    def flush_counters(self):
+        """Add the redirects counted by the branches of the predecoded table to the profiler and clear them\n
+        Returns:\n
+            None
+        """
+        taken = self.profiler.taken if self.profiler is not None else None
+        for index, cell in self._counters:
+            if cell.cell_contents:
+                if taken is not None:
+                    taken[index] += cell.cell_contents
+                cell.cell_contents = 0
+
+    def enable_pipeline(self, forwarding=True, branch_stage='EX'):
+        """Start timing executed instructions on the five-stage pipeline, see PipelineModel\n
+        The timing is cleared whenever a program is loaded. While enabled execute() passes every
+        instruction to the model, so the block engine is not used.\n
+        Parameters:\n
+            forwarding (bool): Forward results from EX and MEM instead of waiting for WB\n
+            branch_stage (str): Stage resolving beq and bne, 'ID' or 'EX'\n
+        Returns:\n
+            PipelineModel: The model collecting the timing
+        """
+        self.pipeline = PipelineModel(self, forwarding, branch_stage)
+        self._update_hooks()
+        return self.pipeline
+
+    def disable_pipeline(self):
+        """Stop pipeline timing\n
+        Returns:\n
+            PipelineModel | None: The detached model with the timing collected so far
+        """
+        pipeline, self.pipeline = self.pipeline, None
+        self._update_hooks()
+        return pipeline
+
+    def enable_cache(self, size=4096, line_size=16, associativity=1, policy='LRU', write_back=True, seed=0):
+        """Attach a set-associative data cache model, see CacheModel\n
+        The cache starts empty and is invalidated whenever a program is loaded. While attached
+        execute() passes every instruction to the model, so the block engine is not used.\n
+        Parameters:\n
+            size (int): Capacity in bytes\n
+            line_size (int): Line size in bytes, a power of two\n
+            associativity (int): Lines per set, a power of two\n
+            policy (str): Replacement policy, 'LRU', 'FIFO' or 'random'\n
+            write_back (bool): Write-back with write-allocate, otherwise write-through without allocation\n
+            seed (int): Seed of the random replacement policy\n
+        Returns:\n
+            CacheModel: The attached cache\n
+        Raises:\n
+            ValueError: On an invalid geometry or policy
+        """
+        self.cache = CacheModel(self, size, line_size, associativity, policy, write_back, seed)
+        self._update_hooks()
+        return self.cache
+
+    def disable_cache(self):
+        """Detach the data cache model\n
+        Returns:\n
+            CacheModel | None: The detached cache with the counts collected so far
+        """
+        cache, self.cache = self.cache, None
+        self._update_hooks()
+        return cache
+
+    def enable_predictor(self, predictor='2bit', table_size=1024, history_bits=None, btb_entries=64,
+                         branch_penalty=2, jump_penalty=1):
+        """Start simulating branch prediction, see PredictorModel\n
+        Predictor state is cleared whenever a program is loaded. While enabled execute() passes every
+        instruction to the model, so the block engine is not used.\n
+        Parameters:\n
+            predictor (str | object): 'not_taken', '1bit', '2bit', 'gshare' or an object with predict(pc) and update(pc, taken)\n
+            table_size (int): Entries of the prediction table, a power of two\n
+            history_bits (int | None): Global history length of gshare, defaults to log2(table_size)\n
+            btb_entries (int): Entries of the branch target buffer for j, jal and jr, a power of two\n
+            branch_penalty (int): Estimated cycles lost by a mispredicted beq or bne\n
+            jump_penalty (int): Estimated cycles lost by a jump missing in the branch target buffer\n
+        Returns:\n
+            PredictorModel: The model collecting the accuracy\n
+        Raises:\n
+            ValueError: On an unknown predictor or a table size that is not a power of two
+        """
+        self.predictor = PredictorModel(self, predictor, table_size, history_bits, btb_entries,
+                                        branch_penalty, jump_penalty)
+        self._update_hooks()
+        return self.predictor
+
+    def disable_predictor(self):
+        """Stop simulating branch prediction\n
+        Returns:\n
+            PredictorModel | None: The detached model with the counts collected so far
+        """
+        predictor, self.predictor = self.predictor, None
+        self._update_hooks()
+        return predictor
+
+    def _update_hooks(self):
+        """Collect the record() callbacks of the attached timing models"""
+        self.hooks = [model.record for model in (self.pipeline, self.cache, self.predictor) if model is not None]
+
+    def add_breakpoint(self, location, condition=None):
+        """Stop execute() and run() before the instruction at `location` executes\n
+        Breakpoints replace their instruction in the predecoded table with a trap, so execution
+        only checks them when it reaches one. Resuming a run from a breakpoint executes its instruction.\n
+        Parameters:\n
+            location (int | str): Instruction address or label\n
+            condition (dict | callable | None): Only stop when every register in a {register: value}
+            dict holds its value (names like '$t0' or numbers, signed or unsigned values),
+            or when condition(simulator) returns True\n
+        Returns:\n
+            int: Address of the breakpoint\n
+        Raises:\n
+            ValueError: On an unknown label, an unaligned address or an unknown register
+        """
+        pc = self._resolve_location(location)
+        if isinstance(condition, dict):
+            expected = [(self._resolve_register(register), value & 0xFFFFFFFF) for register, value in condition.items()]
+            condition = lambda simulator: all(simulator.registers.registers[number] == value for number, value in expected)
+        self.breakpoints[pc] = condition
+        self._patch_table()
+        return pc
+
+    def remove_breakpoint(self, location):
+        """Remove the breakpoint at an address or label\n
+        Returns:\n
+            bool: True if a breakpoint was removed
+        """
+        pc = self._resolve_location(location)
+        if pc not in self.breakpoints:
+            return False
+        del self.breakpoints[pc]
+        self._patch_table()
+        return True
+
+    def add_watchpoint(self, address, length=4):
+        """Stop execute() and run() after a store writes any byte of [address, address + length)\n
+        While watchpoints are set every store checks them after writing, other instructions are unaffected.\n
+        Parameters:\n
+            address (int): First watched byte\n
+            length (int): Number of watched bytes\n
+        Raises:\n
+            ValueError: On an empty range or one outside data memory
+        """
+        if length <= 0 or not 0 <= address < address + length <= self.memory.DATA_MEMORY_SIZE:
+            raise ValueError(f"Invalid watchpoint range: 0x{address:x}+{length}")
+        self.watchpoints.append((address, address + length))
+        self._patch_table()
+
+    def remove_watchpoint(self, address, length=4):
+        """Remove a watchpoint added with the same range\n
+        Returns:\n
+            bool: True if a watchpoint was removed
+        """
+        if (address, address + length) not in self.watchpoints:
+            return False
+        self.watchpoints.remove((address, address + length))
+        self._patch_table()
+        return True
+
+    def _resolve_location(self, location):
+        """Return the instruction address of a breakpoint location"""
+        if isinstance(location, str):
+            if location not in self.assembler.labels:
+                raise ValueError(f"Unknown label: {location}")
+            return self.assembler.labels[location]
+        if location < 0 or location % 4:
+            raise ValueError(f"Invalid instruction address: {location}")
+        return location
+
+    def _resolve_register(self, register):
+        """Return the number of a register given by name or number"""
+        if isinstance(register, str):
+            name = register if register.startswith('$') else '$' + register
+            if name not in self.assembler.register_map:
+                raise ValueError(f"Unknown register: {register}")
+            return self.assembler.register_map[name]
+        if not 0 <= register < 32:
+            raise ValueError(f"Unknown register: {register}")
+        return register
+
+    def _patch_table(self):
+        """Install counting branches, breakpoint traps and watched stores in the predecoded table"""
+        table = self.decoded_instructions
+        for index, decoded in self._originals.items():
+            table[index] = decoded
+        self.flush_counters()
+        self._originals = {}
+        self._traps = {}
+        self._watched_stores = {}
+        self._counters = []
+        if self.profiler is not None:
+            # Installed first, traps step over the counting entries
+            jr = self._count_jr_targets()
+            for index, decoded in enumerate(table):
+                if decoded.handler is None:
+                    continue
+                if decoded.name == 'jr':
+                    self._originals[index] = decoded
+                    table[index] = decoded._replace(handler=jr)
+                elif counts_redirects(decoded, index * 4):
+                    self._originals[index] = decoded
+                    handler = self._count_redirects(decoded.name)
+                    table[index] = decoded._replace(handler=handler)
+                    self._counters.append((index, handler.__closure__[handler.__code__.co_freevars.index('redirects')]))
+        if self.watchpoints:
+            self._watched_stores = {name: self._watch_store(getattr(self, '_op_' + name), size)
+                                    for name, size in STORE_SIZES.items()}
+            for index, decoded in enumerate(table):
+                if decoded.name in STORE_INSTRUCTIONS and decoded.handler is not None:
+                    self._originals[index] = decoded
+                    table[index] = decoded._replace(handler=self._watched_stores[decoded.name])
+        for pc in self.breakpoints:
+            index = pc >> 2
+            if index < len(table) and table[index].handler is not None:
+                self._originals.setdefault(index, table[index])
+                self._traps[index] = table[index]
+                # A null handler stops every execution loop like a halt
+                table[index] = table[index]._replace(handler=None)
+        # Compiled blocks embed the old entries
+        self.translator.invalidate()
+
+    def _count_redirects(self, name):
+        """Return a copy of a beq, bne, j or jal handler that counts its redirects in a closure cell\n
+        The counts are added to the profiler by flush_counters(), so profiling costs the interpreter
+        one increment per counted redirect and nothing per instruction.
+        """
+        registers = self.registers
+        redirects = 0
+        if name == 'beq':
+            def beq(rs, rt, target):
+                nonlocal redirects
+                regs = registers.registers
+                if regs[rs] == regs[rt]:
+                    self.current_pc = registers.pc = target
+                    redirects += 1
+                    return False
+                return True
+            return beq
+        if name == 'bne':
+            def bne(rs, rt, target):
+                nonlocal redirects
+                regs = registers.registers
+                if regs[rs] != regs[rt]:
+                    self.current_pc = registers.pc = target
+                    redirects += 1
+                    return False
+                return True
+            return bne
+        if name == 'j':
+            def j(target, b, c):
+                nonlocal redirects
+                self.current_pc = registers.pc = target
+                redirects += 1
+                return False
+            return j
+        def jal(target, link, c):
+            nonlocal redirects
+            registers.registers[31] = link
+            self.current_pc = registers.pc = target
+            redirects += 1
+            return False
+        return jal
+
+    def _count_jr_targets(self):
+        """Return a copy of the jr handler that counts its targets as profiler entries"""
+        registers = self.registers
+        profiler = self.profiler
+        end = self.program_length * 4
+        def jr(rs, b, c):
+            target = self.current_pc = registers.pc = registers.registers[rs]
+            if target < end:
+                profiler.entries[target >> 2] += 1
+            return False
+        return jr
+
+    def _watch_store(self, handler, size):
+        """Wrap a store handler to raise WatchpointHit after writing inside a watched range"""
+        mask = (1 << (8 * size)) - 1
+        def store(rt, rs, imm):
+            regs = self.registers.registers
+            address = (regs[rs] + imm) & 0xFFFFFFFF
+            handler(rt, rs, imm)
+            for start, end in self.watchpoints:
+                if address < end and start < address + size:
+                    raise WatchpointHit(address, size, regs[rt] & mask)
+            return True
+        return store
+
+    def _break_at(self, pc):
+        """Return True if execution should stop at the breakpoint at `pc`, recording the stop"""
+        if self._stopped == (pc, self.steps_executed):
+            # Resuming from this stop
+            return False
+        condition = self.breakpoints[pc]
+        if condition is not None and not condition(self):
+            return False
+        self._stopped = (pc, self.steps_executed)
+        self.stop_reason = {'type': 'breakpoint', 'pc': pc}
+        return True
+
+    def _step_over(self):
+        """Execute the instruction under the breakpoint trap at the current PC"""
+        index = self.registers.pc >> 2
+        table = self.decoded_instructions
+        trap, table[index] = table[index], self._traps[index]
+        try:
+            if self.hooks:
+                return self._execute_observed(1)
+            return self._execute_fast(1)
+        finally:
+            table[index] = trap
+
+    def _finish_watched_store(self, hit):
+        """Complete the step of a store interrupted by WatchpointHit, its write is already done"""
+        pc = self.registers.pc
+        decoded = self.decoded_instructions[pc >> 2]
+        for hook in self.hooks:
+            hook(pc, decoded, True, hit.address)
+        self.registers.pc = self.current_pc = (pc + 4) & 0xFFFFFFFF
+        self.steps_executed += 1
+        self.stop_reason = {'type': 'watchpoint', 'pc': pc, 'address': hit.address, 'size': hit.size, 'value': hit.value}
+
+    def set_history_depth(self, depth):
+        """Set how many executed steps are kept in execution_history\n
+        Parameters:\n
+            depth (int | None): None keeps every step, 0 disables recording,
+            N keeps only the N most recent steps\n
+        Raises:\n
+            ValueError: If depth is negative
+        """
+        self.execution_history.resize(depth)
+        self.history_depth = depth
 
     def load_from_file(self, filename):
         """Load and assemble program from file"""
@@ -47,6 +500,115 @@ class Simulator:
             
         return self.load(program)
 
+    def load_data_image(self, path, base_address=Memory.DATA_SEGMENT_BASE):
+        """Map a binary file into data memory, call after load()\n
+        The file is memory-mapped read-only and paged in lazily, pages are copied only when written.\n
+        Parameters:\n
+            path (str): Image file\n
+            base_address (int): Page-aligned address of the first byte\n
+        Returns:\n
+            int: Number of bytes mapped
+        """
+        size = self.memory.map_image(path, base_address)
+        # Checkpoint again so rewinding to this step keeps the image
+        self._checkpoint()
+        return size
+
+    def dump_data_image(self, path, base_address=Memory.DATA_SEGMENT_BASE, length=None):
+        """Write a range of data memory to a file with a single bulk write\n
+        Parameters:\n
+            path (str): Output file\n
+            base_address (int): Address of the first byte\n
+            length (int | None): Number of bytes, defaults to the size of the image loaded at base_address\n
+        Returns:\n
+            int: Number of bytes written\n
+        Raises:\n
+            ValueError: If no length is given and no image was loaded at base_address
+        """
+        if length is None:
+            if base_address not in self.memory.images:
+                raise ValueError(f"No data image loaded at 0x{base_address:08x}, length is required")
+            length = self.memory.images[base_address]
+        data = self.memory.read_bytes(base_address, length)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return length
+
+    def snapshot(self):
+        """Capture the machine state for restore() or fork()\n
+        Nothing is copied but the registers: data memory pages become shared and are copied by whichever
+        side writes them first, the instruction memory is shared as is.\n
+        Returns:\n
+            SimulatorSnapshot: The state at the current step
+        """
+        return SimulatorSnapshot(self.registers.pc, tuple(self.registers.registers), self.memory.snapshot(),
+                                 self.memory.instruction_memory, self.program_length, self.steps_executed,
+                                 self._stopped == (self.registers.pc, self.steps_executed))
+
+    def restore(self, snapshot):
+        """Return to a snapshot() state, which may come from another simulator\n
+        The program is only decoded again if the snapshot holds a different one. History and
+        checkpoints restart at the snapshot step, attached profiler and models keep their counts.\n
+        Parameters:\n
+            snapshot (SimulatorSnapshot): State to restore, it can be restored any number of times\n
+        Returns:\n
+            None
+        """
+        self.registers.registers[:] = snapshot.registers
+        self.registers.mark_all_dirty()
+        self.registers.pc = self.current_pc = snapshot.pc
+        self.memory.restore(snapshot.memory)
+        if snapshot.instructions is not self.memory.instruction_memory:
+            self.memory.instruction_memory = snapshot.instructions
+            self.memory.instruction_version += 1
+            self.program_length = snapshot.program_length
+            self.decode_program()
+        self.program_loaded = True
+        self.steps_executed = snapshot.step
+        self.execution_history.clear(snapshot.step)
+        self.checkpoints.clear()
+        self._checkpoint()
+        self.stop_reason = None
+        self._stopped = (snapshot.pc, snapshot.step) if snapshot.stopped else None
+
+    def fork(self):
+        """Return an independent simulator continuing from the current state\n
+        The copy shares data memory pages copy-on-write and the instruction memory with this
+        simulator and copies its predecoded table, so forking costs a snapshot() and a table copy.
+        It keeps the configuration, labels, breakpoints and watchpoints, profiler and models are not attached.\n
+        Returns:\n
+            Simulator: The new simulator
+        """
+        fork = Simulator(self.history_depth, self.checkpoint_interval, self.engine, self.max_checkpoints)
+        fork.debug_mode = self.debug_mode
+        fork.translator.hot_threshold = self.translator.hot_threshold
+        # Assembler results are replaced, never changed, by the next assembly, so they can be shared
+        fork.assembler.cache = self.assembler.cache
+        fork.assembler.set_symbols(self.assembler.get_symbols())
+        fork.breakpoints = dict(self.breakpoints)
+        fork.watchpoints = list(self.watchpoints)
+        if self.program_loaded:
+            if self._decoded_version != self.memory.instruction_version:
+                self.decode_program()
+            fork.memory.instruction_memory = self.memory.instruction_memory
+            fork.program_length = self.program_length
+            fork._copy_table(self)
+            fork.restore(self.snapshot())
+        return fork
+
+    def _copy_table(self, source):
+        """Install the predecoded table of another simulator running the same program, rebound to this one"""
+        table = source.decoded_instructions
+        if source._originals:
+            table = [source._originals.get(index) or decoded for index, decoded in enumerate(table)]
+        handlers = {handler: getattr(self, handler.__name__) if handler is not None else None
+                    for handler in {decoded.handler for decoded in table}}
+        self.decoded_instructions = [DecodedInstruction(handlers[handler], a, b, c, dest, name)
+                                     for handler, a, b, c, dest, name in table]
+        self._decoded_version = self.memory.instruction_version
+        self._originals = {}
+        self._patch_table()
+
     def step(self):
         """Execute single instruction and return detailed state"""
         # Returns: Status KV pair from the step executed
@@ -54,54 +616,43 @@ class Simulator:
             return {
                 'status': 'error',
                 'message': 'No program loaded',
-                'state': self.get_state()
+                'state': self._state.freeze()
             }
 
         if self.registers.pc >= self.program_length * 4:
             return {
                 'status': 'completed',
                 'message': 'Program completed - reached end of instructions',
-                'state': self.get_state()
+                'state': self._state.freeze()
             }
 
-        instruction = self.memory.get_instruction(self.registers.pc)
-        if instruction == 0:
+        if self._decoded_version != self.memory.instruction_version:
+            self.decode_program()
+
+        # Stepping executes the instruction under a breakpoint trap and checks watchpoints itself
+        index = self.registers.pc >> 2
+        decoded = self._originals.get(index) or self.decoded_instructions[index]
+        self.stop_reason = None
+        if decoded.handler is None:
             return {
                 'status': 'halted',
                 'message': 'Program halted - reached null instruction',
-                'state': self.get_state()
+                'state': self._state.freeze()
             }
 
-        # Record pre-execution state
         old_pc = self.registers.pc
-        pre_state = self.get_register_state()
-
-        # Execute instruction
-        continue_execution = self.execute_instruction(instruction)
-        
-        # Record execution in history
+        instruction = self.memory.get_instruction(old_pc)
+        self._execute_recorded(decoded, instruction)
         instruction_info = self._get_instruction_info(instruction)
-        execution_record = {
-            'pc': old_pc,
-            'instruction': f"0x{instruction:08x}",
-            'instruction_info': instruction_info,
-            'pre_state': pre_state,
-            'post_state': self.get_register_state()
-        }
-        self.execution_history.append(execution_record)
-
-        # Update PC if needed
-        if continue_execution:
-            self.registers.pc += 4
-            self.current_pc = self.registers.pc
 
         result = {
             'status': 'running',
             'pc': self.registers.pc,
             'previous_pc': old_pc,
+            'step': self.steps_executed,
             'instruction': f"0x{instruction:08x}",
             'instruction_info': instruction_info,
-            'state': self.get_state(),
+            'state': self._state.freeze(),
             'message': 'Instruction executed successfully'
         }
 
@@ -110,8 +661,183 @@ class Simulator:
 
         return result
 
-    def run(self):
-        """Run the program with detailed execution tracking"""
+    def _execute_recorded(self, decoded, instruction):
+        """Execute a decoded instruction and record its changes in history"""
+        pc = self.registers.pc
+        registers = self.registers.registers
+        old_value = registers[decoded.dest]
+        address = None
+        if decoded.name in STORE_INSTRUCTIONS:
+            address = ((registers[decoded.b] + decoded.c) & 0xFFFFFFFF) & ~3
+            old_word = self.memory.read_word(address)
+        # Taken before the instruction can overwrite its base register
+        effective = (registers[decoded.b] + decoded.c) & 0xFFFFFFFF if decoded.name in MEMORY_INSTRUCTIONS else None
+
+        advanced = decoded.handler(decoded.a, decoded.b, decoded.c)
+        if advanced:
+            self.registers.pc = pc + 4
+            self.current_pc = self.registers.pc
+        if self.profiler is not None:
+            self.profiler.record(pc, advanced)
+        for hook in self.hooks:
+            hook(pc, decoded, advanced, effective)
+        if self.watchpoints and address is not None:
+            size = STORE_SIZES[decoded.name]
+            if any(effective < end and start < effective + size for start, end in self.watchpoints):
+                self.stop_reason = {'type': 'watchpoint', 'pc': pc, 'address': effective, 'size': size,
+                                    'value': registers[decoded.a] & ((1 << (8 * size)) - 1)}
+
+        if address is None:
+            self.execution_history.append(pc, instruction, decoded.dest, old_value, registers[decoded.dest])
+            if decoded.dest:
+                self.registers.mark_dirty(decoded.dest)
+        else:
+            self.memory.mark_dirty(address)
+            self.execution_history.append(pc, instruction, 0, 0, 0,
+                                          address, old_word, self.memory.read_word(address))
+
+        self.steps_executed += 1
+        if self.checkpoint_interval and self.steps_executed % self.checkpoint_interval == 0:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        """Store the full state at the current step\n
+        Memory pages are shared copy-on-write with the running program and earlier checkpoints.
+        Above max_checkpoints every other checkpoint of the older half is dropped, step 0 is
+        always kept, so recent steps stay dense and older ones take longer replays."""
+        self.checkpoints[self.steps_executed] = (
+            self.registers.pc, list(self.registers.registers), self.memory.snapshot()
+        )
+        if len(self.checkpoints) > self.max_checkpoints:
+            steps = sorted(self.checkpoints)
+            for step in steps[1:len(steps) // 2 + 1][::2]:
+                del self.checkpoints[step]
+
+    def step_back(self):
+        """Undo the last executed instruction\n
+        Returns:\n
+            dict: Status KV pair like seek()
+        """
+        if self.steps_executed == 0:
+            return {
+                'status': 'error',
+                'message': 'Already at the first instruction',
+                'state': self._state.freeze()
+            }
+        return self.seek(self.steps_executed - 1)
+
+    def seek(self, step):
+        """Move the simulator to the state after `step` executed instructions\n
+        Going back undoes history deltas when the target is within one checkpoint
+        interval, otherwise the nearest earlier checkpoint is restored and replayed,
+        so the cost is bounded by the checkpoint interval rather than the run length.
+        Going forward executes the program up to the target step.\n
+        Parameters:\n
+            step (int): Target step number (0 is the freshly loaded program)\n
+        Returns:\n
+            dict: Status KV pair with the reached step
+        """
+        if not self.program_loaded:
+            return {
+                'status': 'error',
+                'message': 'No program loaded',
+                'state': self._state.freeze()
+            }
+        if step < 0:
+            return {
+                'status': 'error',
+                'message': f"Invalid step: {step}",
+                'state': self._state.freeze()
+            }
+
+        if self._decoded_version != self.memory.instruction_version:
+            self.decode_program()
+
+        status = 'running'
+        if step < self.steps_executed:
+            interval = self.checkpoint_interval
+            trace = self.execution_history
+            if step >= trace.first_step and (not interval or self.steps_executed - step <= interval):
+                self._undo_to(step)
+            else:
+                checkpoint = self._nearest_checkpoint(step)
+                if checkpoint is None:
+                    return {
+                        'status': 'error',
+                        'message': f"Step {step} is no longer recorded",
+                        'state': self._state.freeze()
+                    }
+                self._restore_checkpoint(checkpoint)
+                status = self._replay(step - checkpoint)
+            # Later checkpoints are recreated if execution goes forward again
+            for later in [key for key in self.checkpoints if key > self.steps_executed]:
+                del self.checkpoints[later]
+        elif step > self.steps_executed:
+            status = self._replay(step - self.steps_executed)
+
+        return {
+            'status': status,
+            'pc': self.registers.pc,
+            'step': self.steps_executed,
+            'state': self._state.freeze(),
+            'message': f"Moved to step {self.steps_executed}"
+        }
+
+    def _undo_to(self, step):
+        """Apply history deltas backwards until `step` is reached"""
+        # A breakpoint reached again after going back stops again
+        self._stopped = None
+        registers = self.registers.registers
+        trace = self.execution_history
+        while self.steps_executed > step:
+            record = trace[-1]
+            if record['register'] is not None:
+                registers[record['register']] = record['register_old']
+                self.registers.mark_dirty(record['register'])
+            if record['address'] is not None:
+                self.memory.write_word(record['address'], record['memory_old'])
+                self.memory.mark_dirty(record['address'])
+            self.registers.pc = self.current_pc = record['pc']
+            self.steps_executed -= 1
+            trace.truncate(self.steps_executed)
+
+    def _nearest_checkpoint(self, step):
+        """Return the latest checkpointed step at or before `step`"""
+        candidates = [key for key in self.checkpoints if key <= step]
+        return max(candidates) if candidates else None
+
+    def _restore_checkpoint(self, checkpoint):
+        """Restore the full state stored at a checkpoint"""
+        pc, registers, memory = self.checkpoints[checkpoint]
+        self.registers.registers[:] = registers
+        self.registers.mark_all_dirty()
+        self.registers.pc = self.current_pc = pc
+        self.memory.restore(memory)
+        self.steps_executed = checkpoint
+        self.execution_history.truncate(checkpoint)
+        self._stopped = None
+
+    def _replay(self, count):
+        """Execute up to `count` instructions with history recording"""
+        end = self.program_length * 4
+        for _ in range(count):
+            pc = self.registers.pc
+            if pc >= end:
+                return 'completed'
+            decoded = self._originals.get(pc >> 2) or self.decoded_instructions[pc >> 2]
+            if decoded.handler is None:
+                return 'halted'
+            self._execute_recorded(decoded, self.memory.get_instruction(pc))
+        return 'running'
+
+    def run(self, fast=False, max_instructions=1000000):
+        """Run the program with detailed execution tracking\n
+        Parameters:\n
+            fast (bool): Skip per-step records and history, only final state and counters are returned\n
+            max_instructions (int): Instruction limit to stop infinite loops\n
+        Notes:\n
+            - The fast mode targets at least 20x the instructions per second of the detailed mode
+        """
         # Returns: Status KV pair from the whole program
         if not self.program_loaded:
             return {
@@ -120,12 +846,18 @@ class Simulator:
                 'execution_history': self.execution_history
             }
 
+        if fast:
+            return self._run_fast(max_instructions)
+
         print("\nStarting program execution...")
+        self.stop_reason = None
         instruction_count = 0
-        max_iterations = 1000000  # Prevent infinite loops
+        max_iterations = max_instructions  # Prevent infinite loops
         execution_results = []
 
         while instruction_count < max_iterations:
+            if self._traps and (self.registers.pc >> 2) in self._traps and self._break_at(self.registers.pc):
+                break
             step_result = self.step()
             execution_results.append(step_result)
             
@@ -133,16 +865,20 @@ class Simulator:
                 break
                 
             instruction_count += 1
+            if self.stop_reason is not None:
+                break
 
         final_result = {
             'status': 'completed',
             'instructions_executed': instruction_count,
             'execution_results': execution_results,
-            'final_state': self.get_state(),
+            'final_state': self._state.freeze(),
             'message': f"Program execution completed with {instruction_count} instructions"
         }
 
-        if instruction_count >= max_iterations:
+        if self.stop_reason is not None:
+            final_result.update(self._stop_result())
+        elif instruction_count >= max_iterations:
             final_result.update({
                 'status': 'error',
                 'message': 'Program terminated - reached maximum instruction limit'
@@ -153,29 +889,210 @@ class Simulator:
 
         return final_result
 
+    def describe_stop(self):
+        """Return a message describing stop_reason, None if the last run did not stop at a breakpoint or watchpoint"""
+        reason = self.stop_reason
+        if reason is None:
+            return None
+        if reason['type'] == 'breakpoint':
+            return f"Stopped at breakpoint 0x{reason['pc']:08x}"
+        return f"Stopped by watchpoint: store at 0x{reason['pc']:08x} wrote 0x{reason['address']:08x}"
+
+    def _stop_result(self):
+        """Return the status, message and stop_reason of a run stopped by a breakpoint or watchpoint"""
+        return {'status': self.stop_reason['type'], 'message': self.describe_stop(), 'stop_reason': self.stop_reason}
+
+    def _run_fast(self, max_instructions):
+        """Run without per-step records, used by run(fast=True)"""
+        start = time.perf_counter()
+        status, instruction_count = self.execute(max_instructions)
+        elapsed = time.perf_counter() - start
+
+        final_result = {
+            'status': 'completed',
+            'instructions_executed': instruction_count,
+            'elapsed_time': elapsed,
+            'instructions_per_second': instruction_count / elapsed if elapsed > 0 else 0.0,
+            'final_state': self._state.freeze(),
+            'message': f"Program execution completed with {instruction_count} instructions"
+        }
+
+        if status in ('breakpoint', 'watchpoint'):
+            final_result.update(self._stop_result())
+        elif status == 'running':
+            final_result.update({
+                'status': 'error',
+                'message': 'Program terminated - reached maximum instruction limit'
+            })
+
+        if self.debug_mode:
+            self._print_run_debug(final_result)
+
+        return final_result
+
+    def execute(self, max_instructions):
+        """Execute up to max_instructions from the predecoded table without recording any state\n
+        Checkpoints are still taken every checkpoint_interval steps; the history is
+        restarted at the reached step since the executed steps are not recorded.
+        With engine='blocks' hot basic blocks run as compiled Python functions.
+        With a profiler enabled the interpreter runs the profiling loop and compiled blocks count their redirects.
+        With timing models attached every instruction is passed to them, whatever the engine.
+        Breakpoints are only checked when a slice stops at a trap, watchpoints by watched stores,
+        the instruction or store that stopped the run is described by stop_reason.\n
+        Returns:\n
+            tuple: (status, instructions executed), status is 'completed', 'halted', 'breakpoint',
+            'watchpoint' or 'running' if the instruction limit was reached first
+        """
+        if self._decoded_version != self.memory.instruction_version:
+            self.decode_program()
+
+        if self.hooks:
+            run_slice = self._execute_observed
+        elif self.engine == 'blocks':
+            run_slice = self.translator.execute
+        else:
+            run_slice = self._execute_fast
+        # Branches in the table count their own redirects, the profiler derives the rest
+        profiler = self.profiler
+        interval = self.checkpoint_interval
+        traps = self._traps
+        start = self.steps_executed
+        status = 'running'
+        self.stop_reason = None
+        if profiler is not None:
+            profiler.enter(self.registers.pc)
+        try:
+            while status == 'running' and self.steps_executed - start < max_instructions:
+                limit = max_instructions - (self.steps_executed - start)
+                if interval:
+                    # Stop at the next checkpoint boundary
+                    limit = min(limit, interval - self.steps_executed % interval)
+                if traps and (self.registers.pc >> 2) in traps:
+                    if self._break_at(self.registers.pc):
+                        status = 'breakpoint'
+                        break
+                    status, executed = self._step_over()
+                else:
+                    status, executed = run_slice(limit)
+                    if status == 'halted' and (self.registers.pc >> 2) in traps:
+                        # Stopped at a breakpoint trap, checked above
+                        status = 'running'
+                if interval and executed and self.steps_executed % interval == 0:
+                    self._checkpoint()
+        except WatchpointHit as hit:
+            self._finish_watched_store(hit)
+            status = 'watchpoint'
+            if interval and self.steps_executed % interval == 0:
+                self._checkpoint()
+        finally:
+            if profiler is not None:
+                profiler.stop(self.registers.pc)
+            if self.steps_executed != start:
+                self.execution_history.clear(self.steps_executed)
+                # Unrecorded steps can have changed anything
+                self.registers.mark_all_dirty()
+                self.memory.mark_all_dirty()
+
+        return status, self.steps_executed - start
+
+    def _execute_fast(self, max_instructions):
+        """Inner loop of execute()"""
+        table = self.decoded_instructions
+        registers = self.registers
+        end = self.program_length * 4
+        pc = registers.pc
+        count = 0
+        status = 'running'
+
+        try:
+            while count < max_instructions:
+                if pc >= end:
+                    status = 'completed'
+                    break
+                handler, a, b, c, _, _ = table[pc >> 2]
+                if handler is None:
+                    status = 'halted'
+                    break
+                # Handlers only touch registers.pc when they redirect it
+                if handler(a, b, c):
+                    pc += 4
+                else:
+                    pc = registers.pc
+                count += 1
+        finally:
+            registers.pc = self.current_pc = pc
+            self.steps_executed += count
+
+        return status, count
+
+    def _execute_observed(self, max_instructions):
+        """Inner loop of execute() with timing models attached, each instruction is passed to their hooks"""
+        table = self.decoded_instructions
+        registers = self.registers
+        r = registers.registers
+        hooks = self.hooks
+        end = self.program_length * 4
+        pc = registers.pc
+        count = 0
+        status = 'running'
+
+        try:
+            while count < max_instructions:
+                if pc >= end:
+                    status = 'completed'
+                    break
+                decoded = table[pc >> 2]
+                if decoded.handler is None:
+                    status = 'halted'
+                    break
+                address = (r[decoded.b] + decoded.c) & 0xFFFFFFFF if decoded.name in MEMORY_INSTRUCTIONS else None
+                advanced = decoded.handler(decoded.a, decoded.b, decoded.c)
+                for hook in hooks:
+                    hook(pc, decoded, advanced, address)
+                pc = pc + 4 if advanced else registers.pc
+                count += 1
+        finally:
+            registers.pc = self.current_pc = pc
+            self.steps_executed += count
+
+        return status, count
+
     def get_state(self):
-        """Get current simulator state"""
+        """Get current simulator state\n
+        Returns:\n
+            StateView: Live read-only mapping with the pc, registers, memory, history and reg_labels keys.
+            Its register views are cached until a register changes, to_dict() returns a plain dict copy
+            and freeze() a view that keeps the current values like the states in step() and run() results
+        """
+        return self._state
+
+    def state_at(self, step):
+        """Rebuild the simulator state after `step` executed instructions from the execution history\n
+        Parameters:\n
+            step (int): Step number, between the oldest recorded step and the current one\n
+        Raises:\n
+            IndexError: If the step is not covered by the execution history
+        """
+        pc, registers, words = self.execution_history.reconstruct(step, self.registers.pc, self.registers.registers)
+        data = dict(self.memory.read_data_memory())
+        for address, word in words.items():
+            if word:
+                data[address] = word
+            else:
+                data.pop(address, None)
         return {
-            'pc': self.registers.pc,
-            'registers': self.get_register_state(),
-            'memory': self.get_memory_state(),
-            'history': self.execution_history,
-            'reg_labels': self.get_register_state(label=True)
+            'step': step,
+            'pc': pc,
+            'registers': {i: _signed(value) for i, value in enumerate(registers)},
+            'memory': {
+                'instructions': self.memory.read_instruction_memory(),
+                'data': data
+            }
         }
 
     def get_register_state(self, label=False):
-        """Get register contents with sign extension using register names as keys"""
-        register_state = {}
-        for i in range(32):
-            value = self.registers.read_register(i)
-            # Convert 2's complement to signed
-            if value & 0x80000000:  # If negative (MSB is 1)
-                value = -((~value + 1) & 0xFFFFFFFF)
-            if label:
-                register_state[self.registers.get_register_name(i)] = value
-            else:
-                register_state[i] = value
-        return register_state
+        """Get a copy of the signed register contents, by register name if label is True"""
+        return dict(self._state.reg_labels if label else self._state.registers)
 
     def get_memory_state(self):
         """Get memory contents"""
@@ -225,7 +1142,7 @@ class Simulator:
         
         # Sign extend immediate value
         if imm & 0x8000:
-            imm |= 0xFFFF0000
+            imm -= 0x10000
             
         if op == 0x08:  # addi
             result = (rs_val + imm) & 0xFFFFFFFF
@@ -241,10 +1158,28 @@ class Simulator:
             rt_val = self.registers.read_register(rt)
             self.memory.write_word(addr, rt_val)
             
+        elif op in (0x20, 0x24):  # lb, lbu
+            value = self.memory.read_byte((rs_val + imm) & 0xFFFFFFFF)
+            if op == 0x20:
+                value = ((value ^ 0x80) - 0x80) & 0xFFFFFFFF
+            self.registers.write_register(rt, value)
+            
+        elif op in (0x21, 0x25):  # lh, lhu
+            value = self.memory.read_half((rs_val + imm) & 0xFFFFFFFF)
+            if op == 0x21:
+                value = ((value ^ 0x8000) - 0x8000) & 0xFFFFFFFF
+            self.registers.write_register(rt, value)
+            
+        elif op == 0x29:  # sh
+            self.memory.write_half((rs_val + imm) & 0xFFFFFFFF, self.registers.read_register(rt))
+            
+        elif op == 0x28:  # sb
+            self.memory.write_byte((rs_val + imm) & 0xFFFFFFFF, self.registers.read_register(rt))
+            
         elif op == 0x04:  # beq
             rt_val = self.registers.read_register(rt)
             if rs_val == rt_val:
-                target = self.registers.pc + 4 + (imm << 2)
+                target = (self.registers.pc + 4 + (imm << 2)) & 0xFFFFFFFF
                 self.current_pc = target
                 self.registers.pc = target
                 return False
@@ -252,7 +1187,7 @@ class Simulator:
         elif op == 0x05:  # bne
             rt_val = self.registers.read_register(rt)
             if rs_val != rt_val:
-                target = self.registers.pc + 4 + (imm << 2)
+                target = (self.registers.pc + 4 + (imm << 2)) & 0xFFFFFFFF
                 self.current_pc = target
                 self.registers.pc = target
                 return False
@@ -296,6 +1231,184 @@ class Simulator:
         else:  # I-type
             return self.execute_i_type(op, rs, rt, imm)
 
+    def decode(self, instruction, pc):
+        """Decode a machine word located at `pc` into a DecodedInstruction"""
+        op = (instruction >> 26) & 0x3F
+        rs = (instruction >> 21) & 0x1F
+        rt = (instruction >> 16) & 0x1F
+        rd = (instruction >> 11) & 0x1F
+        shamt = (instruction >> 6) & 0x1F
+        funct = instruction & 0x3F
+        imm = instruction & 0xFFFF
+        if imm & 0x8000:  # Sign extend once here instead of on every execution
+            imm -= 0x10000
+
+        if op == 0:  # R-type
+            name = R_TYPE_NAMES.get(funct)
+            if name is None:
+                return DecodedInstruction(self._op_nop, 0, 0, 0, 0, 'nop')
+            if name == 'jr':
+                return DecodedInstruction(self._op_jr, rs, 0, 0, 0, name)
+            if rd == 0:  # Writes to $zero are discarded
+                return DecodedInstruction(self._op_nop, 0, 0, 0, 0, name)
+            if name in ('sll', 'srl'):
+                return DecodedInstruction(getattr(self, '_op_' + name), rd, rt, shamt, rd, name)
+            return DecodedInstruction(getattr(self, '_op_' + name), rd, rs, rt, rd, name)
+
+        if op in (0x02, 0x03):  # J-type
+            target = (pc & 0xF0000000) | ((instruction & 0x3FFFFFF) << 2)
+            if op == 0x02:
+                return DecodedInstruction(self._op_j, target, 0, 0, 0, 'j')
+            return DecodedInstruction(self._op_jal, target, (pc + 4) & 0xFFFFFFFF, 0, 31, 'jal')
+
+        name = I_TYPE_NAMES.get(op)
+        if name is None:
+            return DecodedInstruction(self._op_nop, 0, 0, 0, 0, 'nop')
+        if name in ('beq', 'bne'):
+            target = (pc + 4 + (imm << 2)) & 0xFFFFFFFF
+            return DecodedInstruction(getattr(self, '_op_' + name), rs, rt, target, 0, name)
+        if name in STORE_INSTRUCTIONS:
+            return DecodedInstruction(getattr(self, '_op_' + name), rt, rs, imm, 0, name)
+        if name == 'addi' and rt == 0:
+            return DecodedInstruction(self._op_nop, 0, 0, 0, 0, name)
+        return DecodedInstruction(getattr(self, '_op_' + name), rt, rs, imm, rt, name)
+
+    def decode_program(self):
+        """Decode the loaded instruction memory into the predecoded table"""
+        instructions = self.memory.read_instruction_memory()
+        self.decoded_instructions = [
+            self.decode(instructions[i], i * 4) if instructions[i] != 0 else HALT
+            for i in range(self.program_length)
+        ]
+        self._decoded_version = self.memory.instruction_version
+        self._originals = {}
+        self._patch_table()
+        return self.decoded_instructions
+
+    # Instruction handlers used by the predecoded table.
+    # Each returns True when the PC should advance to the next instruction,
+    # False when the handler has already redirected it.
+    def _op_nop(self, a, b, c):
+        return True
+
+    def _op_add(self, rd, rs, rt):
+        regs = self.registers.registers
+        regs[rd] = (regs[rs] + regs[rt]) & 0xFFFFFFFF
+        return True
+
+    def _op_sub(self, rd, rs, rt):
+        regs = self.registers.registers
+        regs[rd] = (regs[rs] - regs[rt]) & 0xFFFFFFFF
+        return True
+
+    def _op_and(self, rd, rs, rt):
+        regs = self.registers.registers
+        regs[rd] = regs[rs] & regs[rt]
+        return True
+
+    def _op_or(self, rd, rs, rt):
+        regs = self.registers.registers
+        regs[rd] = regs[rs] | regs[rt]
+        return True
+
+    def _op_slt(self, rd, rs, rt):
+        regs = self.registers.registers
+        # Flipping the sign bit turns a signed comparison into an unsigned one
+        regs[rd] = 1 if (regs[rs] ^ 0x80000000) < (regs[rt] ^ 0x80000000) else 0
+        return True
+
+    def _op_sll(self, rd, rt, shamt):
+        regs = self.registers.registers
+        regs[rd] = (regs[rt] << shamt) & 0xFFFFFFFF
+        return True
+
+    def _op_srl(self, rd, rt, shamt):
+        regs = self.registers.registers
+        regs[rd] = regs[rt] >> shamt
+        return True
+
+    def _op_jr(self, rs, b, c):
+        self.current_pc = self.registers.pc = self.registers.registers[rs]
+        return False
+
+    def _op_addi(self, rt, rs, imm):
+        regs = self.registers.registers
+        regs[rt] = (regs[rs] + imm) & 0xFFFFFFFF
+        return True
+
+    def _op_lw(self, rt, rs, imm):
+        regs = self.registers.registers
+        value = self.memory.read_word((regs[rs] + imm) & 0xFFFFFFFF)
+        if rt:
+            regs[rt] = value
+        return True
+
+    def _op_lb(self, rt, rs, imm):
+        regs = self.registers.registers
+        value = self.memory.read_byte((regs[rs] + imm) & 0xFFFFFFFF)
+        if rt:
+            regs[rt] = ((value ^ 0x80) - 0x80) & 0xFFFFFFFF  # Sign extend byte
+        return True
+
+    def _op_lbu(self, rt, rs, imm):
+        regs = self.registers.registers
+        value = self.memory.read_byte((regs[rs] + imm) & 0xFFFFFFFF)
+        if rt:
+            regs[rt] = value
+        return True
+
+    def _op_lh(self, rt, rs, imm):
+        regs = self.registers.registers
+        value = self.memory.read_half((regs[rs] + imm) & 0xFFFFFFFF)
+        if rt:
+            regs[rt] = ((value ^ 0x8000) - 0x8000) & 0xFFFFFFFF  # Sign extend halfword
+        return True
+
+    def _op_lhu(self, rt, rs, imm):
+        regs = self.registers.registers
+        value = self.memory.read_half((regs[rs] + imm) & 0xFFFFFFFF)
+        if rt:
+            regs[rt] = value
+        return True
+
+    def _op_sw(self, rt, rs, imm):
+        regs = self.registers.registers
+        self.memory.write_word((regs[rs] + imm) & 0xFFFFFFFF, regs[rt])
+        return True
+
+    def _op_sh(self, rt, rs, imm):
+        regs = self.registers.registers
+        self.memory.write_half((regs[rs] + imm) & 0xFFFFFFFF, regs[rt])
+        return True
+
+    def _op_sb(self, rt, rs, imm):
+        regs = self.registers.registers
+        self.memory.write_byte((regs[rs] + imm) & 0xFFFFFFFF, regs[rt])
+        return True
+
+    def _op_beq(self, rs, rt, target):
+        regs = self.registers.registers
+        if regs[rs] == regs[rt]:
+            self.current_pc = self.registers.pc = target
+            return False
+        return True
+
+    def _op_bne(self, rs, rt, target):
+        regs = self.registers.registers
+        if regs[rs] != regs[rt]:
+            self.current_pc = self.registers.pc = target
+            return False
+        return True
+
+    def _op_j(self, target, b, c):
+        self.current_pc = self.registers.pc = target
+        return False
+
+    def _op_jal(self, target, link, c):
+        self.registers.registers[31] = link
+        self.current_pc = self.registers.pc = target
+        return False
+
     def _get_instruction_info(self, instruction):
         """Decode and return instruction information"""
         op = (instruction >> 26) & 0x3F
@@ -334,14 +1447,15 @@ class Simulator:
         for field, value in info['fields'].items():
             print(f"  {field}: {value}")
         
-        if self.debug_mode == 2:  # More detailed debug level
+        if self.debug_mode == 2 and len(result['state']['history']):  # More detailed debug level
             print("\nRegister Changes:")
-            pre_state = result['state']['history'][-1]['pre_state']
-            post_state = result['state']['history'][-1]['post_state']
-            for reg in range(32):
-                if pre_state[reg] != post_state[reg]:
-                    reg_name = self.registers.get_register_name(reg)
-                    print(f"  ${reg} ({reg_name}): 0x{pre_state[reg]:08x} -> 0x{post_state[reg]:08x}")
+            record = result['state']['history'][-1]
+            reg = record['register']
+            if reg is not None and record['register_old'] != record['register_new']:
+                reg_name = self.registers.get_register_name(reg)
+                print(f"  ${reg} ({reg_name}): 0x{record['register_old']:08x} -> 0x{record['register_new']:08x}")
+            if record['address'] is not None:
+                print(f"  [0x{record['address']:08x}]: 0x{record['memory_old']:08x} -> 0x{record['memory_new']:08x}")
 
     def _print_run_debug(self, result):
         """Print debug information for complete program execution"""
@@ -375,7 +1489,6 @@ class Simulator:
                 print(f"[0x{i*4:04x}] 0x{instruction:08x}")
     
         print("\nData Memory Contents:")
-        for i, data in enumerate(self.memory.data_memory):
-            if data != 0:  # Only print non-zero data
-                print(f"{i}[0x{i*4:04x}] 0x{data:08x}")
+        for address, data in self.memory.read_data_memory().items():
+            print(f"[0x{address:08x}] 0x{data:08x}")
     
\ No newline at end of file
@@ -0,0 +1,113 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
+'''
+    State Component
+    Read-only views of the SIM component state for the UI and callers of Simulator.get_state()
+'''
+
+class StateView(Mapping):
+    '''
+    Live read-only view of a simulator's state, returned by Simulator.get_state()\n
+    - Has the keys of the former state dict: pc, registers ({number: signed value}), memory
+      ({'instructions': list, 'data': DataMemoryView}), history and reg_labels ({name: signed value})\n
+    - Creating it costs nothing, register views are built on first access and cached until
+      a register value changes, whatever wrote it\n
+    - Register and memory views are read-only and follow the simulator, use to_dict() for a
+      plain dict copy that keeps the current register values\n
+    - freeze() returns a view that keeps the current pc and registers, as in step() and run() results
+    '''
+    KEYS = ('pc', 'registers', 'memory', 'history', 'reg_labels')
+
+    def __init__(self, simulator):
+        self._simulator = simulator
+        self._frozen = False  # pc and register values stay those of freeze()
+        self._pc = None
+        self._values = None  # Register values the cached views were built from
+        self._signed = None
+        self._labelled = None
+        self._names = None
+
+    def _validate(self):
+        '''Drop the cached register views if a register changed since they were built'''
+        if self._frozen:
+            return
+        values = self._simulator.registers.registers
+        if self._values != values:
+            self._values = list(values)
+            self._signed = None
+            self._labelled = None
+
+    @property
+    def pc(self):
+        return self._pc if self._frozen else self._simulator.registers.pc
+
+    @property
+    def registers(self):
+        '''Signed register values by number'''
+        self._validate()
+        if self._signed is None:
+            self._signed = MappingProxyType({i: value - 0x100000000 if value & 0x80000000 else value
+                                             for i, value in enumerate(self._values)})
+        return self._signed
+
+    @property
+    def reg_labels(self):
+        '''Signed register values by name ($zero, $at, ...)'''
+        signed = self.registers
+        if self._labelled is None:
+            if self._names is None:
+                registers = self._simulator.registers
+                self._names = [registers.get_register_name(i) for i in range(32)]
+            self._labelled = MappingProxyType(dict(zip(self._names, signed.values())))
+        return self._labelled
+
+    @property
+    def memory(self):
+        memory = self._simulator.memory
+        return MappingProxyType({'instructions': memory.read_instruction_memory(), 'data': memory.read_data_memory()})
+
+    @property
+    def history(self):
+        return self._simulator.execution_history
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def freeze(self):
+        '''Return a view of the current pc and register values that no longer follows the simulator\n
+        Only the register values are copied, register views already built are shared.
+        Memory and history stay live as in to_dict()\n
+        Returns:\n
+            StateView: Frozen view
+        '''
+        self._validate()
+        frozen = StateView(self._simulator)
+        frozen._frozen = True
+        frozen._pc = self.pc
+        # Replaced, never changed, when a register changes
+        frozen._values = self._values
+        frozen._signed, frozen._labelled, frozen._names = self._signed, self._labelled, self._names
+        return frozen
+
+    def to_dict(self):
+        '''Return the state as a plain dict of the former get_state() shape\n
+        Register dicts are copies, memory data stays a live DataMemoryView as before\n
+        Returns:\n
+            dict: pc, registers, memory, history and reg_labels
+        '''
+        return {
+            'pc': self.pc,
+            'registers': dict(self.registers),
+            'memory': dict(self.memory),
+            'history': self.history,
+            'reg_labels': dict(self.reg_labels)
+        }
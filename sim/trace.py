@@ -0,0 +1,194 @@
+from array import array
+
+'''
+    Execution Trace Component
+    Delta-encoded record of executed instructions for the SIM component
+'''
+
+# Bits of the `kinds` column
+REGISTER_WRITE = 1
+MEMORY_WRITE = 2
+
+class ExecutionTrace:
+    '''
+    Execution Trace\n
+    Stores one compact delta per executed instruction instead of full state snapshots:\n
+    - PC and machine word of the instruction\n
+    - Written register with its old and new value\n
+    - Written memory word address with its old and new value\n
+    Columns are typed arrays (about 30 bytes per step). A depth of None keeps every step,
+    0 records nothing and N keeps the N most recent steps in a fixed-size ring buffer.
+    '''
+    COLUMNS = (
+        ('pcs', 'I'), ('instructions', 'I'), ('kinds', 'B'),
+        ('registers', 'B'), ('register_old', 'I'), ('register_new', 'I'),
+        ('addresses', 'I'), ('memory_old', 'I'), ('memory_new', 'I')
+    )
+
+    def __init__(self, depth=None):
+        if depth is not None and depth < 0:
+            raise ValueError(f"Invalid history depth: {depth}")
+        self.depth = depth
+        self.clear()
+
+    def clear(self, step=0):
+        '''Drop all records\n
+        Parameters:\n
+            step (int): Step number the next record will have\n
+        Returns:\n
+            None
+        '''
+        size = self.depth or 0
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode, bytes(array(typecode).itemsize * size)))
+        self._start = 0
+        self._length = 0
+        self.total = step  # Step number after the newest record, including evicted ones
+
+    def resize(self, depth):
+        '''Change the depth, keeping the most recent records\n
+        Parameters:\n
+            depth (int | None): New depth\n
+        Raises:\n
+            ValueError: If depth is negative
+        '''
+        if depth is not None and depth < 0:
+            raise ValueError(f"Invalid history depth: {depth}")
+        kept = [self._row(i) for i in range(len(self))]
+        total = self.total
+        self.depth = depth
+        self.clear()
+        if depth is not None:
+            kept = kept[max(0, len(kept) - depth):] if depth else []
+        for row in kept:
+            self.append(*row)
+        self.total = total
+
+    def truncate(self, step):
+        '''Drop records of step `step` and later, used when execution is rewound\n
+        Parameters:\n
+            step (int): First step number to drop\n
+        Returns:\n
+            None
+        '''
+        if step <= self.first_step:
+            self.clear(step)
+            return
+        if step >= self.total:
+            return
+        dropped = self.total - step
+        self._length -= dropped
+        self.total = step
+        if self.depth is None:
+            for name, _ in self.COLUMNS:
+                del getattr(self, name)[self._length:]
+
+    def append(self, pc, instruction, register=0, register_old=0, register_new=0,
+               address=None, memory_old=0, memory_new=0):
+        '''Record one executed instruction\n
+        Parameters:\n
+            pc (int): Address of the instruction\n
+            instruction (int): Machine word\n
+            register (int): Written register, 0 if none\n
+            register_old, register_new (int): Register value before and after\n
+            address (int | None): Written data memory address, None if none\n
+            memory_old, memory_new (int): Memory word before and after
+        '''
+        if self.depth == 0:
+            self.total += 1
+            return
+        kinds = (REGISTER_WRITE if register else 0) | (MEMORY_WRITE if address is not None else 0)
+        row = (pc, instruction, kinds, register, register_old, register_new,
+               address or 0, memory_old, memory_new)
+
+        if self.depth is None:
+            for (name, _), value in zip(self.COLUMNS, row):
+                getattr(self, name).append(value)
+            self._length += 1
+        else:
+            if self._length < self.depth:
+                slot = (self._start + self._length) % self.depth
+                self._length += 1
+            else:  # Overwrite the oldest record
+                slot = self._start
+                self._start = (self._start + 1) % self.depth
+            for (name, _), value in zip(self.COLUMNS, row):
+                getattr(self, name)[slot] = value
+        self.total += 1
+
+    def __len__(self):
+        return self._length
+
+    def _slot(self, index):
+        '''Convert a position (0 = oldest retained record) into an array index'''
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Execution trace index out of range")
+        if self.depth is None:
+            return index
+        return (self._start + index) % self.depth
+
+    def _row(self, index):
+        '''Return the append() arguments of a retained record'''
+        slot = self._slot(index)
+        kinds = self.kinds[slot]
+        return (
+            self.pcs[slot], self.instructions[slot],
+            self.registers[slot], self.register_old[slot], self.register_new[slot],
+            self.addresses[slot] if kinds & MEMORY_WRITE else None,
+            self.memory_old[slot], self.memory_new[slot]
+        )
+
+    def __getitem__(self, index):
+        '''Return a retained record as a dict, index 0 is the oldest, -1 the newest'''
+        if index < 0:
+            index += self._length
+        pc, instruction, register, register_old, register_new, address, memory_old, memory_new = self._row(index)
+        record = {
+            'step': self.total - self._length + index,
+            'pc': pc,
+            'instruction': f"0x{instruction:08x}",
+            'register': register or None,
+            'address': address
+        }
+        if register:
+            record.update({'register_old': register_old, 'register_new': register_new})
+        if address is not None:
+            record.update({'memory_old': memory_old, 'memory_new': memory_new})
+        return record
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self[i]
+
+    @property
+    def first_step(self):
+        '''Step number of the oldest record that can still be undone'''
+        return self.total - self._length
+
+    def reconstruct(self, step, pc, registers):
+        '''Rebuild the state as it was after `step` instructions\n
+        Undoes deltas from the newest record back to `step`.\n
+        Parameters:\n
+            step (int): Step number between first_step and total\n
+            pc (int): Current PC\n
+            registers (list): Current register values\n
+        Returns:\n
+            tuple: (pc, register list, {address: word} for memory words that differ from the current memory)\n
+        Raises:\n
+            IndexError: If the step is no longer (or not yet) covered by the trace
+        '''
+        if not self.first_step <= step <= self.total:
+            raise IndexError(f"Step {step} is outside the recorded trace")
+        registers = list(registers)
+        memory = {}
+        for index in range(self._length - 1, step - self.first_step - 1, -1):
+            slot = self._slot(index)
+            kinds = self.kinds[slot]
+            if kinds & REGISTER_WRITE:
+                registers[self.registers[slot]] = self.register_old[slot]
+            if kinds & MEMORY_WRITE:
+                memory[self.addresses[slot]] = self.memory_old[slot]
+            pc = self.pcs[slot]
+        return pc, registers, memory
@@ -0,0 +1,277 @@
+from collections import namedtuple
+from .profiler import counts_redirects, static_target
+
+'''
+    Block Translator Component
+    Compiles basic blocks of the loaded program into Python functions for the SIM component
+'''
+
+# Instructions that end a basic block
+BLOCK_TERMINATORS = {'beq', 'bne', 'j', 'jal', 'jr'}
+
+# Memory accessor used by each load and store
+LOADS = {'lw': 'read_word', 'lh': 'read_half', 'lhu': 'read_half', 'lb': 'read_byte', 'lbu': 'read_byte'}
+STORES = {'sw': 'write_word', 'sh': 'write_half', 'sb': 'write_byte'}
+
+# `function` is None until the block becomes hot, `length` is its instruction count
+Block = namedtuple('Block', ['function', 'length'])
+
+class BlockTranslator:
+    '''
+    Block Translator\n
+    Optional execution engine used by Simulator.execute() when engine='blocks':\n
+    - Basic blocks are discovered from the predecoded table, a branch, j, jal or jr ends a block\n
+    - Once a block has been entered hot_threshold times its straight-line Python code is generated and compiled\n
+    - Compiled blocks are cached by start PC and dropped when instruction memory changes\n
+    - A compiled block branching back to itself is repeated in place without returning to the dispatcher\n
+    - With a profiler attached the blocks also count taken branches, backward jumps and jr targets,
+      the back edge of a block repeating itself is counted once when the loop exits\n
+    - Breakpoint traps end blocks like null instructions, with watchpoints set stores call the watched handlers\n
+    Results are identical to the interpreter, including the PC and step count when a memory access fails.
+    '''
+    def __init__(self, simulator, hot_threshold=2):
+        self.simulator = simulator
+        self.hot_threshold = hot_threshold
+        self.invalidate()
+
+    def invalidate(self):
+        '''Drop all discovered and compiled blocks, their profile counts are flushed first\n
+        Returns:\n
+            None
+        '''
+        if getattr(self, 'counters', None):
+            self.flush_counters()
+        self.counters = []  # (instruction index, redirect counter cell) of each compiled block while profiling
+        self.blocks = {}
+        self.hits = {}
+        self.compiled_blocks = 0
+        self.version = self.simulator.memory.instruction_version
+        # Compiled blocks call the accessors of this memory directly
+        self.memory = self.simulator.memory
+        # and count their redirects in these profiler lists, None when not profiling
+        profiler = self.simulator.profiler
+        self.taken = profiler.taken if profiler is not None else None
+        self.entries = profiler.entries if profiler is not None else None
+
+    def discover(self, pc):
+        '''Find the basic block starting at `pc`\n
+        Parameters:\n
+            pc (int): Start address of the block\n
+        Returns:\n
+            Block: Uncompiled block, length 0 if `pc` holds a null instruction
+        '''
+        table = self.simulator.decoded_instructions
+        index = pc >> 2
+        length = 0
+        while index < len(table):
+            decoded = table[index]
+            if decoded.handler is None:
+                break
+            length += 1
+            if decoded.name in BLOCK_TERMINATORS:
+                break
+            index += 1
+        block = Block(None, length)
+        self.blocks[pc] = block
+        return block
+
+    def compile(self, pc, length):
+        '''Generate and compile the Python function of a block\n
+        Parameters:\n
+            pc (int): Start address of the block\n
+            length (int): Number of instructions in the block\n
+        Returns:\n
+            function: Block function taking (register list, Registers) and returning the PC of the next block
+        '''
+        name = f"block_{pc:08x}"
+        lines = [f"def {name}(r, registers):"]
+        indent = "    "
+        last = pc + (length - 1) * 4
+        terminator = self.simulator.decoded_instructions[last >> 2]
+        # Back edges to the block itself are counted by _repeat()
+        counted = self.taken is not None and counts_redirects(terminator, last) and static_target(terminator) != pc
+        if counted:
+            # The redirect counter lives in a closure cell, flushed into the profiler by flush_counters()
+            lines = ["def make():", "    redirects = 0", f"    def {name}(r, registers):", "        nonlocal redirects"]
+            indent = "        "
+        for offset in range(length):
+            address = pc + offset * 4
+            decoded = self.simulator.decoded_instructions[address >> 2]
+            lines.extend(indent + line for line in self._generate(decoded, address, counted))
+        lines.append(f"{indent}return {(pc + length * 4) & 0xFFFFFFFF}")
+
+        memory = self.memory
+        namespace = {
+            'read_word': memory.read_word, 'write_word': memory.write_word,
+            'read_half': memory.read_half, 'write_half': memory.write_half,
+            'read_byte': memory.read_byte, 'write_byte': memory.write_byte,
+            'entries': self.entries, 'end': self.simulator.program_length * 4
+        }
+        namespace.update(('watched_' + store, handler) for store, handler in self.simulator._watched_stores.items())
+        if not counted:
+            exec(compile("\n".join(lines), f"<{name}>", "exec"), namespace)
+            function = namespace[name]
+        else:
+            lines.append(f"    return {name}")
+            exec(compile("\n".join(lines), f"<{name}>", "exec"), namespace)
+            function = namespace['make']()
+            cell = function.__closure__[function.__code__.co_freevars.index('redirects')]
+            self.counters.append((((pc >> 2) + length - 1), cell))
+        self.blocks[pc] = Block(function, length)
+        self.compiled_blocks += 1
+        return function
+
+    def flush_counters(self):
+        '''Add the redirect counts of the compiled blocks to the profiler and clear them\n
+        Returns:\n
+            None
+        '''
+        for index, cell in self.counters:
+            if cell.cell_contents:
+                self.taken[index] += cell.cell_contents
+                cell.cell_contents = 0
+
+    def _generate(self, decoded, pc, counted):
+        '''Return the source lines implementing one decoded instruction'''
+        name, a, b, c = decoded.name, decoded.a, decoded.b, decoded.c
+        if decoded.handler == self.simulator._op_nop:
+            return []
+        if name == 'add':
+            return [f"r[{a}] = (r[{b}] + r[{c}]) & 0xFFFFFFFF"]
+        if name == 'sub':
+            return [f"r[{a}] = (r[{b}] - r[{c}]) & 0xFFFFFFFF"]
+        if name == 'and':
+            return [f"r[{a}] = r[{b}] & r[{c}]"]
+        if name == 'or':
+            return [f"r[{a}] = r[{b}] | r[{c}]"]
+        if name == 'slt':
+            return [f"r[{a}] = 1 if (r[{b}] ^ 0x80000000) < (r[{c}] ^ 0x80000000) else 0"]
+        if name == 'sll':
+            return [f"r[{a}] = (r[{b}] << {c}) & 0xFFFFFFFF"]
+        if name == 'srl':
+            return [f"r[{a}] = r[{b}] >> {c}"]
+        if name == 'addi':
+            return [f"r[{a}] = (r[{b}] + {c}) & 0xFFFFFFFF"]
+        if name in LOADS:
+            # PC is stored first so a failing access reports the right instruction
+            load = f"{LOADS[name]}((r[{b}] + {c}) & 0xFFFFFFFF)"
+            if not a:
+                return [f"registers.pc = {pc}", load]
+            if name == 'lb':
+                load = f"(({load} ^ 0x80) - 0x80) & 0xFFFFFFFF"
+            elif name == 'lh':
+                load = f"(({load} ^ 0x8000) - 0x8000) & 0xFFFFFFFF"
+            return [f"registers.pc = {pc}", f"r[{a}] = {load}"]
+        if name in STORES:
+            if self.simulator.watchpoints:
+                return [f"registers.pc = {pc}", f"watched_{name}({a}, {b}, {c})"]
+            return [f"registers.pc = {pc}", f"{STORES[name]}((r[{b}] + {c}) & 0xFFFFFFFF, r[{a}])"]
+        # While profiling redirects are counted like the branches of the predecoded table
+        count = ["redirects += 1"] if counted else []
+        if name == 'beq':
+            return [f"if r[{a}] == r[{b}]:"] + ["    " + line for line in count] + [f"    return {c}"]
+        if name == 'bne':
+            return [f"if r[{a}] != r[{b}]:"] + ["    " + line for line in count] + [f"    return {c}"]
+        if name == 'j':
+            return count + [f"return {a}"]
+        if name == 'jal':
+            return count + [f"r[31] = {b}", f"return {a}"]
+        if name == 'jr':
+            if self.entries is not None:
+                return [f"target = r[{a}]", "if target < end:", "    entries[target >> 2] += 1", "return target"]
+            return [f"return r[{a}]"]
+        raise ValueError(f"Cannot translate instruction: {name}")
+
+    def execute(self, max_instructions):
+        '''Execute up to max_instructions, same contract as the interpreter loop of Simulator.execute()\n
+        Returns:\n
+            tuple: (status, instructions executed)
+        '''
+        simulator = self.simulator
+        profiler = simulator.profiler
+        if (self.version != simulator.memory.instruction_version or self.memory is not simulator.memory
+                or self.taken is not (profiler.taken if profiler is not None else None)):
+            self.invalidate()
+
+        registers = simulator.registers
+        r = registers.registers
+        blocks = self.blocks
+        end = simulator.program_length * 4
+        pc = registers.pc
+        count = 0
+        status = 'running'
+
+        while count < max_instructions:
+            if pc >= end:
+                status = 'completed'
+                break
+            block = blocks.get(pc)
+            if block is None:
+                block = self.discover(pc)
+            function, length = block
+            if length == 0:
+                status = 'halted'
+                break
+
+            if function is None:
+                hits = self.hits.get(pc, 0) + 1
+                self.hits[pc] = hits
+                if hits >= self.hot_threshold:
+                    function = self.compile(pc, length)
+
+            if function is None or length > max_instructions - count:
+                # Cold block or not enough budget left, interpret it
+                registers.pc = pc
+                status, executed = simulator._execute_fast(min(length, max_instructions - count))
+                count += executed
+                pc = registers.pc
+                if status != 'running':
+                    break
+                continue
+
+            try:
+                next_pc = function(r, registers)
+            except Exception:
+                # registers.pc holds the failing instruction
+                executed = (registers.pc - pc) >> 2
+                simulator.steps_executed += executed
+                simulator.current_pc = registers.pc
+                raise
+            simulator.steps_executed += length
+            count += length
+            if next_pc == pc:
+                next_pc, executed = self._repeat(function, pc, length, max_instructions - count)
+                count += executed
+            pc = next_pc
+
+        registers.pc = simulator.current_pc = pc
+        return status, count
+
+    def _repeat(self, function, pc, length, budget):
+        '''Run a compiled block that branched back to itself until it exits or the budget is used\n
+        Returns:\n
+            tuple: (next PC, instructions executed)
+        '''
+        simulator = self.simulator
+        registers = simulator.registers
+        r = registers.registers
+        limit = budget // length
+        loops = 0
+        target = pc
+        try:
+            while loops < limit:
+                target = function(r, registers)
+                loops += 1
+                if target != pc:
+                    break
+        except Exception:
+            # registers.pc holds the failing instruction
+            simulator.steps_executed += loops * length + ((registers.pc - pc) >> 2)
+            simulator.current_pc = registers.pc
+            raise
+        finally:
+            if self.taken is not None:
+                # The branch back that started the loop and every iteration but an exit
+                self.taken[(pc >> 2) + length - 1] += loops + 1 if target == pc else loops
+        simulator.steps_executed += loops * length
+        return target, loops * length
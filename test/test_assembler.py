@@ -0,0 +1,147 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.assembler import Assembler
+from sim.simulator import Simulator
+from sim.profiler import source_lines
+import unittest as ut
+
+class AssemblerTest(ut.TestCase):
+    def setUp(self):
+        self.assembler = Assembler(cache_size=2)
+        self.test_program = """
+        start:
+        addi $s0, $zero, 5    # s0 = 5
+        beq $s0, $zero, start
+        j start
+        """
+        
+    def test_cache_hit(self):
+        machine_code = self.assembler.assemble(self.test_program)
+        translations = self.assembler.get_translations('hex')
+        
+        # Same program with different comments and spacing
+        edited = self.test_program.replace('# s0 = 5', '# five') + "\n\n   # trailing comment\n"
+        self.assertEqual(self.assembler.assemble(edited), machine_code)
+        self.assertEqual(self.assembler.get_translations('hex'), translations)
+        self.assertEqual(self.assembler.labels, {'start': 0})
+        self.assertEqual(self.assembler.cache.info(), {'hits': 1, 'misses': 1, 'entries': 1, 'size': 2})
+        
+        print('Successful test: ASSEMBLY CACHE (Hit)')
+        
+    def test_cache_eviction(self):
+        programs = ["addi $s0, $zero, 1", "addi $s0, $zero, 2", "addi $s0, $zero, 3"]
+        for program in programs:
+            self.assembler.assemble(program)
+        self.assembler.assemble(programs[2])
+        self.assembler.assemble(programs[0])
+        self.assertEqual(self.assembler.cache.hits, 1)
+        self.assertEqual(self.assembler.cache.misses, 4)
+        
+        print('Successful test: ASSEMBLY CACHE (Eviction)')
+        
+    def test_cache_disabled(self):
+        assembler = Assembler(cache_size=0)
+        assembler.assemble(self.test_program)
+        assembler.assemble(self.test_program)
+        self.assertEqual(assembler.cache.info()['entries'], 0)
+        
+        print('Successful test: ASSEMBLY CACHE (Disabled)')
+        
+    def test_errors_not_cached(self):
+        self.assertRaises(ValueError, self.assembler.assemble, "addi $s0, $zero, 1\nj missing")
+        self.assertRaises(ValueError, self.assembler.assemble, "addi $s0, $zero, 1\nj missing")
+        self.assertEqual(self.assembler.cache.info()['entries'], 0)
+        
+        print('Successful test: ASSEMBLY CACHE (Errors)')
+        
+    def _large_program(self, blocks):
+        lines = []
+        for i in range(blocks):
+            lines += [f"block{i}:", f"addi $t0, $t0, {i % 100}", f"beq $t0, $zero, block{i}",
+                      f"bne $t0, $zero, block{(i + 1) % blocks}", "j block0"]
+        return lines
+        
+    def _check_incremental(self, assembler, lines):
+        fresh = Assembler(cache_size=0)
+        self.assertEqual(assembler.assemble(lines), fresh.assemble(lines))
+        self.assertEqual(assembler.labels, fresh.labels)
+        self.assertEqual(assembler.get_translations('hex'), fresh.get_translations('hex'))
+        
+    def test_incremental_reassembly(self):
+        assembler = Assembler(cache_size=0)
+        lines = self._large_program(750)
+        assembler.assemble(lines)
+        self.assertEqual(assembler.last_encoded, 3000)
+        
+        # Editing one line re-encodes only that line
+        lines[1501] = "addi $t0, $t0, 7"
+        self._check_incremental(assembler, lines)
+        self.assertEqual(assembler.last_encoded, 1)
+        
+        # Inserting a line re-encodes it and the label users whose offsets moved
+        lines.insert(1500, "add $t1, $t1, $t2")
+        self._check_incremental(assembler, lines)
+        self.assertLess(assembler.last_encoded, 10)
+        
+        # Deleting it again
+        del lines[1500]
+        self._check_incremental(assembler, lines)
+        self.assertLess(assembler.last_encoded, 10)
+        
+        # Inserting at the start moves every label used by a jump
+        lines.insert(0, "add $t1, $t1, $t2")
+        self._check_incremental(assembler, lines)
+        
+        print('Successful test: INCREMENTAL REASSEMBLY')
+        
+    def test_incremental_errors(self):
+        assembler = Assembler(cache_size=0)
+        lines = self._large_program(10)
+        assembler.assemble(lines)
+        
+        # A failed assembly leaves the previous result as the base of the next one
+        broken = lines[:4] + ["j missing"] + lines[4:]
+        self.assertRaises(ValueError, assembler.assemble, broken)
+        del lines[0]  # Drops label block0
+        self.assertRaises(ValueError, assembler.assemble, lines)
+        lines.insert(0, "block0:")
+        self._check_incremental(assembler, lines)
+        
+        print('Successful test: INCREMENTAL REASSEMBLY (Errors)')
+        
+    def test_tokenizer(self):
+        assembler = Assembler(cache_size=0)
+        # Commas are optional, offsets may be hex or missing
+        self.assertEqual(assembler.assemble("add $t0 $t1 $t2"), assembler.assemble("add $t0, $t1, $t2"))
+        self.assertEqual(assembler.assemble("lw $t0, -0x10($sp)\nsw $t0, ($sp)"), [0x8fa8fff0, 0xafa80000])
+        self.assertEqual(assembler.assemble("addi $t0, $zero, end\nend: sll $t1, $t0, 2 # comment"), [0x20080004, 0x00084880])
+        
+        self.assertRaises(SyntaxError, assembler.assemble, "bad-label: add $t0, $t1, $t2")
+        self.assertRaises(SyntaxError, assembler.assemble, "add $t0, $t1, $t2 + 1")
+        for source in ["foo $t0", "add $t0, $t1", "add $t0, $t1, $t2, $t3", "lw $t0, 4($sp", "add $t0, $t1, $x9", "beq $t0, $t1, $t2"]:
+            with self.assertRaises(ValueError, msg=source):
+                assembler.assemble(source)
+        
+        print('Successful test: ASSEMBLER (Tokenizer)')
+
+    def test_symbols(self):
+        # Machine code assembled elsewhere, e.g. by the editor's background worker
+        source = "addi $t0, $zero, 2\n\nloop:\naddi $t0, $t0, -1\nbne $t0, $zero, loop"
+        worker = Assembler()
+        machine_code = worker.assemble(source)
+        worker.assemble(source)  # Cache hit, line numbers computed on demand
+        symbols = worker.get_symbols()
+        worker.assemble("add $t0, $t1, $t2")  # The next job does not change the taken symbols
+
+        simulator = Simulator()
+        simulator.load_machine_code(machine_code)
+        simulator.assembler.set_symbols(symbols)
+        self.assertEqual(simulator.add_breakpoint('loop'), 4)
+        self.assertEqual(source_lines(simulator), [(1, 'addi $t0, $zero, 2'), (4, 'addi $t0, $t0, -1'),
+                                                   (5, 'bne $t0, $zero, loop')])
+
+        print('Successful test: ASSEMBLER (Symbols)')
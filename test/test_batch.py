@@ -0,0 +1,80 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+from sim.memory import Memory
+from sim.batch import BatchSimulator, np
+import unittest as ut
+
+@ut.skipIf(np is None, "NumPy is not installed")
+class BatchSimulatorTest(ut.TestCase):
+    def setUp(self):
+        # Sum 1..$a0 with a data-dependent trip count, bytes and halfwords on the stack
+        self.test_sum = """
+        addi $sp, $sp, -8
+        loop:
+        beq $a0, $zero, done
+        add $v0, $v0, $a0
+        addi $a0, $a0, -1
+        slt $t0, $a0, $a1
+        bne $t0, $zero, loop
+        sw $v0, 0($gp)
+        j loop
+        done:
+        sw $v0, 0($sp)
+        sb $a0, 5($sp)
+        sh $v0, 6($sp)
+        lb $s0, 0($sp)
+        lhu $s1, 6($sp)
+        lw $s2, 0($gp)
+        srl $s3, $v0, 1
+        addi $sp, $sp, 8
+        """
+        self.inputs = [(0, 0), (1, 0), (5, 3), (10, 0), (200, 150), (-3, 1)]
+        
+    def _reference(self, a0, a1, max_instructions=1000000):
+        simulator = Simulator(history_depth=0)
+        simulator.load(self.test_sum)
+        simulator.registers.write_register(4, a0)
+        simulator.registers.write_register(5, a1)
+        status, count = simulator.execute(max_instructions)
+        return status, count, simulator
+        
+    def test_lockstep_matches_simulator(self):
+        batch = BatchSimulator(len(self.inputs))
+        batch.load(self.test_sum)
+        batch.set_register(4, [a0 for a0, _ in self.inputs])
+        batch.set_register(5, [a1 for _, a1 in self.inputs])
+        results = batch.run(max_instructions=5000)
+        
+        # Every lane ends exactly like its own Simulator, the last one hits the limit
+        for (a0, a1), result in zip(self.inputs, results):
+            status, count, reference = self._reference(a0, a1, 5000)
+            self.assertEqual(result['status'], 'limit' if status == 'running' else status)
+            self.assertEqual(result['instructions_executed'], count)
+            self.assertEqual(result['pc'], reference.registers.pc)
+            self.assertEqual(result['registers'], reference.get_register_state(label=True))
+            self.assertEqual(result['memory'], dict(reference.memory.read_data_memory()))
+        self.assertEqual(results[-1]['status'], 'limit')
+        
+        print('Successful test: BATCH (Lockstep)')
+        
+    def test_memory_faults(self):
+        batch = BatchSimulator(3)
+        batch.load("lw $s0, 0($t0)\naddi $s1, $zero, 1")
+        batch.set_register(8, [Memory.GLOBAL_POINTER, Memory.GLOBAL_POINTER + 2, 0x20000000])
+        batch.write_word(Memory.GLOBAL_POINTER, [7, 8, 9])
+        results = batch.run()
+        
+        self.assertEqual([r['status'] for r in results], ['completed', 'error', 'error'])
+        self.assertEqual(results[0]['registers']['$s0'], 7)
+        self.assertIn('Unaligned', results[1]['message'])
+        self.assertIn('outside', results[2]['message'])
+        self.assertEqual(results[2]['pc'], 0)
+        self.assertEqual(results[2]['instructions_executed'], 0)
+        self.assertEqual(list(batch.read_word(Memory.GLOBAL_POINTER)), [7, 8, 9])
+        
+        print('Successful test: BATCH (Faults)')
@@ -0,0 +1,165 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+from sim.memory import Memory
+import unittest as ut
+
+class BreakpointTest(ut.TestCase):
+    def setUp(self):
+        # Stores 5..1 into consecutive words at $gp and sums them in $s0
+        self.test_sweep = """
+        addi $t0, $zero, 5
+        addi $t1, $gp, 0
+        loop:
+        sw $t0, 0($t1)
+        add $s0, $s0, $t0
+        addi $t1, $t1, 4
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        done:
+        addi $s1, $zero, 1
+        """
+        self.reference = Simulator()
+        self.reference.load(self.test_sweep)
+        self.reference.run(fast=True)
+
+    def assertSameResult(self, simulator):
+        self.assertEqual(simulator.registers.registers, self.reference.registers.registers)
+        self.assertEqual(simulator.steps_executed, self.reference.steps_executed)
+        self.assertEqual(dict(simulator.memory.read_data_memory()), dict(self.reference.memory.read_data_memory()))
+
+    def test_breakpoints(self):
+        for engine in ('interpreter', 'blocks'):
+            simulator = Simulator(engine=engine, checkpoint_interval=4)
+            simulator.translator.hot_threshold = 1
+            simulator.load(self.test_sweep)
+            self.assertEqual(simulator.add_breakpoint('loop'), 8)
+            counters = []
+            while True:
+                result = simulator.run(fast=True)
+                if result['status'] != 'breakpoint':
+                    break
+                self.assertEqual(simulator.registers.pc, 8)
+                self.assertEqual(result['stop_reason'], {'type': 'breakpoint', 'pc': 8})
+                counters.append(simulator.registers.registers[8])
+            self.assertEqual(counters, [5, 4, 3, 2, 1])
+            self.assertEqual(result['status'], 'completed')
+            self.assertSameResult(simulator)
+
+            # Checkpoints taken around the stops still replay to the same state
+            self.assertEqual(simulator.seek(7)['step'], 7)
+            self.assertEqual(simulator.registers.registers[8], 4)
+
+            self.assertTrue(simulator.remove_breakpoint(8))
+            self.assertFalse(simulator.remove_breakpoint('loop'))
+            simulator.load(self.test_sweep)
+            self.assertEqual(simulator.run(fast=True)['status'], 'completed')
+
+        print('Successful test: BREAKPOINTS (Breakpoints)')
+
+    def test_conditions(self):
+        simulator = Simulator()
+        simulator.load(self.test_sweep)
+        simulator.add_breakpoint('loop', {'$t0': 2})
+        simulator.add_breakpoint(28, lambda simulator: simulator.registers.registers[16] == 15)
+        result = simulator.run(fast=True)
+        self.assertEqual((result['status'], simulator.registers.registers[8]), ('breakpoint', 2))
+        result = simulator.run(fast=True)
+        self.assertEqual((result['status'], simulator.registers.pc), ('breakpoint', 28))
+        self.assertEqual(simulator.run(fast=True)['status'], 'completed')
+        self.assertSameResult(simulator)
+
+        with self.assertRaises(ValueError):
+            simulator.add_breakpoint('missing')
+        with self.assertRaises(ValueError):
+            simulator.add_breakpoint(6)
+        with self.assertRaises(ValueError):
+            simulator.add_breakpoint(8, {'$x9': 0})
+
+        print('Successful test: BREAKPOINTS (Conditions)')
+
+    def test_going_back(self):
+        # A breakpoint reached again after going back stops again, whether history or a checkpoint is used
+        for fast in (True, False):
+            simulator = Simulator(checkpoint_interval=4)
+            simulator.load(self.test_sweep)
+            simulator.add_breakpoint('done')
+            self.assertEqual(simulator.run(fast=fast)['status'], 'breakpoint')
+            stop = (simulator.registers.pc, simulator.steps_executed)
+            self.assertEqual(stop, (28, 27))
+
+            simulator.seek(0)
+            self.assertEqual(simulator.run(fast=fast)['status'], 'breakpoint')
+            self.assertEqual((simulator.registers.pc, simulator.steps_executed), stop)
+            simulator.step_back()
+            self.assertEqual(simulator.run(fast=fast)['status'], 'breakpoint')
+            self.assertEqual((simulator.registers.pc, simulator.steps_executed), stop)
+            self.assertEqual(simulator.run(fast=fast)['status'], 'completed')
+
+        print('Successful test: BREAKPOINTS (Going Back)')
+
+    def test_watchpoints(self):
+        target = Memory.GLOBAL_POINTER + 8
+        for engine in ('interpreter', 'blocks'):
+            simulator = Simulator(engine=engine)
+            simulator.translator.hot_threshold = 1
+            simulator.load(self.test_sweep)
+            simulator.add_watchpoint(target + 2, 1)
+            result = simulator.run(fast=True)
+            self.assertEqual(result['status'], 'watchpoint')
+            # The store completed, the run stopped right after it
+            self.assertEqual(simulator.registers.pc, 12)
+            self.assertEqual(simulator.memory.read_word(target), 3)
+            self.assertEqual(result['stop_reason'], {'type': 'watchpoint', 'pc': 8, 'address': target, 'size': 4, 'value': 3})
+            self.assertEqual(simulator.steps_executed, 2 + 5 * 2 + 1)
+
+            self.assertEqual(simulator.run(fast=True)['status'], 'completed')
+            self.assertSameResult(simulator)
+            self.assertTrue(simulator.remove_watchpoint(target + 2, 1))
+            self.assertFalse(simulator.watchpoints)
+
+        with self.assertRaises(ValueError):
+            simulator.add_watchpoint(target, 0)
+
+        print('Successful test: BREAKPOINTS (Watchpoints)')
+
+    def test_models_and_stepping(self):
+        # Models and the profiler see every instruction once, however often the run stops
+        simulator = Simulator()
+        simulator.load(self.test_sweep)
+        profiler = simulator.enable_profiler()
+        pipeline = simulator.enable_pipeline()
+        simulator.add_breakpoint('loop')
+        simulator.add_watchpoint(Memory.GLOBAL_POINTER + 4)
+        statuses = []
+        while True:
+            status = simulator.run(fast=True)['status']
+            statuses.append(status)
+            if status == 'completed':
+                break
+        self.assertEqual(statuses.count('breakpoint'), 5)
+        self.assertEqual(statuses.count('watchpoint'), 1)
+        self.assertSameResult(simulator)
+        self.assertEqual(pipeline.instructions, self.reference.steps_executed)
+        self.assertEqual(sum(profiler.hits()), self.reference.steps_executed)
+
+        # The detailed run stops at the same places, step() executes the instruction under a breakpoint
+        simulator = Simulator()
+        simulator.load(self.test_sweep)
+        simulator.add_breakpoint('done')
+        simulator.add_watchpoint(Memory.GLOBAL_POINTER)
+        result = simulator.run()
+        self.assertEqual((result['status'], simulator.registers.pc), ('watchpoint', 12))
+        result = simulator.run()
+        self.assertEqual((result['status'], simulator.registers.pc), ('breakpoint', 28))
+        self.assertEqual(simulator.step()['pc'], 32)
+        self.assertSameResult(simulator)
+
+        print('Successful test: BREAKPOINTS (Models and Stepping)')
+
+if __name__ == '__main__':
+    ut.main()
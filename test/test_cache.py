@@ -0,0 +1,115 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class CacheTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        # Two words 64 bytes apart, read alternately
+        self.test_conflict = """
+        addi $t0, $zero, 10
+        loop:
+        lw $s0, 0($gp)
+        lw $s1, 64($gp)
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        """
+        # 16 consecutive words
+        self.test_sweep = """
+        addi $t0, $zero, 16
+        addi $t1, $gp, 0
+        loop:
+        sw $t0, 0($t1)
+        addi $t1, $t1, 4
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        """
+
+    def run_cached(self, program, **options):
+        self.simulator.load(program)
+        cache = self.simulator.enable_cache(**options)
+        self.simulator.run(fast=True)
+        return cache
+
+    def test_associativity(self):
+        statistics = self.run_cached(self.test_conflict, size=64, line_size=16).statistics()
+        self.assertEqual((statistics['hits'], statistics['misses'], statistics['evictions']), (0, 20, 19))
+
+        cache = self.run_cached(self.test_conflict, size=128, line_size=16, associativity=2)
+        statistics = cache.statistics()
+        self.assertEqual((statistics['hits'], statistics['misses'], statistics['evictions']), (18, 2, 0))
+        self.assertAlmostEqual(statistics['hit_rate'], 0.9)
+        rows = cache.instruction_statistics()
+        self.assertEqual([(row['pc'], row['hits'], row['misses']) for row in rows], [(4, 9, 1), (8, 9, 1)])
+        self.assertEqual(rows[1]['source'], 'lw $s1, 64($gp)')
+
+        with self.assertRaises(ValueError):
+            self.simulator.enable_cache(size=96)
+        with self.assertRaises(ValueError):
+            self.simulator.enable_cache(policy='MRU')
+
+        print('Successful test: CACHE (Associativity)')
+
+    def test_policies(self):
+        self.simulator.load(self.test_conflict)
+        a, b, c = 0x000, 0x100, 0x200
+        hits = {}
+        for policy in ('LRU', 'FIFO'):
+            cache = self.simulator.enable_cache(size=32, line_size=16, associativity=2, policy=policy)
+            hits[policy] = [cache.access(address, False, 0) for address in (a, b, a, c, a)]
+        self.assertEqual(hits['LRU'], [False, False, True, False, True])
+        self.assertEqual(hits['FIFO'], [False, False, True, False, False])
+
+        # Random replacement is reproducible through its seed
+        runs = []
+        for _ in range(2):
+            cache = self.simulator.enable_cache(size=64, line_size=16, associativity=4, policy='random', seed=7)
+            runs.append([cache.access(address * 16, False, 0) for address in (0, 1, 2, 3, 4, 0, 1, 2, 3, 4)])
+        self.assertEqual(runs[0], runs[1])
+
+        print('Successful test: CACHE (Policies)')
+
+    def test_write_policies(self):
+        statistics = self.run_cached(self.test_sweep, size=64, line_size=16).statistics()
+        # One miss per 4-word line, the stores allocate and dirty the lines
+        self.assertEqual((statistics['hits'], statistics['misses']), (12, 4))
+        self.assertEqual((statistics['memory_reads'], statistics['memory_writes']), (4, 0))
+        self.assertEqual(len(self.simulator.cache.dirty), 4)
+
+        statistics = self.run_cached(self.test_sweep + "lw $s0, 64($gp)", size=64, line_size=16).statistics()
+        self.assertEqual((statistics['evictions'], statistics['writebacks']), (1, 1))
+
+        statistics = self.run_cached(self.test_sweep, size=64, line_size=16, write_back=False).statistics()
+        self.assertEqual((statistics['hits'], statistics['misses']), (0, 16))
+        self.assertEqual((statistics['memory_reads'], statistics['memory_writes']), (0, 16))
+
+        print('Successful test: CACHE (Write Policies)')
+
+    def test_architectural_results(self):
+        reference = Simulator()
+        reference.load(self.test_sweep)
+        reference.run(fast=True)
+
+        cache = self.run_cached(self.test_sweep)
+        statistics = cache.statistics()
+        self.assertEqual(self.simulator.registers.registers, reference.registers.registers)
+        self.assertEqual(dict(self.simulator.memory.read_data_memory()), dict(reference.memory.read_data_memory()))
+        self.assertIn('Hit rate', cache.report())
+
+        # Stepping feeds the same accesses, detaching restores the plain loop
+        self.simulator.load(self.test_sweep)
+        while self.simulator.step()['status'] == 'running':
+            pass
+        self.assertEqual(cache.statistics(), statistics)
+        self.assertIs(self.simulator.disable_cache(), cache)
+        self.assertEqual(self.simulator.hooks, [])
+
+        print('Successful test: CACHE (Architectural Results)')
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,65 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.cli import main, run_file
+import unittest as ut
+
+class CommandLineTest(ut.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.test_infinite = os.path.join(self.directory.name, 'infinite.asm')
+        self.test_invalid = os.path.join(self.directory.name, 'invalid.asm')
+        with open(self.test_infinite, 'w') as f:
+            f.write("loop:\naddi $s0, $s0, 1\nj loop\n")
+        with open(self.test_invalid, 'w') as f:
+            f.write("addi $s0, $zero, 1\nj missing\n")
+        
+    def tearDown(self):
+        self.directory.cleanup()
+        
+    def test_run_file(self):
+        result = run_file('./test/bin/demo.asm')
+        self.assertEqual(result['status'], 'completed')
+        self.assertEqual(result['registers']['$t8'], 20)
+        json.dumps(result)
+        
+        result = run_file(self.test_infinite, max_instructions=1000)
+        self.assertEqual(result['status'], 'limit')
+        self.assertEqual(result['registers']['$s0'], 500)
+        
+        result = run_file(self.test_infinite, max_instructions=10 ** 9, timeout=0.05)
+        self.assertEqual(result['status'], 'timeout')
+        
+        self.assertEqual(run_file(self.test_invalid)['status'], 'error')
+        
+        print('Successful test: CLI (Run File)')
+        
+    def test_batch(self):
+        output = io.StringIO()
+        pattern = os.path.join(self.directory.name, '*.asm')
+        exit_code = main(['./test/bin/demo.asm', pattern, '-n', '1000', '-j', '2'], stdout=output)
+        results = {os.path.basename(r['file']): r for r in map(json.loads, output.getvalue().splitlines())}
+        
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(set(results), {'demo.asm', 'infinite.asm', 'invalid.asm'})
+        self.assertEqual(results['demo.asm']['status'], 'completed')
+        self.assertEqual(results['infinite.asm']['status'], 'limit')
+        self.assertEqual(results['invalid.asm']['status'], 'error')
+        
+        print('Successful test: CLI (Batch)')
+        
+    def test_module_without_gui(self):
+        code = "import sys, sim.cli; sim.cli.main(['./test/bin/demo.asm']); print('PyQt5' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', code], cwd=root_dir, capture_output=True, text=True).stdout
+        lines = output.splitlines()
+        self.assertEqual(json.loads(lines[0])['status'], 'completed')
+        self.assertEqual(lines[1], 'False')
+        
+        print('Successful test: CLI (No GUI)')
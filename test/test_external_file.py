@@ -5,6 +5,7 @@ root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(root_dir)
 
 from sim.simulator import Simulator
+from sim.assembler import Assembler
 import unittest as ut
 
 class FullExecution(ut.TestCase):
@@ -13,4 +14,41 @@ class FullExecution(ut.TestCase):
         self.simulator.load_from_file('./test/bin/demo.asm')
         self.simulator.run()
         
-        print('Successful test: EXTERNAL FILE LOADING')
\ No newline at end of file
+        print('Successful test: EXTERNAL FILE LOADING')
+        
+    def test_predecoded_matches_raw_execution(self):
+        decoded = Simulator()
+        decoded.load_from_file('./test/bin/demo.asm')
+        decoded.run()
+        
+        raw = Simulator()
+        raw.load_from_file('./test/bin/demo.asm')
+        while raw.registers.pc < raw.program_length * 4:
+            instruction = raw.memory.get_instruction(raw.registers.pc)
+            if raw.execute_instruction(instruction):
+                raw.registers.pc += 4
+        
+        self.assertEqual(decoded.registers.registers, raw.registers.registers)
+        self.assertEqual(dict(decoded.memory.read_data_memory()), dict(raw.memory.read_data_memory()))
+        self.assertEqual(decoded.get_register_state(label=True)['$t8'], 20)
+        
+        print('Successful test: PREDECODED EXECUTION')
+        
+    def test_load_machine_code(self):
+        assembler = Assembler()
+        with open('./test/bin/demo.asm', 'r') as f:
+            machine_code = assembler.assemble(f.read())
+        
+        # Program assembled by a separate Assembler, as the editor does in the background
+        preassembled = Simulator()
+        preassembled.load_machine_code(machine_code)
+        preassembled.run(fast=True)
+        
+        reference = Simulator()
+        reference.load_from_file('./test/bin/demo.asm')
+        reference.run(fast=True)
+        
+        self.assertEqual(preassembled.registers.registers, reference.registers.registers)
+        self.assertEqual(dict(preassembled.memory.read_data_memory()), dict(reference.memory.read_data_memory()))
+        
+        print('Successful test: PREASSEMBLED LOADING')
@@ -0,0 +1,52 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class FastRunTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        self.test_loop = """
+        addi $t0, $zero, 50   # t0 = 50
+        loop:
+        addi $s0, $s0, 3      # s0 += 3
+        sw $s0, 4($zero)      # memory[4] = s0
+        lw $s1, 4($zero)      # s1 = memory[4]
+        addi $t0, $t0, -1     # t0 -= 1
+        bne $t0, $zero, loop
+        """
+        self.test_infinite = """
+        loop:
+        addi $s0, $s0, 1
+        j loop
+        """
+        
+    def test_fast_matches_detailed(self):
+        self.simulator.load(self.test_loop)
+        detailed = self.simulator.run()
+        detailed_registers = list(self.simulator.registers.registers)
+        detailed_data = dict(self.simulator.memory.read_data_memory())
+        
+        self.simulator.load(self.test_loop)
+        fast = self.simulator.run(fast=True)
+        self.assertEqual(fast['status'], 'completed')
+        self.assertEqual(fast['instructions_executed'], detailed['instructions_executed'])
+        self.assertEqual(self.simulator.registers.registers, detailed_registers)
+        self.assertEqual(dict(self.simulator.memory.read_data_memory()), detailed_data)
+        self.assertNotIn('execution_results', fast)
+        self.assertEqual(len(self.simulator.execution_history), 0)
+        
+        print('Successful test: FAST RUN')
+        
+    def test_fast_instruction_limit(self):
+        self.simulator.load(self.test_infinite)
+        result = self.simulator.run(fast=True, max_instructions=1000)
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(result['instructions_executed'], 1000)
+        self.assertEqual(result['final_state']['registers'][16], 500)
+        
+        print('Successful test: FAST RUN (Instruction Limit)')
@@ -0,0 +1,92 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class ExecutionHistoryTest(ut.TestCase):
+    def setUp(self):
+        self.test_program = """
+        addi $s0, $zero, 1
+        addi $s1, $zero, 2
+        addi $s2, $zero, 3
+        addi $s3, $zero, 4
+        addi $s4, $zero, 5
+        """
+        
+    def run_steps(self, simulator, count):
+        simulator.load(self.test_program)
+        for _ in range(count):
+            simulator.step()
+        
+    def test_unlimited_history(self):
+        simulator = Simulator()
+        self.run_steps(simulator, 5)
+        self.assertEqual(len(simulator.execution_history), 5)
+        
+        print('Successful test: HISTORY (Unlimited)')
+        
+    def test_ring_buffer_history(self):
+        simulator = Simulator(history_depth=2)
+        self.run_steps(simulator, 5)
+        self.assertEqual(len(simulator.execution_history), 2)
+        self.assertEqual([record['pc'] for record in simulator.execution_history], [12, 16])
+        self.assertEqual(simulator.get_state()['history'][-1]['register_new'], 5)
+        
+        print('Successful test: HISTORY (Ring Buffer)')
+        
+    def test_disabled_history(self):
+        simulator = Simulator(history_depth=0)
+        self.run_steps(simulator, 5)
+        self.assertEqual(len(simulator.execution_history), 0)
+        self.assertEqual(simulator.get_register_state()[20], 5)
+        
+        print('Successful test: HISTORY (Disabled)')
+        
+    def test_resize_keeps_latest(self):
+        simulator = Simulator()
+        self.run_steps(simulator, 5)
+        simulator.set_history_depth(3)
+        self.assertEqual([record['pc'] for record in simulator.execution_history], [8, 12, 16])
+        self.assertRaises(ValueError, simulator.set_history_depth, -1)
+        
+        print('Successful test: HISTORY (Resize)')
+        
+    def test_delta_records(self):
+        simulator = Simulator()
+        simulator.load("""
+        addi $t0, $zero, 7
+        sw $t0, 8($zero)
+        addi $t0, $t0, 1
+        """)
+        for _ in range(3):
+            simulator.step()
+        
+        store = simulator.execution_history[1]
+        self.assertEqual(store['register'], None)
+        self.assertEqual((store['address'], store['memory_old'], store['memory_new']), (8, 0, 7))
+        
+        add = simulator.execution_history[2]
+        self.assertEqual((add['register'], add['register_old'], add['register_new']), (8, 7, 8))
+        
+        print('Successful test: HISTORY (Delta Records)')
+        
+    def test_state_reconstruction(self):
+        simulator = Simulator()
+        simulator.load_from_file('./test/bin/demo.asm')
+        snapshots = []
+        while True:
+            snapshots.append((simulator.registers.pc, simulator.get_register_state(), dict(simulator.memory.read_data_memory())))
+            if simulator.step()['status'] != 'running':
+                break
+        
+        for step, (pc, registers, data) in enumerate(snapshots):
+            state = simulator.state_at(step)
+            self.assertEqual(state['pc'], pc)
+            self.assertEqual(state['registers'], registers)
+            self.assertEqual(state['memory']['data'], data)
+        
+        print('Successful test: HISTORY (Reconstruction)')
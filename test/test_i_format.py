@@ -61,6 +61,27 @@ class IFormatInstructionsTest(ut.TestCase):
         skip:
         addi $s3, $zero, 2    # s3 = 2
         """
+        self.test_byte_half = """
+        addi $t0, $zero, -2   # t0 = 0xfffffffe
+        addi $t1, $zero, 1000 # t1 = 0x3e8
+        sb $t0, 5($zero)      # memory[5] = 0xfe
+        sh $t1, 6($zero)      # memory[6..7] = 0x03e8
+        lb $s0, 5($zero)      # s0 = -2
+        lbu $s1, 5($zero)     # s1 = 254
+        sh $t0, 8($zero)      # memory[8..9] = 0xfffe
+        lh $s2, 8($zero)      # s2 = -2
+        lhu $s3, 8($zero)     # s3 = 65534
+        lw $s4, 4($zero)      # s4 = 0x03e8fe00 (little-endian)
+        lhu $s5, 6($zero)     # s5 = 1000
+        """
+        self.test_bne_loop = """
+        addi $t0, $zero, 3    # t0 = 3
+        loop:
+        addi $s0, $s0, 2      # s0 += 2
+        addi $t0, $t0, -1     # t0 -= 1
+        bne $t0, $zero, loop  # should branch backwards twice
+        addi $s1, $zero, 9    # s1 = 9
+        """
         
         
     def test_addi(self):
@@ -195,4 +216,32 @@ class IFormatInstructionsTest(ut.TestCase):
         state = self.simulator.step()
         self.assertEqual(state['state']['registers'][19], 2)
         
-        print('Successful test: BNE (Not Equals)')
\ No newline at end of file
+        print('Successful test: BNE (Not Equals)')
+        
+    def test_bne_loop(self):
+        self.simulator.load(self.test_bne_loop)
+        result = self.simulator.run()
+        self.assertEqual(result['status'], 'completed')
+        self.assertEqual(result['instructions_executed'], 11)
+        
+        registers = self.simulator.get_register_state()
+        self.assertEqual(registers[8], 0)
+        self.assertEqual(registers[16], 6)
+        self.assertEqual(registers[17], 9)
+        
+        print('Successful test: BNE (Backward Loop)')
+        
+    def test_byte_half(self):
+        self.simulator.load(self.test_byte_half)
+        self.simulator.run()
+        
+        registers = self.simulator.get_register_state()
+        self.assertEqual(registers[16], -2)
+        self.assertEqual(registers[17], 254)
+        self.assertEqual(registers[18], -2)
+        self.assertEqual(registers[19], 65534)
+        self.assertEqual(registers[20], 0x03e8fe00)
+        self.assertEqual(registers[21], 1000)
+        self.assertEqual(self.simulator.memory.read_byte(7), 0x03)
+        
+        print('Successful test: LB/LBU/LH/LHU/SB/SH')
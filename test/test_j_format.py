@@ -29,6 +29,12 @@ class RFormatInstructionsTest(ut.TestCase):
         addi $s1, $zero, 3    # s1 = 3 (should be skipped)
         addi $s2, $zero, 7    # s2 = 7
         """
+        self.test_j_target = """
+        j skip
+        addi $s1, $zero, 3    # s1 = 3 (should be skipped)
+        skip:
+        addi $s2, $zero, 7    # s2 = 7
+        """
         
     def test_j(self):
         self.simulator.load(self.test_j)
@@ -83,4 +89,17 @@ class RFormatInstructionsTest(ut.TestCase):
         self.assertEqual(state['state']['registers'][18], 7)
         
         print('Successful test: JR')
-        
\ No newline at end of file
+        
+        
+    def test_j_target(self):
+        self.simulator.load(self.test_j_target)
+        
+        state = self.simulator.step()
+        self.assertEqual(state['pc'], 8)
+        
+        state = self.simulator.step()
+        self.assertEqual(state['status'], 'running')
+        self.assertEqual(state['state']['registers'][17], 0)
+        self.assertEqual(state['state']['registers'][18], 7)
+        
+        print('Successful test: J (Target)')
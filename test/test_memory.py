@@ -0,0 +1,146 @@
+import os
+import sys
+import tempfile
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+from sim.memory import Memory
+import unittest as ut
+
+class MemoryTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        self.test_stack = """
+        addi $sp, $sp, -8     # push two words
+        addi $t0, $zero, 11
+        addi $t1, $zero, 22
+        sw $t0, 0($sp)
+        sw $t1, 4($sp)
+        lw $s0, 4($sp)
+        lw $s1, 0($sp)
+        addi $sp, $sp, 8      # pop
+        sw $t0, 0($gp)
+        """
+        
+    def test_stack_addressing(self):
+        self.simulator.load(self.test_stack)
+        result = self.simulator.run(fast=True)
+        self.assertEqual(result['status'], 'completed')
+        
+        registers = self.simulator.get_register_state(label=True)
+        self.assertEqual(registers['$s0'], 22)
+        self.assertEqual(registers['$s1'], 11)
+        self.assertEqual(registers['$sp'], Memory.STACK_POINTER)
+        self.assertEqual(self.simulator.memory.read_word(Memory.STACK_POINTER - 8), 11)
+        self.assertEqual(self.simulator.memory.read_word(Memory.GLOBAL_POINTER), 11)
+        
+        print('Successful test: MEMORY (Stack)')
+        
+    def test_sparse_pages(self):
+        memory = Memory()
+        self.assertEqual(memory.read_word(0xFFFFFFFC), 0)
+        self.assertEqual(len(memory.pages), 0)
+        
+        memory.write_word(0xFFFFFFFC, 0x123456789)
+        memory.write_word(Memory.DATA_SEGMENT_BASE, 7)
+        memory.write_word(Memory.DATA_SEGMENT_BASE + 4092, 8)
+        self.assertEqual(len(memory.pages), 2)
+        self.assertEqual(memory.read_word(0xFFFFFFFC), 0x23456789)
+        self.assertEqual(dict(memory.read_data_memory()), {
+            Memory.DATA_SEGMENT_BASE: 7, Memory.DATA_SEGMENT_BASE + 4092: 8, 0xFFFFFFFC: 0x23456789
+        })
+        
+        self.assertRaises(ValueError, memory.write_word, 6, 1)
+        self.assertRaises(ValueError, memory.read_word, 0x100000000)
+        
+        print('Successful test: MEMORY (Sparse Pages)')
+        
+    def test_large_program(self):
+        program = "\n".join("addi $s0, $s0, 1" for _ in range(1000))
+        self.simulator.load(program)
+        result = self.simulator.run(fast=True)
+        self.assertEqual(result['instructions_executed'], 1000)
+        self.assertEqual(self.simulator.get_register_state()[16], 1000)
+        
+        print('Successful test: MEMORY (Large Program)')
+        
+    def test_bulk_access(self):
+        memory = Memory()
+        data = bytes(range(256)) * 40  # spans three pages
+        memory.write_bytes(Memory.DATA_SEGMENT_BASE + 4000, data)
+        self.assertEqual(bytes(memory.read_bytes(Memory.DATA_SEGMENT_BASE + 4000, len(data))), data)
+        self.assertEqual(memory.read_word(Memory.DATA_SEGMENT_BASE + 4000), 0x03020100)
+        self.assertEqual(memory.read_half(Memory.DATA_SEGMENT_BASE + 4002), 0x0302)
+        self.assertEqual(memory.read_bytes(0, 4), bytearray(4))
+        self.assertEqual(len(memory.pages[Memory.DATA_SEGMENT_BASE >> 12]), Memory.PAGE_SIZE)
+        
+        snapshot = memory.snapshot()
+        memory.write_word(Memory.DATA_SEGMENT_BASE + 4000, 0)
+        memory.restore(snapshot)
+        self.assertEqual(memory.read_word(Memory.DATA_SEGMENT_BASE + 4000), 0x03020100)
+        
+        print('Successful test: MEMORY (Bulk Access)')
+        
+    def test_data_image(self):
+        image = bytes(range(256)) * 33  # 8 full pages and a partial one
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'input.bin')
+            output = os.path.join(directory, 'output.bin')
+            with open(source, 'wb') as f:
+                f.write(image)
+            
+            self.simulator.load("""
+            lw $t0, 0($gp)
+            addi $t0, $t0, 1
+            sw $t0, 0($gp)
+            lbu $t1, 8300($gp)
+            """)
+            self.assertEqual(self.simulator.load_data_image(source, Memory.GLOBAL_POINTER), len(image))
+            self.assertIn(Memory.GLOBAL_POINTER >> 12, self.simulator.memory.readonly)
+            self.simulator.run(fast=True)
+            
+            registers = self.simulator.get_register_state(label=True)
+            self.assertEqual(registers['$t0'], 0x03020101)
+            self.assertEqual(registers['$t1'], 8300 % 256)
+            self.assertNotIn(Memory.GLOBAL_POINTER >> 12, self.simulator.memory.readonly)
+            
+            self.simulator.dump_data_image(output, Memory.GLOBAL_POINTER)
+            with open(output, 'rb') as f:
+                dumped = f.read()
+            with open(source, 'rb') as f:
+                self.assertEqual(f.read(), image)  # Source file is never written
+            self.assertEqual(dumped, b'\x01' + image[1:])
+            
+            self.simulator.seek(0)
+            self.assertEqual(self.simulator.memory.read_word(Memory.GLOBAL_POINTER), 0x03020100)
+            self.assertRaises(ValueError, self.simulator.load_data_image, source, Memory.GLOBAL_POINTER + 4)
+            self.assertRaises(ValueError, self.simulator.dump_data_image, output, 0)
+        
+        print('Successful test: MEMORY (Data Image)')
+        
+    def test_dirty_tracking(self):
+        self.simulator.load(self.test_stack)
+        # A freshly loaded program needs a full refresh
+        self.assertIsNone(self.simulator.registers.take_dirty())
+        self.assertIsNone(self.simulator.memory.take_dirty())
+        
+        self.simulator.step()
+        self.assertEqual(self.simulator.registers.take_dirty(), {29})
+        self.assertEqual(self.simulator.memory.take_dirty(), set())
+        for _ in range(3):
+            self.simulator.step()
+        self.assertEqual(self.simulator.registers.take_dirty(), {8, 9})
+        self.assertEqual(self.simulator.memory.take_dirty(), {Memory.STACK_POINTER - 8})
+        
+        self.simulator.step_back()
+        self.assertEqual(self.simulator.memory.take_dirty(), {Memory.STACK_POINTER - 8})
+        self.assertEqual(self.simulator.registers.take_dirty(), set())
+        
+        # Unrecorded execution marks everything
+        self.simulator.run(fast=True)
+        self.assertIsNone(self.simulator.registers.take_dirty())
+        self.assertIsNone(self.simulator.memory.take_dirty())
+        
+        print('Successful test: MEMORY (Dirty Tracking)')
@@ -0,0 +1,89 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class PipelineTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        self.test_loop = """
+        addi $t0, $zero, 10
+        loop:
+        lw $s1, 0($gp)
+        add $s0, $s0, $s1     # Load-use
+        sw $s0, 0($gp)
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop  # Reads $t0 right after it is written
+        """
+
+    def timing(self, program, **options):
+        self.simulator.load(program)
+        pipeline = self.simulator.enable_pipeline(**options)
+        self.simulator.run(fast=True)
+        return pipeline.statistics()
+
+    def test_hazards(self):
+        # Four fill cycles plus one per instruction
+        independent = "addi $t0, $zero, 1\naddi $t1, $zero, 2\naddi $t2, $zero, 3"
+        self.assertEqual(self.timing(independent)['cycles'], 7)
+
+        dependent = "addi $t0, $zero, 1\nadd $t1, $t0, $t0"
+        self.assertEqual(self.timing(dependent)['cycles'], 6)
+        statistics = self.timing(dependent, forwarding=False)
+        self.assertEqual(statistics['cycles'], 8)
+        self.assertEqual(statistics['stalls'], {'load_use': 0, 'data': 2, 'control': 0})
+
+        load_use = "lw $t0, 0($gp)\nadd $t1, $t0, $t0"
+        self.assertEqual(self.timing(load_use)['stalls'], {'load_use': 1, 'data': 0, 'control': 0})
+        # Store data is forwarded into MEM
+        load_store = "lw $t0, 0($gp)\nsw $t0, 4($gp)"
+        self.assertEqual(self.timing(load_store)['cycles'], 6)
+
+        print('Successful test: PIPELINE (Hazards)')
+
+    def test_branches(self):
+        statistics = self.timing(self.test_loop)
+        self.assertEqual(statistics['instructions'], 51)
+        self.assertEqual(statistics['stalls'], {'load_use': 10, 'data': 0, 'control': 18})
+        self.assertEqual(statistics['cycles'], 51 + 4 + 10 + 18)
+        self.assertAlmostEqual(statistics['cpi'], 83 / 51)
+
+        # Resolving in ID halves the flush but the branch waits for $t0
+        statistics = self.timing(self.test_loop, branch_stage='ID')
+        self.assertEqual(statistics['stalls'], {'load_use': 10, 'data': 10, 'control': 9})
+
+        rows = self.simulator.pipeline.instruction_stalls()
+        self.assertEqual(rows[2]['source'], 'add $s0, $s0, $s1')
+        self.assertEqual((rows[2]['count'], rows[2]['load_use']), (10, 10))
+        self.assertEqual((rows[5]['data'], rows[5]['control']), (10, 9))
+        self.assertIn('CPI', self.simulator.pipeline.report())
+
+        print('Successful test: PIPELINE (Branches)')
+
+    def test_architectural_results(self):
+        reference = Simulator(engine='blocks')
+        reference.load(self.test_loop)
+        reference.run(fast=True)
+
+        timed = Simulator(engine='blocks')
+        timed.load(self.test_loop)
+        pipeline = timed.enable_pipeline()
+        for _ in range(5):
+            timed.step()
+        timed.run(fast=True)
+        self.assertEqual(timed.registers.registers, reference.registers.registers)
+        self.assertEqual(dict(timed.memory.read_data_memory()), dict(reference.memory.read_data_memory()))
+        # Stepping and running give the same timing
+        self.assertEqual(pipeline.statistics(), self.timing(self.test_loop))
+
+        self.assertIs(timed.disable_pipeline(), pipeline)
+        self.assertEqual(timed.hooks, [])
+
+        print('Successful test: PIPELINE (Architectural Results)')
+
+if __name__ == '__main__':
+    ut.main()
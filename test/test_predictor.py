@@ -0,0 +1,116 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class PredictorTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        # Loop branch taken 9 times, then falls through
+        self.test_loop = """
+        addi $t0, $zero, 10
+        loop:
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        """
+        # beq alternates between not taken and taken
+        self.test_alternating = """
+        addi $t0, $zero, 40
+        addi $t2, $zero, 1
+        loop:
+        sub $t1, $t2, $t1
+        beq $t1, $zero, skip
+        addi $s0, $s0, 1
+        skip:
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        """
+        # The same call site twice: jal, jr and j hit the BTB from their second execution
+        self.test_calls = """
+        addi $t0, $zero, 2
+        loop:
+        jal double
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        j end
+        double:
+        add $v0, $a0, $a0
+        jr $ra
+        end:
+        """
+
+    def run_predicted(self, program, predictor, **options):
+        self.simulator.load(program)
+        model = self.simulator.enable_predictor(predictor, **options)
+        self.simulator.run(fast=True)
+        return model
+
+    def test_direction_predictors(self):
+        mispredictions = {}
+        for predictor in ('not_taken', '1bit', '2bit', 'gshare'):
+            statistics = self.run_predicted(self.test_loop, predictor).statistics()
+            self.assertEqual(statistics['branches'], 10)
+            mispredictions[predictor] = statistics['branch_mispredictions']
+        self.assertEqual(mispredictions['not_taken'], 9)
+        self.assertEqual(mispredictions['1bit'], 2)
+        self.assertEqual(mispredictions['2bit'], 2)
+
+        model = self.run_predicted(self.test_loop, '2bit', branch_penalty=3)
+        row, = model.branch_statistics()
+        self.assertEqual((row['pc'], row['executed'], row['taken'], row['mispredictions']), (8, 10, 9, 2))
+        self.assertAlmostEqual(row['accuracy'], 0.8)
+        self.assertEqual(row['source'], 'bne $t0, $zero, loop')
+        self.assertEqual(model.statistics()['penalty_cycles'], 6)
+
+        with self.assertRaises(ValueError):
+            self.simulator.enable_predictor('perceptron')
+        with self.assertRaises(ValueError):
+            self.simulator.enable_predictor('gshare', table_size=100)
+
+        print('Successful test: PREDICTOR (Direction Predictors)')
+
+    def test_global_history(self):
+        accuracy = {}
+        for predictor in ('2bit', 'gshare'):
+            model = self.run_predicted(self.test_alternating, predictor, table_size=64)
+            accuracy[predictor] = next(row['accuracy'] for row in model.branch_statistics() if row['instruction'] == 'beq')
+        self.assertLessEqual(accuracy['2bit'], 0.5)
+        self.assertGreater(accuracy['gshare'], 0.8)
+
+        print('Successful test: PREDICTOR (Global History)')
+
+    def test_branch_target_buffer(self):
+        model = self.run_predicted(self.test_calls, 'not_taken')
+        statistics = model.statistics()
+        self.assertEqual((statistics['jumps'], statistics['jump_mispredictions']), (5, 3))
+        jumps = {row['instruction']: row for row in model.branch_statistics() if row['taken'] is None}
+        self.assertEqual((jumps['jal']['executed'], jumps['jal']['mispredictions']), (2, 1))
+        self.assertEqual((jumps['jr']['executed'], jumps['jr']['mispredictions']), (2, 1))
+        self.assertEqual((jumps['j']['executed'], jumps['j']['mispredictions']), (1, 1))
+        self.assertEqual(statistics['penalty_cycles'], 3 + 2 * statistics['branch_mispredictions'])
+        self.assertIn('Estimated penalty', model.report())
+
+        print('Successful test: PREDICTOR (Branch Target Buffer)')
+
+    def test_reload(self):
+        model = self.run_predicted(self.test_loop, '1bit')
+        statistics = model.statistics()
+
+        # Reloading starts cold, stepping feeds the same branches
+        self.simulator.load(self.test_loop)
+        self.assertEqual(model.branches, {})
+        while self.simulator.step()['status'] == 'running':
+            pass
+        self.assertEqual(model.statistics(), statistics)
+        self.assertEqual(self.simulator.registers.registers[8], 0)
+        self.assertIs(self.simulator.disable_predictor(), model)
+        self.assertEqual(self.simulator.hooks, [])
+
+        print('Successful test: PREDICTOR (Reload)')
+
+if __name__ == '__main__':
+    ut.main()
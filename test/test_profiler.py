@@ -0,0 +1,141 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class ProfilerTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        # Comments and blank lines shift the source line numbers
+        self.test_loop = """
+        # Sum of 1..10 stored to memory
+        addi $t0, $zero, 10
+        loop:
+        add $s0, $s0, $t0
+        sw $s0, 0($gp)
+        lw $s1, 0($gp)
+
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        jal done
+        done:
+        """
+
+        self.test_calls = """
+        addi $s7, $zero, 3
+        outer:
+        jal f
+        addi $s7, $s7, -1
+        bne $s7, $zero, outer
+        j end
+        f:
+        addi $s0, $s0, 1
+        jr $ra
+        end:
+        """
+
+        # Backward j closes the loop
+        self.test_jumps = """
+        addi $t0, $zero, 3
+        top:
+        addi $t0, $t0, -1
+        beq $t0, $zero, out
+        j top
+        out:
+        """
+
+    def reference_hits(self, program=None):
+        '''Hit counts from stepping a second simulator'''
+        reference = Simulator()
+        reference.load(program or self.test_loop)
+        hits = [0] * reference.program_length
+        while reference.registers.pc < reference.program_length * 4:
+            hits[reference.registers.pc >> 2] += 1
+            reference.step()
+        return hits
+
+    def test_counts(self):
+        self.simulator.load(self.test_loop)
+        profiler = self.simulator.enable_profiler()
+        # Small slices so slice entries and exits land mid-block
+        for _ in range(20):
+            self.simulator.execute(3)
+
+        self.assertEqual(profiler.hits(), self.reference_hits())
+        self.assertEqual(profiler.hits(), [1, 10, 10, 10, 10, 10, 1])
+        self.assertEqual(profiler.opcode_counts(), {'add': 10, 'sw': 10, 'lw': 10, 'addi': 11, 'bne': 10, 'jal': 1})
+        self.assertEqual(profiler.memory_counts(), {'loads': 10, 'stores': 10})
+        self.assertEqual(profiler.branch_counts(), {20: {'taken': 9, 'not_taken': 1}})
+
+        print('Successful test: PROFILER')
+
+    def test_step_and_engines(self):
+        self.simulator.load(self.test_loop)
+        profiler = self.simulator.enable_profiler()
+        for _ in range(7):
+            self.simulator.step()
+        self.simulator.run(fast=True)
+        self.assertEqual(profiler.hits(), self.reference_hits())
+
+        # Cold blocks run through the counting branches of the predecoded table
+        blocks = Simulator(engine='blocks')
+        blocks.load(self.test_loop)
+        profiler = blocks.enable_profiler()
+        blocks.run(fast=True)
+        self.assertEqual(profiler.hits(), self.reference_hits())
+
+        # jr targets and backward jumps are counted at run time by both engines
+        for engine in ('interpreter', 'blocks'):
+            for program in (self.test_calls, self.test_jumps):
+                calls = Simulator(engine=engine)
+                calls.load(program)
+                calls_profiler = calls.enable_profiler()
+                for _ in range(10):
+                    calls.execute(4)
+                self.assertEqual(calls_profiler.hits(), self.reference_hits(program))
+
+        # Reloading clears the counters, disabling stops counting
+        blocks.load(self.test_loop)
+        self.assertEqual(sum(profiler.hits()), 0)
+        self.assertIs(blocks.disable_profiler(), profiler)
+        blocks.run(fast=True)
+        self.assertEqual(sum(profiler.hits()), 0)
+
+        print('Successful test: PROFILER (Step & Engines)')
+
+    def test_report(self):
+        self.simulator.load(self.test_loop)
+        profiler = self.simulator.enable_profiler()
+        self.simulator.run(fast=True)
+
+        spots = profiler.hot_spots(top=2)
+        self.assertEqual([spot['pc'] for spot in spots], [4, 8])
+        self.assertEqual(spots[0]['line'], 5)
+        self.assertEqual(spots[0]['source'], 'add $s0, $s0, $t0')
+        self.assertAlmostEqual(spots[0]['percent'], 100.0 * 10 / 52)
+        report = profiler.report()
+        # Line numbers follow the source after an assembly cache hit with different comments
+        self.simulator.load("# Header\n" + self.test_loop)
+        self.assertEqual(self.simulator.assembler.cache.hits, 1)
+        self.assertEqual(profiler.hot_spots(top=1), [])
+        self.assertEqual(profiler.source_lines()[1], (6, 'add $s0, $s0, $t0'))
+        self.assertIn('Instructions executed: 52', report)
+        self.assertIn('bne $t0, $zero, loop', report)
+
+        # Machine code assembled elsewhere has no source lines
+        machine_code = self.simulator.assembler.assemble(self.test_loop)
+        other = Simulator()
+        other.load_machine_code(machine_code)
+        profiler = other.enable_profiler()
+        other.run(fast=True)
+        self.assertEqual(profiler.hot_spots(top=1)[0]['source'], None)
+        self.assertEqual(profiler.hot_spots(top=1)[0]['instruction'], 'add')
+
+        print('Successful test: PROFILER (Report)')
+
+if __name__ == '__main__':
+    ut.main()
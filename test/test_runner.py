@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+from sim.runner import BackgroundRunner
+import unittest as ut
+
+class BackgroundRunnerTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        self.test_infinite = """
+        loop:
+        addi $s0, $s0, 1
+        j loop
+        """
+        
+    def test_run_to_completion(self):
+        reference = Simulator()
+        reference.load_from_file('./test/bin/demo.asm')
+        expected = reference.run(fast=True)
+        
+        finished = []
+        self.simulator.load_from_file('./test/bin/demo.asm')
+        runner = BackgroundRunner(self.simulator, on_finished=finished.append, slice_size=100)
+        runner.start()
+        self.assertTrue(runner.wait(10))
+        
+        self.assertEqual(finished, [runner.result])
+        self.assertEqual(runner.result['status'], 'completed')
+        self.assertEqual(runner.result['instructions_executed'], expected['instructions_executed'])
+        self.assertEqual(self.simulator.registers.registers, reference.registers.registers)
+        
+        print('Successful test: BACKGROUND RUN')
+        
+    def test_stop_and_progress(self):
+        progress = []
+        self.simulator.load(self.test_infinite)
+        runner = BackgroundRunner(self.simulator, on_progress=progress.append, refresh_rate=50, slice_size=1000)
+        runner.start()
+        time.sleep(0.2)
+        runner.stop()
+        self.assertTrue(runner.wait(10))
+        
+        self.assertEqual(runner.result['status'], 'stopped')
+        self.assertGreater(runner.result['instructions_executed'], 0)
+        self.assertEqual(runner.result['instructions_executed'] % 1000, 0)
+        # Refresh rate caps the callbacks
+        self.assertTrue(1 <= len(progress) <= 15)
+        self.assertEqual(progress[-1]['state']['registers'][16], progress[-1]['steps'] // 2)
+        
+        print('Successful test: BACKGROUND RUN (Stop)')
+        
+    def test_pause_resume(self):
+        progress = []
+        self.simulator.load(self.test_infinite)
+        runner = BackgroundRunner(self.simulator, on_progress=progress.append, slice_size=1000, max_instructions=200000)
+        runner.start()
+        runner.pause()
+        time.sleep(0.05)
+        self.assertTrue(runner.paused)
+        steps = self.simulator.steps_executed
+        time.sleep(0.05)
+        self.assertEqual(self.simulator.steps_executed, steps)
+        self.assertTrue(progress[-1]['paused'])
+        
+        runner.resume()
+        self.assertTrue(runner.wait(10))
+        self.assertEqual(runner.result['status'], 'error')
+        self.assertEqual(runner.result['instructions_executed'], 200000)
+        
+        print('Successful test: BACKGROUND RUN (Pause)')
+
+    def test_snapshot_progress(self):
+        progress = []
+        self.simulator.load(self.test_infinite)
+        runner = BackgroundRunner(self.simulator, on_progress=progress.append, refresh_rate=1000,
+                                  slice_size=1000, max_instructions=20000, copy_state=False)
+        runner.start()
+        self.assertTrue(runner.wait(10))
+
+        snapshot = progress[-1]['snapshot']
+        self.assertNotIn('state', progress[-1])
+        self.assertEqual(snapshot.registers.registers[16], progress[-1]['steps'] // 2)
+        self.assertIsNone(snapshot.registers.take_dirty())
+        self.assertEqual(snapshot.memory.get_instruction(4), self.simulator.memory.get_instruction(4))
+        # The copies do not follow the simulator
+        self.simulator.registers.registers[16] = 0
+        self.assertEqual(snapshot.registers.registers[16], progress[-1]['steps'] // 2)
+
+        print('Successful test: BACKGROUND RUN (Snapshot)')
@@ -0,0 +1,99 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+from sim.memory import Memory
+import unittest as ut
+
+class SnapshotTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator(checkpoint_interval=8)
+        # Setup fills 8 words at $gp, the test case then adds $a0 to each of them
+        self.test_program = """
+        addi $t0, $zero, 8
+        addi $t1, $gp, 0
+        fill:
+        sw $t0, 0($t1)
+        addi $t1, $t1, 4
+        addi $t0, $t0, -1
+        bne $t0, $zero, fill
+        case:
+        addi $t0, $zero, 8
+        addi $t1, $gp, 0
+        add_loop:
+        lw $t2, 0($t1)
+        add $t2, $t2, $a0
+        sw $t2, 0($t1)
+        addi $t1, $t1, 4
+        addi $t0, $t0, -1
+        bne $t0, $zero, add_loop
+        """
+        self.simulator.load(self.test_program)
+        self.simulator.add_breakpoint('case')
+        self.assertEqual(self.simulator.run(fast=True)['status'], 'breakpoint')
+
+    def words(self, simulator):
+        return [simulator.memory.read_word(Memory.GLOBAL_POINTER + 4 * i) for i in range(8)]
+
+    def test_restore(self):
+        simulator = self.simulator
+        snapshot = simulator.snapshot()
+        setup_step = simulator.steps_executed
+        results = []
+        for value in (1, 100):
+            simulator.restore(snapshot)
+            self.assertEqual(simulator.steps_executed, setup_step)
+            simulator.registers.write_register(4, value)
+            self.assertEqual(simulator.run(fast=True)['status'], 'completed')
+            results.append(self.words(simulator))
+        self.assertEqual(results[0], [9, 8, 7, 6, 5, 4, 3, 2])
+        self.assertEqual(results[1], [108, 107, 106, 105, 104, 103, 102, 101])
+
+        # The restored state is a new starting point for time travel
+        simulator.restore(snapshot)
+        simulator.run(fast=True)
+        self.assertEqual(simulator.seek(setup_step + 3)['step'], setup_step + 3)
+        self.assertEqual(self.words(simulator), [8, 7, 6, 5, 4, 3, 2, 1])
+        self.assertEqual(simulator.seek(setup_step - 1)['status'], 'error')
+
+        # A snapshot of another program is decoded again
+        other = Simulator()
+        other.restore(snapshot)
+        self.assertEqual(other.program_length, simulator.program_length)
+        other.run(fast=True)
+        self.assertEqual(self.words(other), [8, 7, 6, 5, 4, 3, 2, 1])
+
+        print('Successful test: SNAPSHOT (Restore)')
+
+    def test_fork(self):
+        simulator = self.simulator
+        forks = [simulator.fork() for _ in range(3)]
+        for value, fork in enumerate(forks):
+            # Pages and instructions are shared until written
+            page = Memory.GLOBAL_POINTER >> Memory.PAGE_SHIFT
+            self.assertIs(fork.memory.pages[page], simulator.memory.pages[page])
+            self.assertIs(fork.memory.instruction_memory, simulator.memory.instruction_memory)
+            self.assertEqual(fork.steps_executed, simulator.steps_executed)
+            fork.registers.write_register(4, value * 10)
+            self.assertEqual(fork.run(fast=True)['status'], 'completed')
+
+        self.assertEqual([self.words(fork)[0] for fork in forks], [8, 18, 28])
+        self.assertEqual(self.words(simulator), [8, 7, 6, 5, 4, 3, 2, 1])
+        self.assertEqual(simulator.run(fast=True)['status'], 'completed')
+        self.assertEqual(self.words(simulator), [8, 7, 6, 5, 4, 3, 2, 1])
+
+        # Forks keep labels and breakpoints
+        fork = forks[0]
+        self.assertEqual(fork.breakpoints.keys(), simulator.breakpoints.keys())
+        self.assertEqual(fork.add_breakpoint('add_loop'), simulator.assembler.labels['add_loop'])
+        fork.restore(simulator.snapshot())
+        self.assertEqual(fork.run(fast=True)['status'], 'completed')
+        self.assertNotIn(simulator.assembler.labels['add_loop'], simulator.breakpoints)
+
+        print('Successful test: SNAPSHOT (Fork)')
+
+if __name__ == '__main__':
+    ut.main()
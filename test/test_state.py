@@ -0,0 +1,84 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+from sim.memory import Memory
+import unittest as ut
+
+class StateTest(ut.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        self.test_program = """
+        addi $s0, $zero, -5
+        sw $s0, 0($gp)
+        addi $s1, $zero, 7
+        """
+        self.simulator.load(self.test_program)
+
+    def test_cached_views(self):
+        simulator = self.simulator
+        simulator.step()
+        state = simulator.get_state()
+        self.assertIs(state, simulator.get_state())
+        self.assertEqual(set(state), {'pc', 'registers', 'memory', 'history', 'reg_labels'})
+        registers = state['registers']
+        self.assertEqual((registers[16], state['reg_labels']['$s0'], state['pc']), (-5, -5, 4))
+        self.assertIs(state['registers'], registers)
+
+        # A store leaves the register views cached, memory is live
+        simulator.step()
+        self.assertIs(state['registers'], registers)
+        self.assertEqual(state['memory']['data'][Memory.GLOBAL_POINTER], 0xFFFFFFFB)
+
+        # Any register write rebuilds them, including the fast handlers
+        simulator.run(fast=True)
+        self.assertIsNot(state['registers'], registers)
+        self.assertEqual(state['reg_labels']['$s1'], 7)
+        simulator.registers.write_register(17, 0x80000000)
+        self.assertEqual(state['registers'][17], -0x80000000)
+
+        with self.assertRaises(TypeError):
+            state['registers'][17] = 0
+        with self.assertRaises(KeyError):
+            state['missing']
+
+        print('Successful test: STATE (Cached Views)')
+
+    def test_frozen_results(self):
+        # Every step result keeps the state after its own step, the last one reports completion
+        result = self.simulator.run()
+        states = [step['state'] for step in result['execution_results']]
+        self.assertEqual([state['pc'] for state in states], [4, 8, 12, 12])
+        self.assertEqual([(state['registers'][16], state['registers'][17]) for state in states], [(-5, 0), (-5, 0), (-5, 7), (-5, 7)])
+        self.assertEqual(states[0]['reg_labels']['$s1'], 0)
+        self.assertEqual(result['final_state']['reg_labels']['$s1'], 7)
+
+        # The live view follows later changes, the results do not
+        self.simulator.registers.write_register(16, 1)
+        self.assertEqual(self.simulator.get_state()['registers'][16], 1)
+        self.assertEqual(result['final_state']['registers'][16], -5)
+        self.assertEqual(states[0].to_dict()['registers'][16], -5)
+
+        print('Successful test: STATE (Frozen Results)')
+
+    def test_dict_compatibility(self):
+        simulator = self.simulator
+        simulator.step()
+        copy = simulator.get_state().to_dict()
+        self.assertIs(type(copy['registers']), dict)
+        self.assertEqual(copy['registers'], simulator.get_register_state())
+        self.assertEqual(copy['reg_labels'], simulator.get_register_state(label=True))
+        self.assertEqual(copy['memory']['instructions'], simulator.memory.read_instruction_memory())
+
+        # Copies keep the values they were taken with
+        simulator.run(fast=True)
+        self.assertEqual(copy['registers'][17], 0)
+        self.assertEqual(simulator.get_register_state()[17], 7)
+
+        print('Successful test: STATE (Dict Compatibility)')
+
+if __name__ == '__main__':
+    ut.main()
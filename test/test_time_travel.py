@@ -0,0 +1,88 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class TimeTravelTest(ut.TestCase):
+    def setUp(self):
+        self.test_loop = """
+        addi $t0, $zero, 6    # t0 = 6
+        loop:
+        addi $s0, $s0, 3      # s0 += 3
+        sw $s0, 4($zero)      # memory[4] = s0
+        addi $t0, $t0, -1     # t0 -= 1
+        bne $t0, $zero, loop
+        addi $s1, $zero, 9
+        """
+        # Reference states after every step
+        reference = Simulator()
+        reference.load(self.test_loop)
+        self.states = [self.capture(reference)]
+        while reference.step()['status'] == 'running':
+            self.states.append(self.capture(reference))
+        
+    def capture(self, simulator):
+        return (simulator.registers.pc, list(simulator.registers.registers), dict(simulator.memory.read_data_memory()))
+        
+    def test_step_back(self):
+        simulator = Simulator(checkpoint_interval=4)
+        simulator.load(self.test_loop)
+        for _ in range(10):
+            simulator.step()
+        
+        for step in range(9, -1, -1):
+            result = simulator.step_back()
+            self.assertEqual(result['step'], step)
+            self.assertEqual(self.capture(simulator), self.states[step])
+        
+        self.assertEqual(simulator.step_back()['status'], 'error')
+        
+        print('Successful test: STEP BACK')
+        
+    def test_seek(self):
+        simulator = Simulator(checkpoint_interval=4)
+        simulator.load(self.test_loop)
+        simulator.run(fast=True)
+        
+        for step in [3, 20, 0, 11, 12, len(self.states) - 1, 5]:
+            result = simulator.seek(step)
+            self.assertEqual(result['step'], step)
+            self.assertEqual(self.capture(simulator), self.states[step])
+        
+        print('Successful test: SEEK')
+        
+    def test_seek_without_history(self):
+        simulator = Simulator(history_depth=0, checkpoint_interval=5)
+        simulator.load(self.test_loop)
+        for _ in range(len(self.states) - 1):
+            simulator.step()
+        
+        simulator.seek(7)
+        self.assertEqual(self.capture(simulator), self.states[7])
+        simulator.step_back()
+        self.assertEqual(self.capture(simulator), self.states[6])
+        
+        print('Successful test: SEEK (Without History)')
+
+    def test_checkpoint_limit(self):
+        simulator = Simulator(checkpoint_interval=2, max_checkpoints=4)
+        simulator.load(self.test_loop)
+        simulator.memory.write_word(0x10010000, 7)
+        simulator.run(fast=True)
+        self.assertLessEqual(len(simulator.checkpoints), 4)
+        self.assertIn(0, simulator.checkpoints)
+
+        # Pages the program never writes are shared, not copied
+        pages = [memory[0x10010] for _, _, memory in simulator.checkpoints.values() if 0x10010 in memory]
+        self.assertTrue(all(page is pages[0] for page in pages))
+
+        for step in [len(self.states) - 1, 3, 17, 0, 9]:
+            simulator.seek(step)
+            self.assertEqual(self.capture(simulator)[:2], self.states[step][:2])
+            self.assertEqual(simulator.memory.read_word(4), self.states[step][2].get(4, 0))
+
+        print('Successful test: CHECKPOINT LIMIT')
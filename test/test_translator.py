@@ -0,0 +1,132 @@
+import os
+import sys
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root_dir)
+
+from sim.simulator import Simulator
+import unittest as ut
+
+class BlockTranslatorTest(ut.TestCase):
+    def setUp(self):
+        self.test_loop = """
+        addi $t0, $zero, 40   # t0 = 40
+        addi $s2, $zero, -7   # s2 = -7
+        loop:
+        addi $s0, $s0, 3      # s0 += 3
+        sub $s1, $s1, $s0     # s1 -= s0
+        slt $s3, $s1, $s2     # s3 = s1 < s2
+        sll $s4, $s0, 3       # s4 = s0 << 3
+        srl $s5, $s1, 4       # s5 = s1 >> 4
+        and $s6, $s4, $s5
+        or $s7, $s4, $s1
+        sw $s7, 8($zero)      # memory[8] = s7
+        lw $t1, 8($zero)      # t1 = memory[8]
+        sb $s1, 13($zero)     # memory[13] = low byte of s1
+        sh $s0, 14($zero)     # memory[14..15] = low half of s0
+        lb $t4, 13($zero)
+        lhu $t5, 14($zero)
+        lh $t6, 12($zero)
+        jal leaf
+        addi $t0, $t0, -1     # t0 -= 1
+        bne $t0, $zero, loop
+        j end
+        leaf:
+        add $t2, $t2, $t1
+        jr $ra
+        end:
+        addi $t3, $zero, 1
+        """
+        self.test_fault = """
+        addi $t0, $zero, 3
+        loop:
+        addi $s0, $s0, 1
+        addi $t0, $t0, -1
+        bne $t0, $zero, loop
+        addi $t1, $zero, 4096
+        addi $s1, $zero, 1
+        sw $s1, 2($t1)        # unaligned address
+        addi $s2, $zero, 1
+        """
+        
+    def capture(self, simulator):
+        return (simulator.registers.pc, simulator.steps_executed,
+                list(simulator.registers.registers), dict(simulator.memory.read_data_memory()))
+        
+    def run_program(self, program, engine, **kwargs):
+        simulator = Simulator(engine=engine)
+        simulator.translator.hot_threshold = 1
+        simulator.load(program)
+        return simulator, simulator.run(fast=True, **kwargs)
+        
+    def test_matches_interpreter(self):
+        for program in [self.test_loop, open('./test/bin/demo.asm').read()]:
+            interpreted, expected = self.run_program(program, 'interpreter')
+            translated, result = self.run_program(program, 'blocks')
+            self.assertEqual(result['status'], expected['status'])
+            self.assertEqual(result['instructions_executed'], expected['instructions_executed'])
+            self.assertEqual(self.capture(translated), self.capture(interpreted))
+        self.assertGreater(translated.translator.compiled_blocks, 0)
+        
+        print('Successful test: BLOCK TRANSLATOR')
+        
+    def test_instruction_limit(self):
+        interpreted, expected = self.run_program(self.test_loop, 'interpreter', max_instructions=123)
+        translated, result = self.run_program(self.test_loop, 'blocks', max_instructions=123)
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(self.capture(translated), self.capture(interpreted))
+        
+        print('Successful test: BLOCK TRANSLATOR (Instruction Limit)')
+        
+    def test_memory_fault(self):
+        states = []
+        for engine in ['interpreter', 'blocks']:
+            simulator = Simulator(engine=engine)
+            simulator.translator.hot_threshold = 1
+            simulator.load(self.test_fault)
+            with self.assertRaises(ValueError):
+                simulator.run(fast=True)
+            states.append(self.capture(simulator))
+        self.assertEqual(states[0], states[1])
+        self.assertEqual(states[1][0], 24)
+        
+        print('Successful test: BLOCK TRANSLATOR (Memory Fault)')
+        
+    def test_repeated_block(self):
+        # The loop block branches back to itself until its store becomes unaligned in the fourth iteration
+        program = """
+        addi $t1, $zero, 4
+        addi $s7, $zero, 1
+        addi $s6, $zero, -1
+        loop:
+        addi $t1, $t1, -1
+        slt $t2, $t1, $s7
+        sw $t1, 4($t2)
+        bne $t1, $s6, loop
+        """
+        for limit in (7, 100):
+            states = []
+            for engine in ['interpreter', 'blocks']:
+                simulator = Simulator(engine=engine, checkpoint_interval=0)
+                simulator.translator.hot_threshold = 1
+                simulator.load(program)
+                profiler = simulator.enable_profiler()
+                try:
+                    simulator.execute(limit)
+                except ValueError:
+                    pass
+                states.append(self.capture(simulator) + (profiler.hits(),))
+            self.assertEqual(states[0], states[1])
+        self.assertEqual(states[1][:2], (20, 17))
+        self.assertEqual(states[1][4], [1, 1, 1, 4, 4, 3, 3])
+        
+        print('Successful test: BLOCK TRANSLATOR (Repeated Block)')
+        
+    def test_invalidation(self):
+        simulator, _ = self.run_program(self.test_loop.replace('addi $s0, $s0, 3', 'addi $s0, $s0, 5'), 'blocks')
+        simulator.load(self.test_loop)
+        simulator.run(fast=True)
+        interpreted, _ = self.run_program(self.test_loop, 'interpreter')
+        self.assertEqual(self.capture(simulator), self.capture(interpreted))
+        
+        print('Successful test: BLOCK TRANSLATOR (Invalidation)')
@@ -1,10 +1,14 @@
 import os
 import sys
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QLabel, QPushButton, QLineEdit, QFileDialog, QComboBox
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QLabel, QPushButton, QLineEdit, QFileDialog, QComboBox, QTableView, QHeaderView
 from sim.simulator import Simulator
+from sim.assembler import Assembler
+from sim.runner import BackgroundRunner
+from ui.models import RegisterModel, InstructionMemoryModel, DataMemoryModel
 from PyQt5.QtWidgets import QDesktopWidget
 from PyQt5.QtGui import QIcon
 
@@ -13,7 +17,59 @@ if os.name == 'nt':
 else:
     pywinstyles = None
 
+class AssemblyWorker(QObject):
+    '''
+    Background assembler for the editor\n
+    Jobs run one at a time on a worker thread with their own Assembler, so
+    incremental reassembly state is kept between edits. Every job carries a
+    generation number, results of stale generations are dropped by the receiver.
+    Results are delivered on the GUI thread through the `finished` signal.
+    '''
+    finished = pyqtSignal(int, object, object, str, str)  # generation, machine code, symbols, translations, error
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.assembler = Assembler()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.generation = 0
+        self.future = None
+
+    def submit(self, code, translation_option):
+        '''Queue assembly of `code`, cancelling a queued job that has not started yet\n
+        Returns:\n
+            int: Generation of the new job
+        '''
+        self.generation += 1
+        if self.future is not None:
+            self.future.cancel()
+        self.future = self.executor.submit(self._assemble, self.generation, code, translation_option)
+        return self.generation
+
+    def _assemble(self, generation, code, translation_option):
+        if generation != self.generation:  # Superseded while queued
+            return
+        try:
+            machine_code = self.assembler.assemble(code)
+            translations = '\n'.join(self.assembler.get_translations(translation_option))
+            # Taken here, the next job replaces them
+            symbols = self.assembler.get_symbols()
+            self.finished.emit(generation, machine_code, symbols, translations, '')
+        except Exception as e:
+            self.finished.emit(generation, None, None, '', str(e))
+
+    def shutdown(self):
+        self.generation += 1
+        self.executor.shutdown(wait=False)
+
+class RunSignals(QObject):
+    '''Delivers BackgroundRunner callbacks to the GUI thread'''
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(object)
+
 class AssemblyEditorApp(QWidget):
+    ASSEMBLY_DELAY = 250  # Milliseconds without edits before the program is assembled
+    REFRESH_RATE = 30  # Repaints per second while running
+
     def __init__(self):
         super().__init__()
         try:
@@ -22,6 +78,16 @@ class AssemblyEditorApp(QWidget):
             base_path = os.path.abspath(os.path.dirname(__file__))
         self.translation_option = 'binary'
         self.simulator = Simulator()
+        self.assembly_worker = AssemblyWorker(self)
+        self.assembly_worker.finished.connect(self.apply_program)
+        self.assembly_timer = QTimer(self)
+        self.assembly_timer.setSingleShot(True)
+        self.assembly_timer.setInterval(self.ASSEMBLY_DELAY)
+        self.assembly_timer.timeout.connect(self.load_program)
+        self.runner = None
+        self.run_signals = RunSignals(self)
+        self.run_signals.progress.connect(self.show_progress)
+        self.run_signals.finished.connect(self.finish_run)
         self.setWindowTitle("ASMsim - 32 Bit MIPS Assembly Simulator")
         icon_path = os.path.join(base_path, 'ui', 'assets', 'icon.ico')
         self.setWindowIcon(QIcon(icon_path))
@@ -57,28 +123,44 @@ class AssemblyEditorApp(QWidget):
         self.button_clear = QPushButton("Clear", self)
         self.button_clear.setProperty("class", "tertiary")
         self.button_clear.setCursor(Qt.PointingHandCursor)
-        self.button_clear.clicked.connect(lambda: (self.assembly_input.clear(), self.machine_code_display.clear(), self.counter_pc.clear(), self.im_text.clear(), self.dm_text.clear(), self.register_display.clear(), self.load_program()))
+        self.button_clear.clicked.connect(lambda: (self.assembly_input.clear(), self.machine_code_display.clear(), self.counter_pc.clear(), self.load_program()))
         self.button_clear.setVisible(False)
         self.assembly_title.addWidget(self.assembly_label, stretch=1)
         self.assembly_title.addWidget(self.button_clear)
         self.assembly_input = QTextEdit(self)
         self.assembly_input.setMinimumSize(600, 400)
-        self.assembly_input.textChanged.connect(self.load_program)
+        self.assembly_input.textChanged.connect(self.assembly_timer.start)
         self.assembly_input.setPlaceholderText("Write assembly code here...")
         self.assembly_buttons = QHBoxLayout()
         self.button_upload = QPushButton("Load File", self)
         self.button_upload.setProperty("class", "secondary")
         self.button_upload.setCursor(Qt.PointingHandCursor)
         self.button_upload.clicked.connect(self.load_file)
+        self.button_step_back = QPushButton("Step Back", self)
+        self.button_step_back.setProperty("class", "secondary")
+        self.button_step_back.setCursor(Qt.PointingHandCursor)
+        self.button_step_back.clicked.connect(self.step_back_code)
         self.button_step = QPushButton("Step", self)
         self.button_step.setCursor(Qt.PointingHandCursor)
         self.button_step.clicked.connect(self.step_code)
         self.button_run = QPushButton("Run", self)
         self.button_run.setCursor(Qt.PointingHandCursor)
         self.button_run.clicked.connect(self.execute_code)
+        self.button_pause = QPushButton("Pause", self)
+        self.button_pause.setProperty("class", "secondary")
+        self.button_pause.setCursor(Qt.PointingHandCursor)
+        self.button_pause.clicked.connect(self.pause_code)
+        self.button_pause.setVisible(False)
+        self.button_stop = QPushButton("Stop", self)
+        self.button_stop.setCursor(Qt.PointingHandCursor)
+        self.button_stop.clicked.connect(self.stop_code)
+        self.button_stop.setVisible(False)
         self.assembly_buttons.addWidget(self.button_upload)
+        self.assembly_buttons.addWidget(self.button_step_back)
         self.assembly_buttons.addWidget(self.button_step, stretch=1)
         self.assembly_buttons.addWidget(self.button_run, stretch=1)
+        self.assembly_buttons.addWidget(self.button_pause, stretch=1)
+        self.assembly_buttons.addWidget(self.button_stop, stretch=1)
         self.assembly_block.addLayout(self.assembly_title)
         self.assembly_block.addWidget(self.assembly_input)
         self.assembly_block.addLayout(self.assembly_buttons)
@@ -122,8 +204,8 @@ class AssemblyEditorApp(QWidget):
         self.im_block = QVBoxLayout()
         self.im_label = QLabel("Instruction Memory", self)
         self.im_label.setAlignment(Qt.AlignLeft)
-        self.im_text = QTextEdit(self)
-        self.im_text.setReadOnly(True)
+        self.im_model = InstructionMemoryModel(self.simulator, self.translation_option, self)
+        self.im_text = self.create_table_view(self.im_model)
         self.im_text.setMinimumSize(600, 200)
         self.im_text.setMaximumHeight(200)
         self.im_block.addWidget(self.im_label)
@@ -133,8 +215,8 @@ class AssemblyEditorApp(QWidget):
         self.dm_block = QVBoxLayout()
         self.dm_label = QLabel("Data Memory", self)
         self.dm_label.setAlignment(Qt.AlignLeft)
-        self.dm_text = QTextEdit(self)
-        self.dm_text.setReadOnly(True)
+        self.dm_model = DataMemoryModel(self.simulator, self.translation_option, self)
+        self.dm_text = self.create_table_view(self.dm_model)
         self.dm_text.setMinimumSize(600, 200)
         self.dm_text.setMaximumHeight(200)
         self.dm_block.addWidget(self.dm_label)
@@ -149,8 +231,8 @@ class AssemblyEditorApp(QWidget):
         self.register_block = QVBoxLayout()
         self.register_label = QLabel("Registers", self)
         self.register_label.setAlignment(Qt.AlignCenter)
-        self.register_display = QTextEdit(self)
-        self.register_display.setReadOnly(True)
+        self.register_model = RegisterModel(self.simulator, self)
+        self.register_display = self.create_table_view(self.register_model)
         self.register_display.setMinimumSize(150, 400)
         self.register_display.setMaximumWidth(150)
         self.register_block.addWidget(self.register_label)
@@ -160,27 +242,33 @@ class AssemblyEditorApp(QWidget):
         
         self.update()
 
-    def update(self, result=None):
-        current_state = self.simulator.get_state()
-        reg_state = [f"{name}: {val}" for name, val in current_state['reg_labels'].items()]
-        self.register_display.setText("\n".join(reg_state))
-        
-        if self.translation_option == 'binary':
-            # Format memory displays with binary values
-            im_state = [f"0x{addr*4:08x}: {val:032b}" for addr, val in enumerate(current_state['memory']['instructions']) if val != 0]
-            dm_state = [f"0x{addr*4:08x}: {val:032b}" for addr, val in enumerate(current_state['memory']['data']) if val != 0]
-        else:
-            im_state = [f"0x{addr*4:08x}: 0x{val:08x}" for addr, val in enumerate(current_state['memory']['instructions']) if val != 0]
-            dm_state = [f"0x{addr*4:08x}: 0x{val:08x}" for addr, val in enumerate(current_state['memory']['data']) if val != 0]
-        
-        self.im_text.setText("\n".join(im_state))
-        self.dm_text.setText("\n".join(dm_state))
+    def create_table_view(self, model):
+        """Table view with fixed row heights, so only the visible rows of a model are formatted"""
+        view = QTableView(self)
+        view.setModel(model)
+        view.setShowGrid(False)
+        view.setAlternatingRowColors(False)
+        view.verticalHeader().setVisible(False)
+        view.horizontalHeader().setVisible(False)
+        view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(20)
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        view.horizontalHeader().setStretchLastSection(True)
+        return view
+
+    def update(self, result=None, source=None):
+        # Models repaint only the cells changed since the last update
+        self.register_model.refresh(source)
+        self.im_model.refresh(source)
+        self.dm_model.refresh(source)
             
         if result and 'instruction_info' in result:
             self.counter_pc.setText(f"PC: 0x{result['pc']:08x} | OP: {result['instruction_info']['opcode']} | FUNCT: {result['instruction_info']['fields']['funct']} | RS: {result['instruction_info']['fields']['rs']} | RT: {result['instruction_info']['fields']['rt']} | RD: {result['instruction_info']['fields']['rd']}")
             
     def updateTranslationOption(self, index):
         self.translation_option = (index == 0) and 'binary' or 'hex'
+        self.im_model.set_translation_option(self.translation_option)
+        self.dm_model.set_translation_option(self.translation_option)
         self.load_program()
         
     def load_file(self):
@@ -191,38 +279,148 @@ class AssemblyEditorApp(QWidget):
                 self.load_program()
         
     def load_program(self):
-        try:
-            self.button_clear.setVisible(True)
-            assembly_code = self.assembly_input.toPlainText()
-            if not assembly_code.strip():  # Skip if empty
-                self.button_clear.setVisible(False)
-                self.machine_code_display.clear()
-                self.counter_pc.clear()
-                return
+        """Assemble the editor contents in the background, the result is applied by apply_program"""
+        self.assembly_timer.stop()
+        self.button_clear.setVisible(True)
+        assembly_code = self.assembly_input.toPlainText()
+        if not assembly_code.strip():  # Skip if empty
+            self.assembly_worker.generation += 1  # Drop results still in flight
+            self.stop_run()
+            self.simulator.load_machine_code([])
+            self.update()
+            self.button_clear.setVisible(False)
+            self.machine_code_display.clear()
+            self.counter_pc.clear()
+            return
+        self.assembly_worker.submit(assembly_code, self.translation_option)
+
+    def apply_program(self, generation, machine_code, symbols, translations, error):
+        """Load a finished assembly job into the simulator, unless a newer job was started"""
+        if generation != self.assembly_worker.generation:
+            return
+        if error:
+            self.machine_code_display.setStyleSheet("color: red;")
+            self.machine_code_display.setText(error)
+            return
+        self.stop_run()
+        self.simulator.load_machine_code(machine_code)
+        # Labels and source lines for breakpoints and the profiler, pipeline and cache reports
+        self.simulator.assembler.set_symbols(symbols)
+        self.update()
+        # Update machine code display
+        self.machine_code_display.setStyleSheet("color: hsl(0, 0%, 63%);")
+        self.machine_code_display.setText(translations)
+        self.counter_pc.setText("PC: 0x00000000")
 
-            # Load and assemble code
+    def flush_program(self):
+        """Assemble pending edits on the GUI thread so Step and Run never use an outdated program"""
+        future = self.assembly_worker.future
+        if not self.assembly_timer.isActive() and (future is None or future.done()):
+            return
+        self.assembly_timer.stop()
+        self.assembly_worker.generation += 1
+        assembly_code = self.assembly_input.toPlainText()
+        if not assembly_code.strip():
+            return
+        self.stop_run()
+        try:
             machine_code = self.simulator.load(assembly_code, self.translation_option)
-            
             self.update()
-            # Update machine code display
             self.machine_code_display.setStyleSheet("color: hsl(0, 0%, 63%);")
             self.machine_code_display.setText(machine_code)
-            self.counter_pc.setText("PC: 0x00000000")
         except Exception as e:
             self.machine_code_display.setStyleSheet("color: red;")
             self.machine_code_display.setText(f"{str(e)}")
+
+    def closeEvent(self, event):
+        self.stop_run()
+        self.assembly_worker.shutdown()
+        super().closeEvent(event)
         
     def execute_code(self):
-        result = self.simulator.run()
-        self.update(result)
-        self.counter_pc.setText("Execution Complete")
+        """Run the program on a worker thread, registers and memory are repainted at REFRESH_RATE"""
+        if self.runner is not None:
+            return
+        self.flush_program()
+        self.runner = BackgroundRunner(
+            self.simulator,
+            on_progress=self.run_signals.progress.emit,
+            on_finished=self.run_signals.finished.emit,
+            refresh_rate=self.REFRESH_RATE,
+            copy_state=False  # Views read the snapshot of each progress update
+        )
+        self.set_running(True)
+        self.counter_pc.setText("Running...")
+        self.runner.start()
+
+    def pause_code(self):
+        if self.runner is None or not self.runner.running:
+            return
+        if self.runner.paused:
+            self.runner.resume()
+            self.button_pause.setText("Pause")
+        else:
+            self.runner.pause()
+            self.button_pause.setText("Resume")
+
+    def stop_code(self):
+        if self.runner is not None:
+            self.runner.stop()
+
+    def stop_run(self):
+        """Stop a background run and wait for it, before the simulator is used on the GUI thread"""
+        if self.runner is not None:
+            self.runner.stop()
+            self.runner.wait()
+            # Its queued signals are ignored, the caller repaints
+            self.runner = None
+            self.set_running(False)
+
+    def set_running(self, running):
+        self.button_run.setVisible(not running)
+        self.button_step.setEnabled(not running)
+        self.button_step_back.setEnabled(not running)
+        self.button_pause.setVisible(running)
+        self.button_pause.setText("Pause")
+        self.button_stop.setVisible(running)
+
+    def show_progress(self, progress):
+        if self.runner is None:
+            return
+        # The worker owns the simulator, repaint from the copy taken between slices
+        self.update(source=progress['snapshot'])
+        status = "Paused" if progress['paused'] else "Running"
+        self.counter_pc.setText(f"{status} | PC: 0x{progress['pc']:08x} | Steps: {progress['steps']} | {progress['instructions_per_second']:,.0f} steps/s")
+
+    def finish_run(self, result):
+        if self.runner is None:  # Stopped by stop_run()
+            return
+        self.runner = None
+        self.set_running(False)
+        self.update()
+        if result['status'] in ('completed', 'halted'):
+            self.counter_pc.setText(f"Execution Complete | Steps: {result['instructions_executed']} | {result['instructions_per_second']:,.0f} steps/s")
+        else:
+            self.counter_pc.setText(result['message'])
     
     def step_code(self):
+        self.flush_program()
         try:
             result = self.simulator.step()
             self.update(result)
         except Exception as e:
             self.counter_pc.setText(f"Error: {str(e)}")
+    
+    def step_back_code(self):
+        try:
+            result = self.simulator.step_back()
+            self.update(result)
+            if result['status'] == 'error':
+                self.counter_pc.setText(result['message'])
+            else:
+                self.counter_pc.setText(f"PC: 0x{result['pc']:08x} | Step: {result['step']}")
+        except Exception as e:
+            self.counter_pc.setText(f"Error: {str(e)}")
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,154 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+'''
+    View Models
+    Table models over the SIM component, rows are formatted only when a view asks for them.
+    refresh() takes an optional source with registers and memory, e.g. a RunSnapshot while a
+    background run owns the simulator, and the model reads it until the next refresh.
+'''
+
+def format_word(value, translation_option):
+    if translation_option == 'binary':
+        return f"{value:032b}"
+    return f"0x{value:08x}"
+
+class RegisterModel(QAbstractTableModel):
+    '''
+    Register Model\n
+    One row per register with its name and signed value, refreshed from Registers.take_dirty()
+    '''
+    def __init__(self, simulator, parent=None):
+        super().__init__(parent)
+        self.simulator = simulator
+        self.source = simulator  # Registers and memory read by data()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 32
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        registers = self.source.registers
+        if index.column() == 0:
+            return registers.get_register_name(index.row())
+        value = registers.registers[index.row()]
+        return str(value - 0x100000000 if value & 0x80000000 else value)
+
+    def refresh(self, source=None):
+        '''Emit dataChanged for the registers changed since the last refresh'''
+        self.source = source if source is not None else self.simulator
+        dirty = self.source.registers.take_dirty()
+        if dirty is None:
+            self.dataChanged.emit(self.index(0, 1), self.index(31, 1))
+            return
+        for register in dirty:
+            self.dataChanged.emit(self.index(register, 1), self.index(register, 1))
+
+class InstructionMemoryModel(QAbstractTableModel):
+    '''
+    Instruction Memory Model\n
+    One row per loaded instruction word, the row count changes only when a program is loaded
+    '''
+    def __init__(self, simulator, translation_option='binary', parent=None):
+        super().__init__(parent)
+        self.simulator = simulator
+        self.source = simulator  # Registers and memory read by data()
+        self.translation_option = translation_option
+        self.version = None
+        self.length = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.length
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        if index.column() == 0:
+            return f"0x{index.row() * 4:08x}"
+        return format_word(self.source.memory.get_instruction(index.row() * 4), self.translation_option)
+
+    def set_translation_option(self, translation_option):
+        self.translation_option = translation_option
+        if self.length:
+            self.dataChanged.emit(self.index(0, 1), self.index(self.length - 1, 1))
+
+    def refresh(self, source=None):
+        '''Reset the model when instruction memory changed'''
+        self.source = source if source is not None else self.simulator
+        memory = self.source.memory
+        if memory.instruction_version != self.version:
+            self.beginResetModel()
+            self.version = memory.instruction_version
+            self.length = len(memory.instruction_memory)
+            self.endResetModel()
+
+class DataMemoryModel(QAbstractTableModel):
+    '''
+    Data Memory Model\n
+    One row per word of every allocated page, in address order. Words are read from
+    memory when a view paints them, so only visible rows cost anything. Refreshes use
+    Memory.take_dirty(): changed words emit dataChanged for their row, newly allocated
+    pages reset the model.
+    '''
+    def __init__(self, simulator, translation_option='binary', parent=None):
+        super().__init__(parent)
+        self.simulator = simulator
+        self.source = simulator  # Registers and memory read by data()
+        self.translation_option = translation_option
+        self.page_numbers = []  # Allocated pages shown, in address order
+        self.rows = {}  # Page number -> first row of the page
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.page_numbers) * self.source.memory.PAGE_WORDS
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def address(self, row):
+        memory = self.source.memory
+        page_number = self.page_numbers[row // memory.PAGE_WORDS]
+        return (page_number << memory.PAGE_SHIFT) + (row % memory.PAGE_WORDS) * 4
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        address = self.address(index.row())
+        if index.column() == 0:
+            return f"0x{address:08x}"
+        return format_word(self.source.memory.read_word(address), self.translation_option)
+
+    def set_translation_option(self, translation_option):
+        self.translation_option = translation_option
+        rows = self.rowCount()
+        if rows:
+            self.dataChanged.emit(self.index(0, 1), self.index(rows - 1, 1))
+
+    def _reset(self):
+        self.beginResetModel()
+        self.page_numbers = sorted(self.source.memory.pages)
+        self.rows = {page_number: i * self.source.memory.PAGE_WORDS for i, page_number in enumerate(self.page_numbers)}
+        self.endResetModel()
+
+    def refresh(self, source=None):
+        '''Emit dataChanged for the words changed since the last refresh'''
+        self.source = source if source is not None else self.simulator
+        memory = self.source.memory
+        dirty = memory.take_dirty()
+        page_numbers = list(memory.pages)
+        if len(page_numbers) != len(self.page_numbers) or any(page_number not in self.rows for page_number in page_numbers):
+            self._reset()
+            return
+        if dirty is None:
+            rows = self.rowCount()
+            if rows:
+                self.dataChanged.emit(self.index(0, 1), self.index(rows - 1, 1))
+            return
+        for address in dirty:
+            row = self.rows[address >> memory.PAGE_SHIFT] + ((address & (memory.PAGE_SIZE - 1)) >> 2)
+            self.dataChanged.emit(self.index(row, 1), self.index(row, 1))